@@ -1,7 +1,16 @@
 import asyncio
-import aiohttp
+import os
 from loguru import logger
-from utils.utils import log_api_response
+from api.http_client import http_client
+from api.rate_limiter import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    Priority,
+    TokenBucketLimiter,
+    priority_value,
+)
+from api.single_flight import SingleFlight
+from utils.api_capture import api_capture
 
 _ANILIST_QUERY = """
     query ($id: Int) {
@@ -71,39 +80,159 @@ _ANILIST_QUERY_BY_MAL_ID = """
     }
 """
 
+_ANILIST_QUERY_BY_IDS = """
+    query ($ids: [Int], $perPage: Int) {
+      Page(page: 1, perPage: $perPage) {
+        media(id_in: $ids, type: ANIME) {
+          id
+          episodes
+          status
+          nextAiringEpisode {
+            episode
+            airingAt
+          }
+          airingSchedule(perPage: 100) {
+            nodes {
+              episode
+              airingAt
+            }
+          }
+        }
+      }
+    }
+"""
+
+_ANILIST_AIRING_QUERY = """
+    query ($page: Int, $perPage: Int, $airingFrom: Int, $airingTo: Int) {
+      Page(page: $page, perPage: $perPage) {
+        pageInfo {
+          hasNextPage
+        }
+        airingSchedules(
+          airingAt_greater: $airingFrom
+          airingAt_lesser: $airingTo
+          sort: TIME
+        ) {
+          mediaId
+          episode
+          airingAt
+        }
+      }
+    }
+"""
+
+ANILIST_PAGE_SIZE = 50
+ANILIST_AIRING_MAX_PAGES = 40
+
+anilist_limiter = TokenBucketLimiter(
+    "anilist",
+    capacity=int(os.getenv("ANILIST_RATE_LIMIT", "90")),
+    period=60,
+    interactive_reserve=int(os.getenv("ANILIST_INTERACTIVE_RESERVE", "10")),
+)
+
+_anilist_flights = SingleFlight("anilist")
 
-async def _fetch_anilist(variables: dict, query):
-    query = query
+
+async def _fetch_anilist(
+    variables: dict, query, priority: Priority = PRIORITY_BACKGROUND
+):
     max_retries = 3
+    session = await http_client.session("anilist")
 
-    async with aiohttp.ClientSession() as session:
-        for attempt in range(max_retries):
-            try:
-                async with session.post(
-                    "https://graphql.anilist.co",
-                    json={"query": query, "variables": variables},
-                ) as resp:
-                    if resp.status == 429:
-                        await asyncio.sleep(2**attempt)
-                        continue
-                    elif resp.status != 200:
-                        return {}
-                    return await resp.json()
-            except Exception as e:
-                logger.warning(f"Request failed: {resp.status} — {variables} — {e}")
-                if attempt == max_retries - 1:
+    for attempt in range(max_retries):
+        await anilist_limiter.acquire(priority)
+        try:
+            async with session.post(
+                "https://graphql.anilist.co",
+                json={"query": query, "variables": variables},
+            ) as resp:
+                anilist_limiter.update_from_headers(
+                    resp.status, resp.headers, fallback_delay=2**attempt
+                )
+                if resp.status == 429:
+                    continue
+                elif resp.status != 200:
                     return {}
-                await asyncio.sleep(1)
+                return await resp.json()
+        except Exception as e:
+            logger.warning(f"Request failed: {variables} — {e}")
+            if attempt == max_retries - 1:
+                return {}
+            await asyncio.sleep(1)
     return {}
 
 
 async def get_info_about_anime_from_anilist_by_id(anime_id: int):
-    data = await _fetch_anilist({"id": anime_id}, query=_ANILIST_QUERY)
-    log_api_response("anilist", data)
+    data = await _anilist_flights.do(
+        ("id", anime_id),
+        lambda _: _fetch_anilist({"id": anime_id}, query=_ANILIST_QUERY),
+    )
+    api_capture.capture("anilist", data)
     return data
 
 
-async def get_info_about_anime_from_anilist_by_mal_id(mal_id: int):
-    data = await _fetch_anilist({"idMal": mal_id}, query=_ANILIST_QUERY_BY_MAL_ID)
-    log_api_response("anilist_mal_id", data)
+async def get_info_about_anime_from_anilist_by_mal_id(
+    mal_id: int, priority: Priority = PRIORITY_INTERACTIVE
+):
+    data = await _anilist_flights.do(
+        ("idMal", mal_id, priority_value(priority)),
+        lambda _: _fetch_anilist(
+            {"idMal": mal_id},
+            query=_ANILIST_QUERY_BY_MAL_ID,
+            priority=priority,
+        ),
+    )
+    api_capture.capture("anilist_mal_id", data)
     return data
+
+
+async def get_many_info_about_anime_from_anilist_by_ids(anime_ids: list[int]):
+    media_by_id = {}
+    unique_ids = list(dict.fromkeys(anime_id for anime_id in anime_ids if anime_id))
+
+    for i in range(0, len(unique_ids), ANILIST_PAGE_SIZE):
+        chunk = unique_ids[i : i + ANILIST_PAGE_SIZE]
+        data = await _fetch_anilist(
+            {"ids": chunk, "perPage": ANILIST_PAGE_SIZE}, query=_ANILIST_QUERY_BY_IDS
+        )
+        media_list = (data.get("data") or {}).get("Page", {}).get("media") or []
+        for media in media_list:
+            media_by_id[media["id"]] = media
+        logger.info(
+            f"AniList batch fetched | requested: {len(chunk)} | received: {len(media_list)}"
+        )
+
+    return media_by_id
+
+
+async def get_airing_schedules(airing_from: int, airing_to: int):
+    schedules = []
+    truncated = False
+
+    for page in range(1, ANILIST_AIRING_MAX_PAGES + 1):
+        data = await _fetch_anilist(
+            {
+                "page": page,
+                "perPage": ANILIST_PAGE_SIZE,
+                "airingFrom": airing_from,
+                "airingTo": airing_to,
+            },
+            query=_ANILIST_AIRING_QUERY,
+        )
+        if not data:
+            raise RuntimeError(f"AniList airing feed request failed on page {page}")
+        page_data = (data.get("data") or {}).get("Page") or {}
+        schedules.extend(page_data.get("airingSchedules") or [])
+        if not page_data.get("pageInfo", {}).get("hasNextPage"):
+            break
+    else:
+        truncated = True
+        logger.warning(
+            f"AniList airing feed truncated after {ANILIST_AIRING_MAX_PAGES} pages"
+        )
+
+    logger.info(
+        f"AniList airing feed fetched | from: {airing_from} | to: {airing_to} | episodes: {len(schedules)}"
+    )
+    return schedules, truncated
@@ -0,0 +1,52 @@
+import os
+from typing import Dict, Optional
+
+import aiohttp
+from loguru import logger
+
+
+class HttpClient:
+    def __init__(self):
+        self.sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.upstreams = ("shikimori", "anilist", "libretranslate")
+        self.limit = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+        self.limit_per_host = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+        self.dns_cache_ttl = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+        self.keepalive_timeout = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+        self.total_timeout = float(os.getenv("HTTP_TOTAL_TIMEOUT", "15"))
+        self.connect_timeout = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+
+    def _create_session(self, upstream: str) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.total_timeout, connect=self.connect_timeout
+        )
+        logger.info(f"HTTP session created for {upstream}")
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def connect(self):
+        for upstream in self.upstreams:
+            await self.session(upstream)
+
+    async def session(self, upstream: str) -> aiohttp.ClientSession:
+        session: Optional[aiohttp.ClientSession] = self.sessions.get(upstream)
+        if session is None or session.closed:
+            session = self._create_session(upstream)
+            self.sessions[upstream] = session
+        return session
+
+    async def disconnect(self):
+        for upstream, session in self.sessions.items():
+            if not session.closed:
+                await session.close()
+                logger.info(f"HTTP session closed for {upstream}")
+        self.sessions.clear()
+
+
+http_client = HttpClient()
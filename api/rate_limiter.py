@@ -0,0 +1,249 @@
+import asyncio
+import heapq
+import itertools
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping, Optional, Union
+
+from loguru import logger
+
+from cache.redis_client import redis_client
+from utils.metrics import metrics
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+Priority = Union[int, Callable[[], int]]
+
+STALE_POLL_INTERVAL = 0.25
+
+
+class RequestShed(Exception):
+    pass
+
+
+def priority_value(priority: Priority) -> int:
+    return priority() if callable(priority) else priority
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_WINDOW_ACQUIRE_SCRIPT = """
+local full = {}
+for i, key in ipairs(KEYS) do
+    if tonumber(redis.call('GET', key) or '0') >= tonumber(ARGV[i]) then
+        table.insert(full, i)
+    end
+end
+if #full > 0 then
+    return full
+end
+for i, key in ipairs(KEYS) do
+    redis.call('INCR', key)
+    redis.call('EXPIRE', key, ARGV[#KEYS + i])
+end
+return full
+"""
+
+
+class RedisWindowLimiter:
+    def __init__(self, name: str, limits: dict[int, int]):
+        self.name = name
+        self.limits = limits
+
+    async def acquire(self):
+        windows = list(self.limits.items())
+        while True:
+            now = time.time()
+            slots = [int(now // window) for window, _ in windows]
+            try:
+                full = await redis_client.eval(
+                    _WINDOW_ACQUIRE_SCRIPT,
+                    [
+                        f"ratelimit:{self.name}:{window}:{slot}"
+                        for (window, _), slot in zip(windows, slots)
+                    ],
+                    [limit for _, limit in windows]
+                    + [window * 2 for window, _ in windows],
+                )
+            except Exception as e:
+                logger.warning(f"Shared rate limiter '{self.name}' unavailable: {e}")
+                return
+            if not full:
+                return
+            delay = max(
+                (slots[i - 1] + 1) * windows[i - 1][0] - now for i in map(int, full)
+            )
+            await asyncio.sleep(delay)
+
+
+class TokenBucketLimiter:
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        period: float = 60.0,
+        burst: Optional[int] = None,
+        interactive_reserve: int = 0,
+        shared: Optional[RedisWindowLimiter] = None,
+    ):
+        self.name = name
+        self.period = period
+        self.burst_limit = float(burst or capacity)
+        self.burst = self.burst_limit
+        self.refill_per_second = capacity / period
+        self.interactive_reserve = interactive_reserve
+        self.shared = shared
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._queue = []
+        self._counter = itertools.count()
+        self._condition = asyncio.Condition()
+        metrics.register(f"rate_limiter.{name}", self.stats)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst,
+            self.tokens + (now - self.updated_at) * self.refill_per_second,
+        )
+        self.updated_at = now
+        return now
+
+    def _delay(self, priority: int) -> float:
+        now = self._refill()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        required = 1.0
+        if priority > PRIORITY_INTERACTIVE:
+            required += self.interactive_reserve
+        if self.tokens >= required:
+            return 0.0
+        return (required - self.tokens) / self.refill_per_second
+
+    def _shed(self, reason: str):
+        metrics.increment(f"rate_limiter.{self.name}.shed")
+        logger.info(
+            f"Rate limiter '{self.name}' shed request | reason: {reason} | queue_depth: {self.queue_depth}"
+        )
+        raise RequestShed(reason)
+
+    async def acquire(
+        self,
+        priority: Priority = PRIORITY_BACKGROUND,
+        is_stale: Optional[Callable[[], bool]] = None,
+        max_wait: Optional[float] = None,
+    ):
+        entry = (priority_value(priority), next(self._counter))
+        queued_at = time.monotonic()
+        deadline = queued_at + max_wait if max_wait is not None else None
+
+        async with self._condition:
+            heapq.heappush(self._queue, entry)
+            metrics.set_gauge(f"rate_limiter.{self.name}.queue_depth", self.queue_depth)
+            self._condition.notify_all()
+            try:
+                while True:
+                    if is_stale is not None and is_stale():
+                        self._shed("stale")
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self._shed("timeout")
+                    if priority_value(priority) < entry[0]:
+                        self._queue.remove(entry)
+                        entry = (priority_value(priority), entry[1])
+                        self._queue.append(entry)
+                        heapq.heapify(self._queue)
+                        self._condition.notify_all()
+
+                    timeout = None
+                    if self._queue[0] == entry:
+                        timeout = self._delay(entry[0])
+                        if timeout <= 0:
+                            heapq.heappop(self._queue)
+                            self.tokens -= 1
+                            self._condition.notify_all()
+                            break
+                    if is_stale is not None or callable(priority):
+                        timeout = min(
+                            timeout or STALE_POLL_INTERVAL, STALE_POLL_INTERVAL
+                        )
+                    if deadline is not None:
+                        remaining = max(0.0, deadline - time.monotonic())
+                        timeout = (
+                            remaining if timeout is None else min(timeout, remaining)
+                        )
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    self._condition.notify_all()
+                raise
+            finally:
+                metrics.set_gauge(
+                    f"rate_limiter.{self.name}.queue_depth", self.queue_depth
+                )
+
+        if self.shared is not None:
+            await self.shared.acquire()
+        metrics.observe(
+            f"rate_limiter.{self.name}.wait_seconds", time.monotonic() - queued_at
+        )
+
+    def update_from_headers(
+        self, status: int, headers: Mapping[str, str], fallback_delay: float = 1.0
+    ):
+        now = self._refill()
+
+        limit = headers.get("X-RateLimit-Limit")
+        if limit and limit.isdigit() and int(limit) > 0:
+            self.refill_per_second = int(limit) / self.period
+            self.burst = min(self.burst_limit, float(limit))
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining and remaining.isdigit():
+            self.tokens = min(self.tokens, float(remaining))
+
+        block_for = _parse_retry_after(headers.get("Retry-After"))
+        reset = headers.get("X-RateLimit-Reset")
+        if block_for is None and reset and reset.isdigit():
+            if status == 429 or remaining == "0":
+                block_for = max(0.0, int(reset) - time.time())
+        if block_for is None and status == 429:
+            block_for = fallback_delay
+
+        if block_for is not None:
+            self.blocked_until = max(self.blocked_until, now + block_for)
+            logger.warning(
+                f"Rate limiter '{self.name}' paused | status: {status} | seconds: {block_for:.1f}"
+            )
+
+    def stats(self) -> dict:
+        wait = metrics.observations.get(f"rate_limiter.{self.name}.wait_seconds", {})
+        return {
+            "queue_depth": self.queue_depth,
+            "tokens": round(self.tokens, 2),
+            "wait_seconds_avg": wait["sum"] / wait["count"] if wait else 0.0,
+            "wait_seconds_max": wait.get("max", 0.0),
+            "shed": metrics.counters.get(f"rate_limiter.{self.name}.shed", 0),
+        }
@@ -1,38 +1,114 @@
-import aiohttp
 import asyncio
+import itertools
+import os
+from typing import Callable, Dict, Optional
 from loguru import logger
-from utils.utils import log_api_response
+from api.http_client import http_client
+from api.rate_limiter import (
+    PRIORITY_INTERACTIVE,
+    Priority,
+    RedisWindowLimiter,
+    TokenBucketLimiter,
+    priority_value,
+)
+from api.single_flight import SingleFlight
+from utils.api_capture import api_capture
+
+_SHIKIMORI_RPS = int(os.getenv("SHIKIMORI_RATE_LIMIT_RPS", "5"))
+_SHIKIMORI_RPM = int(os.getenv("SHIKIMORI_RATE_LIMIT_RPM", "90"))
+SHIKIMORI_MAX_QUEUE_WAIT = float(os.getenv("SHIKIMORI_MAX_QUEUE_WAIT", "15"))
+
+shikimori_limiter = TokenBucketLimiter(
+    "shikimori",
+    capacity=_SHIKIMORI_RPM,
+    period=60,
+    burst=_SHIKIMORI_RPS,
+    shared=(
+        RedisWindowLimiter("shikimori", {1: _SHIKIMORI_RPS, 60: _SHIKIMORI_RPM})
+        if os.getenv("SHIKIMORI_SHARED_RATE_LIMIT", "false").lower() == "true"
+        else None
+    ),
+)
+
+_search_flights = SingleFlight("shikimori_search")
+_anime_flights = SingleFlight("shikimori_anime")
+
+_user_request_generations: Dict[int, int] = {}
+_generation_counter = itertools.count(1)
+
+
+def _track_user_request(user_id: int) -> tuple[int, Callable[[], bool]]:
+    generation = next(_generation_counter)
+    _user_request_generations[user_id] = generation
+    return generation, lambda: _user_request_generations.get(user_id) != generation
+
+
+def _release_user_request(user_id: int, generation: int):
+    if _user_request_generations.get(user_id) == generation:
+        del _user_request_generations[user_id]
 
 
 async def fetch_json_with_retries(
-    url: str, max_retries: int = 3, backoff_base: int = 2
+    url: str,
+    max_retries: int = 3,
+    backoff_base: int = 2,
+    priority: Priority = PRIORITY_INTERACTIVE,
+    is_stale: Optional[Callable[[], bool]] = None,
+    max_wait: Optional[float] = None,
 ):
+    session = await http_client.session("shikimori")
     for attempt in range(max_retries):
+        await shikimori_limiter.acquire(priority, is_stale=is_stale, max_wait=max_wait)
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as resp:
-                    if resp.status == 429:
-                        await asyncio.sleep(backoff_base**attempt)
-                        continue
-                    if 200 <= resp.status < 300:
-                        return await resp.json()
-                    else:
-                        logger.warning(f"Request failed: {resp.status} — {url}")
+            async with session.get(url) as resp:
+                shikimori_limiter.update_from_headers(
+                    resp.status, resp.headers, fallback_delay=backoff_base**attempt
+                )
+                if resp.status == 429:
+                    continue
+                if 200 <= resp.status < 300:
+                    return await resp.json()
+                else:
+                    logger.warning(f"Request failed: {resp.status} — {url}")
         except Exception as e:
             logger.exception(f"Exception on attempt {attempt + 1}: {e}")
         await asyncio.sleep(1)
     return {}
 
 
-async def get_many_info_about_anime_from_shikimori(query: str):
+async def get_many_info_about_anime_from_shikimori(
+    query: str, user_id: Optional[int] = None
+):
     url = f"https://shikimori.one/api/animes?search={query}&limit=20"
-    data = await fetch_json_with_retries(url)
-    # log_api_response("shikimori_20", data)
+
+    def fetch(is_stale):
+        return fetch_json_with_retries(
+            url, is_stale=is_stale, max_wait=SHIKIMORI_MAX_QUEUE_WAIT
+        )
+
+    if user_id is None:
+        return await _search_flights.do(url, fetch)
+
+    generation, is_stale = _track_user_request(user_id)
+    try:
+        data = await _search_flights.do(url, fetch, is_stale=is_stale)
+    finally:
+        _release_user_request(user_id, generation)
+    api_capture.capture("shikimori_20", data)
     return data
 
 
-async def get_info_about_anime_from_shikimori_by_id(anime_id: int):
+async def get_info_about_anime_from_shikimori_by_id(
+    anime_id: int, priority: Priority = PRIORITY_INTERACTIVE
+):
     url = f"https://shikimori.one/api/animes/{anime_id}"
-    data = await fetch_json_with_retries(url)
-    log_api_response("shikimori_id", data)
+    initial_priority = priority_value(priority)
+    max_wait = (
+        SHIKIMORI_MAX_QUEUE_WAIT if initial_priority == PRIORITY_INTERACTIVE else None
+    )
+    data = await _anime_flights.do(
+        (anime_id, initial_priority),
+        lambda _: fetch_json_with_retries(url, priority=priority, max_wait=max_wait),
+    )
+    api_capture.capture("shikimori_id", data)
     return data
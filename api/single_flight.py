@@ -0,0 +1,63 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from loguru import logger
+
+from utils.metrics import metrics
+
+
+class _Flight:
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.stale_checks: List[Optional[Callable[[], bool]]] = []
+        self.priorities: List[Optional[int]] = []
+
+    def is_stale(self) -> bool:
+        return all(check is not None and check() for check in self.stale_checks)
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def priority(self, key: Hashable, default: int) -> int:
+        flight = self._flights.get(key)
+        if flight is None:
+            return default
+        return min(
+            (priority for priority in flight.priorities if priority is not None),
+            default=default,
+        )
+
+    async def do(
+        self,
+        key: Hashable,
+        factory: Callable[[Callable[[], bool]], Awaitable[Any]],
+        is_stale: Optional[Callable[[], bool]] = None,
+        priority: Optional[int] = None,
+    ) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            flight.task = asyncio.create_task(factory(flight.is_stale))
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self._flights[key] = flight
+            metrics.increment(f"single_flight.{self.name}.leader")
+        else:
+            metrics.increment(f"single_flight.{self.name}.coalesced")
+            logger.debug(f"Coalesced request | flight: {self.name} | key: {key}")
+
+        flight.stale_checks.append(is_stale)
+        flight.priorities.append(priority)
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.stale_checks.remove(is_stale)
+            flight.priorities.remove(priority)
+            if not flight.stale_checks and not flight.task.done():
+                flight.task.cancel()
@@ -1,10 +1,127 @@
-import httpx
+import asyncio
+import os
+from typing import Dict, List, Optional, Set, Tuple
 
+import aiohttp
+from loguru import logger
 
-async def translate_text(text: str, source: str = "en", target: str = "ru") -> str:
-    url = "http://libretranslate:5000/translate"
-    payload = {"q": text, "source": source, "target": target, "format": "text"}
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(url, json=payload)
+from api.http_client import http_client
+from api.single_flight import SingleFlight
+from cache.translation_cache import translation_cache
+
+LIBRETRANSLATE_URL = os.getenv(
+    "LIBRETRANSLATE_URL", "http://libretranslate:5000/translate"
+)
+TRANSLATE_TIMEOUT = float(os.getenv("TRANSLATE_TIMEOUT", "60"))
+TRANSLATE_BATCH_WINDOW = float(os.getenv("TRANSLATE_BATCH_WINDOW", "0.05"))
+TRANSLATE_BATCH_SIZE = int(os.getenv("TRANSLATE_BATCH_SIZE", "16"))
+
+_translation_flights = SingleFlight("translate")
+_pending_batches: Dict[Tuple[str, str], List[Tuple[str, asyncio.Future]]] = {}
+_flush_tasks: Set[asyncio.Task] = set()
+
+
+async def _request_translations(
+    texts: List[str], source: str, target: str
+) -> List[str]:
+    session = await http_client.session("libretranslate")
+    payload = {"q": texts, "source": source, "target": target, "format": "text"}
+    async with session.post(
+        LIBRETRANSLATE_URL,
+        json=payload,
+        timeout=aiohttp.ClientTimeout(total=TRANSLATE_TIMEOUT),
+    ) as resp:
         resp.raise_for_status()
-        return resp.json()["translatedText"]
+        data = await resp.json()
+
+    translated = data["translatedText"]
+    if isinstance(translated, str):
+        translated = [translated]
+    if len(translated) != len(texts):
+        raise ValueError(
+            f"LibreTranslate returned {len(translated)} texts for {len(texts)}"
+        )
+    logger.info(
+        f"Translated batch | source: {source} | target: {target} | size: {len(texts)}"
+    )
+    return translated
+
+
+async def _translate_uncached(
+    texts: List[str], source: str, target: str
+) -> Dict[str, str]:
+    missing = list(dict.fromkeys(texts))
+    translated = await _translation_flights.do(
+        (source, target, tuple(missing)),
+        lambda _: _request_translations(missing, source, target),
+    )
+    fresh = dict(zip(missing, translated))
+    await translation_cache.cache_translations(fresh, source, target)
+    return fresh
+
+
+async def translate_texts(
+    texts: List[str], source: str = "en", target: str = "ru"
+) -> List[str]:
+    cached = await translation_cache.get_translations(texts, source, target)
+    missing = [text for text in texts if text not in cached]
+
+    if missing:
+        cached.update(await _translate_uncached(missing, source, target))
+
+    return [cached[text] for text in texts]
+
+
+async def cached_translation(
+    text: str, source: str = "en", target: str = "ru"
+) -> Optional[str]:
+    translated = await translation_cache.get_translations([text], source, target)
+    return translated.get(text)
+
+
+async def _flush_batch(key: Tuple[str, str], batch: list, delay: float):
+    if delay:
+        await asyncio.sleep(delay)
+    if _pending_batches.get(key) is batch:
+        del _pending_batches[key]
+    items, batch[:] = list(batch), []
+    if not items:
+        return
+
+    source, target = key
+    try:
+        translated = await _translate_uncached(
+            [text for text, _ in items], source, target
+        )
+    except Exception as e:
+        for _, future in items:
+            if not future.done():
+                future.set_exception(e)
+        return
+    for text, future in items:
+        if not future.done():
+            future.set_result(translated[text])
+
+
+def _start_flush(key: Tuple[str, str], batch: list, delay: float):
+    task = asyncio.create_task(_flush_batch(key, batch, delay))
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_tasks.discard)
+
+
+async def translate_text(text: str, source: str = "en", target: str = "ru") -> str:
+    translated = await cached_translation(text, source, target)
+    if translated is not None:
+        return translated
+
+    key = (source, target)
+    batch = _pending_batches.get(key)
+    if batch is None:
+        batch = _pending_batches[key] = []
+        _start_flush(key, batch, TRANSLATE_BATCH_WINDOW)
+
+    future = asyncio.get_running_loop().create_future()
+    batch.append((text, future))
+    if len(batch) >= TRANSLATE_BATCH_SIZE:
+        _start_flush(key, batch, 0)
+    return await future
@@ -0,0 +1,103 @@
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache.codec import CacheCodec, msgpack, orjson, zstandard
+
+RUNS = int(os.getenv("BENCH_RUNS", "2000"))
+
+DESCRIPTION = (
+    "Двенадцать лет назад Девятихвостый Демон-Лис напал на Деревню Скрытого Листа. "
+    "Naruto Uzumaki is a young ninja who seeks recognition from his peers. "
+) * 12
+
+ANIME_ENTRY = {
+    "caption": f"<b>Наруто</b> / <i>Naruto</i>\n\n<b>Эпизоды:</b> 220\n\n{DESCRIPTION}",
+    "cover_image": "https://s4.anilist.co/file/anilistcdn/media/anime/cover/large/bx20-dE6UHbFFg1A5.jpg",
+    "anilist_id": 20,
+    "shikimori_id": 20,
+    "raw_data_db": {
+        "id_anilist": 20,
+        "id_shikimori": 20,
+        "title_original": "Naruto",
+        "title_ru": "Наруто",
+        "total_episodes_relase": 220,
+    },
+    "lang": "ru",
+}
+
+SEARCH_ENTRY = {
+    "query": "naruto",
+    "results": [
+        {
+            "id": 20 + index,
+            "name": f"Naruto {index}",
+            "russian": f"Наруто {index}",
+            "image": {
+                "original": f"/system/animes/original/{20 + index}.jpg",
+                "preview": f"/system/animes/preview/{20 + index}.jpg",
+                "x96": f"/system/animes/x96/{20 + index}.jpg",
+                "x48": f"/system/animes/x48/{20 + index}.jpg",
+            },
+            "url": f"/animes/{20 + index}-naruto",
+            "kind": "tv",
+            "score": "8.0",
+            "status": "released",
+            "episodes": 220,
+            "episodes_aired": 0,
+            "aired_on": "2002-10-03",
+            "released_on": "2007-02-08",
+        }
+        for index in range(5)
+    ],
+}
+
+
+class LegacyJson:
+    def encode(self, value):
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, data):
+        return json.loads(data)
+
+
+def codecs():
+    yield "json (legacy)", LegacyJson()
+    yield "json+zlib", CacheCodec(serializer="json", compression="zlib")
+    if orjson is not None:
+        yield "orjson", CacheCodec(serializer="orjson", compression="none")
+        yield "orjson+zlib", CacheCodec(serializer="orjson", compression="zlib")
+    if msgpack is not None:
+        yield "msgpack+zlib", CacheCodec(serializer="msgpack", compression="zlib")
+    if zstandard is not None:
+        yield "orjson+zstd", CacheCodec(serializer="orjson", compression="zstd")
+
+
+def timed(func, value) -> float:
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        func(value)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(samples)
+
+
+def main():
+    for payload_name, payload in (("anime", ANIME_ENTRY), ("search", SEARCH_ENTRY)):
+        print(f"{payload_name} entry")
+        for name, codec in codecs():
+            encoded = codec.encode(payload)
+            assert codec.decode(encoded) == payload
+            print(
+                f"  {name:<14} size: {len(encoded):6d} B | "
+                f"encode p50: {timed(codec.encode, payload):7.1f} us | "
+                f"decode p50: {timed(codec.decode, encoded):7.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+from unittest.mock import AsyncMock, patch
+
+from loguru import logger
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import anime_service
+
+SHIKIMORI_LATENCY = float(os.getenv("BENCH_SHIKIMORI_LATENCY", "0.30"))
+ANILIST_LATENCY = float(os.getenv("BENCH_ANILIST_LATENCY", "0.25"))
+RUNS = int(os.getenv("BENCH_RUNS", "10"))
+
+
+async def fake_shikimori(anime_id, *args, **kwargs):
+    await asyncio.sleep(SHIKIMORI_LATENCY)
+    return {"id": anime_id, "myanimelist_id": anime_id}
+
+
+async def fake_anilist(mal_id, *args, **kwargs):
+    await asyncio.sleep(ANILIST_LATENCY)
+    return {"data": {"Media": {"id": mal_id + 100000}}}
+
+
+def anime_entry(shikimori_id, record, cover_image, anilist_id, raw_data_db):
+    return {
+        "record": record,
+        "cover_image": cover_image,
+        "anilist_id": anilist_id,
+        "raw_data_db": raw_data_db,
+        "cached_at": time.time(),
+    }
+
+
+async def sequential_cold_view(shikimori_id: int):
+    data_from_shikimori = await fake_shikimori(shikimori_id)
+    await fake_anilist(data_from_shikimori.get("myanimelist_id", ""))
+
+
+async def measure(name: str, view) -> None:
+    samples = []
+    for run in range(RUNS):
+        started = time.perf_counter()
+        await view(run + 1)
+        samples.append((time.perf_counter() - started) * 1000)
+    print(
+        f"{name:<12} p50: {statistics.median(samples):7.1f} ms | "
+        f"max: {max(samples):7.1f} ms | runs: {RUNS}"
+    )
+
+
+async def main():
+    logger.remove()
+    with (
+        patch.object(anime_service, "anime_cache") as cache,
+        patch.object(anime_service, "anime_build_lock") as build_lock,
+        patch.object(
+            anime_service,
+            "get_info_about_anime_from_shikimori_by_id",
+            side_effect=fake_shikimori,
+        ),
+        patch.object(
+            anime_service,
+            "get_info_about_anime_from_anilist_by_mal_id",
+            side_effect=fake_anilist,
+        ),
+        patch.object(
+            anime_service,
+            "format_anime_caption",
+            new=AsyncMock(return_value=("caption", "cover.jpg", {})),
+        ),
+    ):
+        cache.get_cached_anime = AsyncMock(return_value=None)
+        cache.build_anime_entry.side_effect = anime_entry
+        cache.cache_anime = AsyncMock(return_value=True)
+        cache.get_rendered_caption.return_value = None
+        build_lock.acquire = AsyncMock(return_value="token")
+        build_lock.release = AsyncMock()
+
+        print(
+            f"Simulated upstream latency | shikimori: {SHIKIMORI_LATENCY * 1000:.0f} ms"
+            f" | anilist: {ANILIST_LATENCY * 1000:.0f} ms"
+        )
+        await measure("before", sequential_cold_view)
+        await measure(
+            "after",
+            lambda shikimori_id: anime_service.get_caption_and_cover_image(
+                shikimori_id, lang="en"
+            ),
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
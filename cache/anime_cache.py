@@ -1,50 +1,116 @@
-from typing import Dict, Optional, Any
+import os
+import time
+from typing import Dict, Optional, Any, List
 from loguru import logger
-from cache.redis_client import redis_client
+from cache.two_tier_cache import LocalCache, make_cache_store
 
 
 class AnimeCache:
     def __init__(self):
-        self.anime_ttl = 43200
+        self.anime_ttl = int(os.getenv("ANIME_CACHE_SOFT_TTL", "43200"))
+        self.anime_hard_ttl = int(os.getenv("ANIME_CACHE_HARD_TTL", "259200"))
+        self.store = make_cache_store(
+            "anime",
+            max_size=int(os.getenv("LOCAL_CACHE_ANIME_SIZE", "512")),
+            local_ttl=float(os.getenv("LOCAL_CACHE_TTL", "300")),
+        )
+        self.captions = LocalCache(
+            max_size=int(os.getenv("LOCAL_CACHE_CAPTION_SIZE", "2048")),
+            ttl=self.anime_ttl,
+        )
 
-    def _get_anime_key(self, shikimori_id: int, lang: str = "en") -> str:
-        return f"anime:{shikimori_id}:{lang}"
+    def _get_anime_key(self, shikimori_id: int) -> str:
+        return f"anime:record:{shikimori_id}"
 
-    async def cache_anime(
+    def _get_caption_key(
+        self, shikimori_id: int, lang: str, version: Optional[float]
+    ) -> str:
+        return f"{shikimori_id}:{lang}:{version}"
+
+    def build_anime_entry(
         self,
         shikimori_id: int,
-        caption: str,
+        record: dict,
         cover_image: str,
         anilist_id: int,
         raw_data_db: dict,
-        lang: str = "en",
-    ):
+    ) -> Dict[str, Any]:
+        cached_at = time.time()
+        return {
+            "record": record,
+            "cover_image": cover_image,
+            "anilist_id": anilist_id,
+            "shikimori_id": shikimori_id,
+            "raw_data_db": raw_data_db,
+            "cached_at": cached_at,
+            "fresh_until": cached_at + self.anime_ttl,
+        }
+
+    async def cache_anime(self, shikimori_id: int, anime_data: Dict[str, Any]) -> bool:
         try:
-            key = self._get_anime_key(shikimori_id, lang)
-            anime_data = {
-                "caption": caption,
-                "cover_image": cover_image,
-                "anilist_id": anilist_id,
-                "shikimori_id": shikimori_id,
-                "raw_data_db": raw_data_db,
-                "lang": lang,
-            }
-            await redis_client.set(key, anime_data, expire=self.anime_ttl)
+            key = self._get_anime_key(shikimori_id)
+            await self.store.set(
+                key, anime_data, expire=max(self.anime_ttl, self.anime_hard_ttl)
+            )
             logger.info(f"Save anime data with key {key}")
+            return True
         except Exception as e:
             logger.error(f"Error while caching: {e}")
+            return False
 
-    async def get_cached_anime(
-        self, shikimori_id: int, lang: str = "en"
-    ) -> Optional[Dict[str, Any]]:
+    async def get_cached_anime(self, shikimori_id: int) -> Optional[Dict[str, Any]]:
         try:
-            key = self._get_anime_key(shikimori_id, lang)
-            data = await redis_client.get(key)
+            key = self._get_anime_key(shikimori_id)
+            data = await self.store.get(key)
             logger.info(f"The anime date was successfully obtained with key {key}")
             return data
         except Exception as e:
             logger.error(f"Error reading anime cache\nException: {e}")
             return None
 
+    def stale_for(self, anime_data: Dict[str, Any]) -> float:
+        fresh_until = anime_data.get("fresh_until")
+        if fresh_until is None:
+            return 0.0
+        return max(0.0, time.time() - fresh_until)
+
+    def get_rendered_caption(
+        self, shikimori_id: int, lang: str, version: Optional[float]
+    ) -> Optional[str]:
+        caption = self.captions.get(self._get_caption_key(shikimori_id, lang, version))
+        return caption if isinstance(caption, str) else None
+
+    def cache_rendered_caption(
+        self, shikimori_id: int, lang: str, version: Optional[float], caption: str
+    ):
+        self.captions.set(self._get_caption_key(shikimori_id, lang, version), caption)
+
+    async def get_many_cached_anime(
+        self, shikimori_ids: List[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        try:
+            keys = [self._get_anime_key(shikimori_id) for shikimori_id in shikimori_ids]
+            values = await self.store.mget(keys)
+            found = {
+                shikimori_id: value
+                for shikimori_id, value in zip(shikimori_ids, values)
+                if value
+            }
+            logger.info(
+                f"Anime data received from cache | requested: {len(keys)} | found: {len(found)}"
+            )
+            return found
+        except Exception as e:
+            logger.error(f"Error reading anime cache\nException: {e}")
+            return {}
+
+    async def invalidate_anime(self, shikimori_ids: List[int]):
+        try:
+            keys = [self._get_anime_key(shikimori_id) for shikimori_id in shikimori_ids]
+            await self.store.delete_many(keys)
+            logger.info(f"Anime cache invalidated | keys: {len(keys)}")
+        except Exception as e:
+            logger.error(f"Error invalidating anime cache: {e}")
+
 
 anime_cache = AnimeCache()
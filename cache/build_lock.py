@@ -0,0 +1,67 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+from loguru import logger
+
+from cache.redis_client import redis_client
+from utils.metrics import metrics
+
+
+class BuildLock:
+    def __init__(self, name: str):
+        self.name = name
+        self.lease_ms = int(os.getenv("BUILD_LOCK_LEASE_MS", "20000"))
+        self.wait_timeout = float(os.getenv("BUILD_LOCK_WAIT_TIMEOUT", "10"))
+        self.poll_interval = float(os.getenv("BUILD_LOCK_POLL_INTERVAL", "0.1"))
+
+    def _get_lock_key(self, key: str) -> str:
+        return f"lock:{self.name}:{key}"
+
+    async def acquire(self, key: str) -> Optional[str]:
+        token = uuid.uuid4().hex
+        try:
+            if await redis_client.set_nx(self._get_lock_key(key), token, self.lease_ms):
+                metrics.increment(f"build_lock.{self.name}.acquired")
+                return token
+            metrics.increment(f"build_lock.{self.name}.contended")
+            return None
+        except Exception as e:
+            logger.error(
+                f"Build lock unavailable | lock: {self.name} | key: {key} | error: {e}"
+            )
+            return token
+
+    async def release(self, key: str, token: str):
+        try:
+            await redis_client.delete_if_equals(self._get_lock_key(key), token)
+        except Exception as e:
+            logger.error(
+                f"Failed to release build lock | lock: {self.name} | key: {key} | error: {e}"
+            )
+
+    async def wait_for(
+        self, key: str, lookup: Callable[[], Awaitable[Any]]
+    ) -> Optional[Any]:
+        started = time.monotonic()
+        deadline = started + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            value = await lookup()
+            if value:
+                metrics.observe(
+                    f"build_lock.{self.name}.wait_seconds", time.monotonic() - started
+                )
+                return value
+            try:
+                if not await redis_client.exists(self._get_lock_key(key)):
+                    break
+            except Exception as e:
+                logger.error(
+                    f"Build lock unavailable | lock: {self.name} | key: {key} | error: {e}"
+                )
+                break
+        metrics.increment(f"build_lock.{self.name}.wait_failed")
+        return None
@@ -0,0 +1,159 @@
+import json
+import os
+import zlib
+from typing import Any, Optional, Union
+
+from loguru import logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = 0xA5
+VERSION = 1
+HEADER_SIZE = 4
+
+SERIALIZER_JSON = 1
+SERIALIZER_ORJSON = 2
+SERIALIZER_MSGPACK = 3
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+SERIALIZERS = {
+    "json": SERIALIZER_JSON,
+    "orjson": SERIALIZER_ORJSON,
+    "msgpack": SERIALIZER_MSGPACK,
+}
+COMPRESSIONS = {
+    "none": COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD,
+}
+
+
+def _available_serializer(name: str) -> int:
+    serializer = SERIALIZERS.get(name, SERIALIZER_ORJSON)
+    if serializer == SERIALIZER_MSGPACK and msgpack is None:
+        serializer = SERIALIZER_ORJSON
+    if serializer == SERIALIZER_ORJSON and orjson is None:
+        serializer = SERIALIZER_JSON
+    return serializer
+
+
+def _available_compression(name: str) -> int:
+    compression = COMPRESSIONS.get(name, COMPRESSION_ZSTD)
+    if compression == COMPRESSION_ZSTD and zstandard is None:
+        compression = COMPRESSION_ZLIB
+    return compression
+
+
+class CacheCodec:
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compression: Optional[str] = None,
+        compress_threshold: Optional[int] = None,
+    ):
+        self.serializer = _available_serializer(
+            serializer or os.getenv("CACHE_SERIALIZER", "orjson")
+        )
+        self.compression = _available_compression(
+            compression or os.getenv("CACHE_COMPRESSION", "zstd")
+        )
+        self.compress_threshold = (
+            compress_threshold
+            if compress_threshold is not None
+            else int(os.getenv("CACHE_COMPRESS_THRESHOLD", "1024"))
+        )
+        self.zlib_level = int(os.getenv("CACHE_ZLIB_LEVEL", "6"))
+        self.zstd_level = int(os.getenv("CACHE_ZSTD_LEVEL", "3"))
+        self._zstd_compressor = None
+        self._zstd_decompressor = None
+
+    def _serialize(self, value: Any) -> bytes:
+        if self.serializer == SERIALIZER_ORJSON:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        if self.serializer == SERIALIZER_MSGPACK:
+            return msgpack.packb(value, use_bin_type=True)
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    def _deserialize(self, serializer: int, payload: bytes) -> Any:
+        if serializer == SERIALIZER_ORJSON:
+            if orjson is None:
+                return json.loads(payload)
+            return orjson.loads(payload)
+        if serializer == SERIALIZER_MSGPACK:
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        if serializer == SERIALIZER_JSON:
+            return json.loads(payload)
+        raise ValueError(f"Unknown cache serializer {serializer}")
+
+    def _compress(self, payload: bytes) -> tuple:
+        if (
+            self.compression == COMPRESSION_NONE
+            or len(payload) < self.compress_threshold
+        ):
+            return COMPRESSION_NONE, payload
+        if self.compression == COMPRESSION_ZSTD:
+            if self._zstd_compressor is None:
+                self._zstd_compressor = zstandard.ZstdCompressor(level=self.zstd_level)
+            compressed = self._zstd_compressor.compress(payload)
+        else:
+            compressed = zlib.compress(payload, self.zlib_level)
+        if len(compressed) >= len(payload):
+            return COMPRESSION_NONE, payload
+        return self.compression, compressed
+
+    def _decompress(self, compression: int, payload: bytes) -> bytes:
+        if compression == COMPRESSION_NONE:
+            return payload
+        if compression == COMPRESSION_ZLIB:
+            return zlib.decompress(payload)
+        if compression == COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                self._zstd_decompressor = zstandard.ZstdDecompressor()
+            return self._zstd_decompressor.decompress(payload)
+        raise ValueError(f"Unknown cache compression {compression}")
+
+    def encode(self, value: Any) -> bytes:
+        compression, payload = self._compress(self._serialize(value))
+        header = bytes((MAGIC, VERSION, self.serializer, compression))
+        return header + payload
+
+    def _decode_legacy(self, data: bytes) -> Any:
+        text = data.decode("utf-8")
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+
+    def decode(self, data: Optional[Union[bytes, str]]) -> Optional[Any]:
+        if not data:
+            return None
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        try:
+            if len(data) < HEADER_SIZE or data[0] != MAGIC or data[1] != VERSION:
+                return self._decode_legacy(data)
+            _, _, serializer, compression = data[:HEADER_SIZE]
+            payload = self._decompress(compression, data[HEADER_SIZE:])
+            return self._deserialize(serializer, payload)
+        except Exception as e:
+            logger.warning(f"Failed to decode cached value: {e}")
+            return None
+
+
+cache_codec = CacheCodec()
@@ -1,19 +1,45 @@
 from loguru import logger
 from cache.redis_client import redis_client
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 
 
 class FavoriteCache:
+    complete_field = "__complete__"
+
     def __init__(self):
         self.favorite_ttl = 43200
 
     def _get_user_favorites_key(self, user_id: int) -> str:
-        return f"favorites:{user_id}"
+        return f"favorites:hash:{user_id}"
+
+    def _get_user_favorite_ids_key(self, user_id: int) -> str:
+        return f"favorites:ids:{user_id}"
+
+    def favorites_from_hash(self, values: Dict[str, Any]) -> Optional[List[Dict]]:
+        if not values or self.complete_field not in values:
+            return None
+        return sorted(
+            (row for field, row in values.items() if field != self.complete_field),
+            key=lambda row: row["anime_id"],
+        )
+
+    def favorite_ids_from_hash(
+        self, values: Dict[str, Any]
+    ) -> Optional[Dict[int, int]]:
+        if not values or self.complete_field not in values:
+            return None
+        return {
+            int(id_shikimori): int(anime_id)
+            for anime_id, id_shikimori in values.items()
+            if anime_id != self.complete_field
+        }
 
     async def invalidate_user_favorites(self, user_id: int):
         try:
             key = self._get_user_favorites_key(user_id)
-            await redis_client.delete(key)
+            await redis_client.delete_many(
+                [key, self._get_user_favorite_ids_key(user_id)]
+            )
             logger.info(f"Favorite cache has been successfully cleared with key {key}")
         except Exception as e:
             logger.error(f"Error clearing the user's favorites cache: {e}")
@@ -21,7 +47,17 @@ class FavoriteCache:
     async def cache_user_favorites(self, user_id: int, favorites: List[Dict]):
         try:
             key = self._get_user_favorites_key(user_id)
-            await redis_client.set(key, favorites, expire=self.favorite_ttl)
+            mapping = {str(row["anime_id"]): row for row in favorites}
+            mapping[self.complete_field] = 1
+            await redis_client.hset(key, mapping, self.favorite_ttl, replace=True)
+            ids = {str(row["anime_id"]): row["id_shikimori"] for row in favorites}
+            ids[self.complete_field] = 1
+            await redis_client.hset(
+                self._get_user_favorite_ids_key(user_id),
+                ids,
+                self.favorite_ttl,
+                replace=True,
+            )
             logger.info(f"Favorite cache has been successfully saved with key {key}")
         except Exception as e:
             logger.error(f"Caching error for selected user: {e}")
@@ -29,12 +65,41 @@ class FavoriteCache:
     async def get_cached_user_favorites(self, user_id: int) -> Optional[List[Dict]]:
         try:
             key = self._get_user_favorites_key(user_id)
-            data = await redis_client.get(key)
+            data = self.favorites_from_hash(await redis_client.hgetall(key))
             logger.info(f"Favorite cache was successfully retrieved with key {key}")
             return data
         except Exception as e:
             logger.error(f"Error retrieving selected user from cache: {e}")
             return None
 
+    async def add_user_favorite(self, user_id: int, favorite: Dict):
+        try:
+            key = self._get_user_favorites_key(user_id)
+            field = str(favorite["anime_id"])
+            await redis_client.hset(key, {field: favorite}, self.favorite_ttl)
+            await redis_client.hset(
+                self._get_user_favorite_ids_key(user_id),
+                {field: favorite["id_shikimori"]},
+                self.favorite_ttl,
+            )
+            logger.info(
+                f"Favorite {favorite['anime_id']} added to cache with key {key}"
+            )
+        except Exception as e:
+            logger.error(f"Error adding favorite to cache: {e}")
+            await self.invalidate_user_favorites(user_id)
+
+    async def remove_user_favorite(self, user_id: int, anime_id: int):
+        try:
+            key = self._get_user_favorites_key(user_id)
+            await redis_client.hdel(key, [str(anime_id)])
+            await redis_client.hdel(
+                self._get_user_favorite_ids_key(user_id), [str(anime_id)]
+            )
+            logger.info(f"Favorite {anime_id} removed from cache with key {key}")
+        except Exception as e:
+            logger.error(f"Error removing favorite from cache: {e}")
+            await self.invalidate_user_favorites(user_id)
+
 
 favorite_cache = FavoriteCache()
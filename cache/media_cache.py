@@ -0,0 +1,89 @@
+import hashlib
+import os
+from typing import Optional
+
+from loguru import logger
+
+from cache.two_tier_cache import make_cache_store
+from database.media import (
+    delete_media_file_id,
+    get_media_file_id,
+    get_recent_media_file_ids,
+    save_media_file_id,
+)
+
+
+class MediaCache:
+    def __init__(self):
+        self.media_ttl = int(os.getenv("MEDIA_CACHE_TTL", str(30 * 24 * 3600)))
+        self.miss_ttl = int(os.getenv("MEDIA_CACHE_MISS_TTL", "300"))
+        self.db_enabled = os.getenv("MEDIA_CACHE_DB_ENABLED", "true").lower() == "true"
+        self.warm_up_limit = int(os.getenv("MEDIA_CACHE_WARM_UP_LIMIT", "1000"))
+        self.store = make_cache_store(
+            "media",
+            max_size=int(os.getenv("LOCAL_CACHE_MEDIA_SIZE", "2048")),
+            local_ttl=float(os.getenv("LOCAL_CACHE_TTL", "300")),
+        )
+
+    def _get_media_key(self, cover_url: str) -> str:
+        digest = hashlib.sha256(cover_url.encode("utf-8")).hexdigest()
+        return f"tg_file:{digest}"
+
+    async def get_file_id(self, cover_url: str) -> Optional[str]:
+        if not cover_url:
+            return None
+        try:
+            key = self._get_media_key(cover_url)
+            file_id = await self.store.get(key)
+            if file_id is None and self.db_enabled:
+                file_id = await get_media_file_id(cover_url)
+                if file_id:
+                    await self.store.set(key, file_id, expire=self.media_ttl)
+                else:
+                    await self.store.set(key, "", expire=self.miss_ttl)
+            return file_id or None
+        except Exception as e:
+            logger.error(f"Error reading media cache for {cover_url}: {e}")
+            return None
+
+    async def cache_file_id(self, cover_url: str, file_id: str):
+        try:
+            key = self._get_media_key(cover_url)
+            await self.store.set(key, file_id, expire=self.media_ttl)
+            if self.db_enabled:
+                await save_media_file_id(cover_url, file_id)
+            logger.info(f"Telegram file_id cached with key {key}")
+        except Exception as e:
+            logger.error(f"Error caching file_id for {cover_url}: {e}")
+
+    async def invalidate(self, cover_url: str):
+        try:
+            key = self._get_media_key(cover_url)
+            await self.store.delete(key)
+            if self.db_enabled:
+                await delete_media_file_id(cover_url)
+            logger.info(f"Telegram file_id invalidated with key {key}")
+        except Exception as e:
+            logger.error(f"Error invalidating file_id for {cover_url}: {e}")
+
+    async def warm_up(self):
+        if not self.db_enabled or self.warm_up_limit <= 0:
+            return
+        try:
+            rows = await get_recent_media_file_ids(self.warm_up_limit)
+            await self.store.mset(
+                [
+                    (
+                        self._get_media_key(row["cover_url"]),
+                        row["file_id"],
+                        self.media_ttl,
+                    )
+                    for row in rows
+                ]
+            )
+            logger.info(f"Media cache warmed up | file_ids: {len(rows)}")
+        except Exception as e:
+            logger.error(f"Media cache warm-up failed: {e}")
+
+
+media_cache = MediaCache()
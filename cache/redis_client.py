@@ -1,9 +1,11 @@
 import redis.asyncio as redis
-import json
 import os
-from typing import Optional, Any
+from contextlib import asynccontextmanager
+from typing import Optional, Any, Dict, List, Tuple
 from loguru import logger
 
+from cache.codec import cache_codec
+
 
 class RedisClient:
     def __init__(self):
@@ -14,7 +16,7 @@ class RedisClient:
     async def connect(self):
         try:
             self.redis = redis.Redis(
-                host=self.host, port=self.port, decode_responses=True
+                host=self.host, port=self.port, decode_responses=False
             )
             await self.redis.ping()
             logger.info(f"Error Redis on {self.host}:{self.port}")
@@ -30,22 +32,88 @@ class RedisClient:
         if not self.redis:
             await self.connect()
 
-        if isinstance(value, (dict, list)):
-            value = json.dumps(value, ensure_ascii=False)
+        await self.redis.set(key, self.encode(value), ex=expire)
 
-        await self.redis.set(key, value, ex=expire)
+    def encode(self, value: Any) -> bytes:
+        return cache_codec.encode(value)
 
     async def get(self, key: str) -> Optional[Any]:
         if not self.redis:
             await self.connect()
 
         value = await self.redis.get(key)
-        if value:
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
-        return None
+        return self.decode(value)
+
+    def decode(self, value: Optional[bytes]) -> Optional[Any]:
+        return cache_codec.decode(value)
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        if not self.redis:
+            await self.connect()
+
+        if not keys:
+            return []
+        values = await self.redis.mget(keys)
+        return [self.decode(value) for value in values]
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False):
+        if not self.redis:
+            await self.connect()
+
+        async with self.redis.pipeline(transaction=transaction) as pipe:
+            yield pipe
+
+    async def mset(self, items: List[Tuple[str, Any, int]]):
+        if not self.redis:
+            await self.connect()
+
+        if not items:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value, expire in items:
+                pipe.set(key, self.encode(value), ex=expire)
+            await pipe.execute()
+
+    async def hgetall(self, key: str) -> Dict[str, Any]:
+        if not self.redis:
+            await self.connect()
+
+        values = await self.redis.hgetall(key)
+        return self.decode_hash(values)
+
+    def decode_hash(self, values: Optional[Dict[bytes, bytes]]) -> Dict[str, Any]:
+        return {
+            (field.decode() if isinstance(field, bytes) else field): self.decode(value)
+            for field, value in (values or {}).items()
+        }
+
+    async def hset(
+        self, key: str, mapping: Dict[str, Any], expire: int, replace: bool = False
+    ):
+        if not self.redis:
+            await self.connect()
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if replace:
+                pipe.delete(key)
+            if mapping:
+                pipe.hset(
+                    key,
+                    mapping={
+                        field: self.encode(value) for field, value in mapping.items()
+                    },
+                )
+                pipe.expire(key, expire)
+            await pipe.execute()
+
+    async def hdel(self, key: str, fields: List[str]) -> int:
+        if not self.redis:
+            await self.connect()
+
+        if not fields:
+            return 0
+        return await self.redis.hdel(key, *fields)
 
     async def delete(self, key: str):
         if not self.redis:
@@ -53,6 +121,67 @@ class RedisClient:
 
         await self.redis.delete(key)
 
+    async def delete_many(self, keys: List[str]):
+        if not self.redis:
+            await self.connect()
+
+        if keys:
+            await self.redis.unlink(*keys)
+
+    async def delete_prefix(self, prefix: str, batch_size: int = 500) -> int:
+        if not self.redis:
+            await self.connect()
+
+        deleted = 0
+        batch = []
+        async for key in self.redis.scan_iter(match=f"{prefix}*", count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += await self.redis.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += await self.redis.unlink(*batch)
+        return deleted
+
+    async def publish(self, channel: str, message: str):
+        if not self.redis:
+            await self.connect()
+
+        await self.redis.publish(channel, message)
+
+    async def pubsub(self, channel: str):
+        if not self.redis:
+            await self.connect()
+
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        return pubsub
+
+    async def set_nx(self, key: str, value: str, expire_ms: int) -> bool:
+        if not self.redis:
+            await self.connect()
+
+        return bool(await self.redis.set(key, value, nx=True, px=expire_ms))
+
+    async def delete_if_equals(self, key: str, value: str) -> bool:
+        if not self.redis:
+            await self.connect()
+
+        deleted = await self.redis.eval(
+            "if redis.call('get', KEYS[1]) == ARGV[1] then "
+            "return redis.call('del', KEYS[1]) else return 0 end",
+            1,
+            key,
+            value,
+        )
+        return bool(deleted)
+
+    async def eval(self, script: str, keys: List[str], args: List[Any]) -> Any:
+        if not self.redis:
+            await self.connect()
+
+        return await self.redis.eval(script, len(keys), *keys, *args)
+
     async def exists(self, key: str) -> bool:
         if not self.redis:
             await self.connect()
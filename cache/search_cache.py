@@ -1,57 +1,90 @@
+import os
 from loguru import logger
-from cache.redis_client import redis_client
+from cache.two_tier_cache import make_cache_store
+from utils.utils import normalize_search_query
 from typing import List, Dict, Optional, Any
 
 
 class SearchCache:
     def __init__(self):
         self.search_ttl = 21600
+        self.empty_search_ttl = 300
+        self.store = make_cache_store(
+            "search",
+            max_size=int(os.getenv("LOCAL_CACHE_SEARCH_SIZE", "1024")),
+            local_ttl=float(os.getenv("LOCAL_CACHE_TTL", "300")),
+        )
 
-    def _get_search_key(self, user_id: int, query: str) -> str:
-        return f"search:user:{user_id}:{query.lower().replace(' ', '_')}"
+    def _get_search_key(self, query: str) -> str:
+        return f"search:query:{normalize_search_query(query)}"
 
     def _get_last_search_key(self, user_id: int) -> str:
         return f"last_search:{user_id}"
 
-    async def cache_search_results(self, user_id: int, query: str, results: List[Dict]):
+    def _last_search_pointer(self, query: str) -> Dict[str, str]:
+        return {"query": query, "key": self._get_search_key(query)}
+
+    async def cache_search_results(self, query: str, results: List[Dict]):
         try:
-            key = self._get_search_key(user_id, query)
+            key = self._get_search_key(query)
             search_data = {"query": query, "results": results}
-            await redis_client.set(key, search_data, expire=self.search_ttl)
+            expire = self.search_ttl if results else self.empty_search_ttl
+            await self.store.set(key, search_data, expire=expire)
             logger.info(f"Search cache has been successfully saved {key}")
+        except Exception as e:
+            logger.error(f"Error caching search ‘{query}’: {e}")
+
+    async def save_search_results(self, user_id: int, query: str, results: List[Dict]):
+        try:
+            search_data = {"query": query, "results": results}
+            await self.store.mset(
+                [
+                    (self._get_search_key(query), search_data, self.search_ttl),
+                    (
+                        self._get_last_search_key(user_id),
+                        self._last_search_pointer(query),
+                        self.search_ttl,
+                    ),
+                ]
+            )
+            logger.info(
+                f"Search and last search saved successfully | user_id: {user_id} | query: '{query}'"
+            )
         except Exception as e:
             logger.error(f"Error caching search ‘{query}’ for user {user_id}: {e}")
 
-    async def get_cached_search_results(
-        self, user_id: int, query: str
-    ) -> Optional[Dict[str, Any]]:
+    async def get_cached_search_results(self, query: str) -> Optional[Dict[str, Any]]:
         try:
-            key = self._get_search_key(user_id, query)
-            data = await redis_client.get(key)
+            key = self._get_search_key(query)
+            data = await self.store.get(key)
             logger.info(f"Cache was received successfully {key}")
             return data
         except Exception as e:
-            logger.error(
-                f"Error retrieving search ‘{query}’ for user {user_id} from cache: {e}"
-            )
+            logger.error(f"Error retrieving search ‘{query}’ from cache: {e}")
             return None
 
     async def get_user_last_search(self, user_id: int) -> Optional[Dict[str, Any]]:
         try:
             key = self._get_last_search_key(user_id)
+            pointer = await self.store.get(key)
+            if not pointer or "results" in pointer:
+                return pointer
+
+            search_data = await self.store.get(pointer["key"])
+            if not search_data:
+                return None
             logger.info(f"Last user search received successfully {key}")
-            return await redis_client.get(key)
+            return {"query": pointer["query"], "results": search_data["results"]}
         except Exception as e:
             logger.error(f"Error retrieving last search {user_id}: {e}")
             return None
 
-    async def save_user_last_search(
-        self, user_id: int, query: str, results: List[Dict]
-    ):
+    async def save_user_last_search(self, user_id: int, query: str):
         try:
             key = self._get_last_search_key(user_id)
-            data = {"query": query, "results": results}
-            await redis_client.set(key, data, expire=self.search_ttl)
+            await self.store.set(
+                key, self._last_search_pointer(query), expire=self.search_ttl
+            )
             logger.info(f"The latest search results have been saved successfully {key}")
         except Exception as e:
             logger.error(f"Error saving last search {user_id}: {e}")
@@ -0,0 +1,53 @@
+import hashlib
+from typing import Dict, List
+from loguru import logger
+from cache.redis_client import redis_client
+
+
+class TranslationCache:
+    def __init__(self):
+        self.translation_ttl = 30 * 24 * 3600
+
+    def _get_translation_key(self, text: str, source: str, target: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"translation:{source}:{target}:{digest}"
+
+    async def get_translations(
+        self, texts: List[str], source: str, target: str
+    ) -> Dict[str, str]:
+        try:
+            keys = [self._get_translation_key(text, source, target) for text in texts]
+            values = await redis_client.mget(keys)
+            found = {
+                text: value["text"]
+                for text, value in zip(texts, values)
+                if isinstance(value, dict) and "text" in value
+            }
+            logger.info(
+                f"Translations received from cache | requested: {len(texts)} | found: {len(found)}"
+            )
+            return found
+        except Exception as e:
+            logger.error(f"Error reading translation cache: {e}")
+            return {}
+
+    async def cache_translations(
+        self, translations: Dict[str, str], source: str, target: str
+    ):
+        try:
+            await redis_client.mset(
+                [
+                    (
+                        self._get_translation_key(text, source, target),
+                        {"text": translated},
+                        self.translation_ttl,
+                    )
+                    for text, translated in translations.items()
+                ]
+            )
+            logger.info(f"Translations cached | count: {len(translations)}")
+        except Exception as e:
+            logger.error(f"Error caching translations: {e}")
+
+
+translation_cache = TranslationCache()
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from loguru import logger
+
+from cache.redis_client import redis_client
+from utils.metrics import metrics
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+_MISSING = object()
+
+
+class LocalCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        for key in [key for key in self._data if key.startswith(prefix)]:
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TwoTierCache:
+    def __init__(self, name: str, max_size: int = 1024, local_ttl: float = 60):
+        self.name = name
+        self.local = LocalCache(max_size, local_ttl)
+        cache_invalidator.register(self)
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not _MISSING:
+            metrics.increment(f"cache.{self.name}.local_hit")
+            return value
+
+        metrics.increment(f"cache.{self.name}.local_miss")
+        value = await redis_client.get(key)
+        if value is not None:
+            self.local.set(key, value)
+        return value
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        values = [self.local.get(key) for key in keys]
+        missing = [key for key, value in zip(keys, values) if value is _MISSING]
+        metrics.increment(f"cache.{self.name}.local_hit", len(keys) - len(missing))
+        if missing:
+            metrics.increment(f"cache.{self.name}.local_miss", len(missing))
+            fetched = dict(zip(missing, await redis_client.mget(missing)))
+            for key, value in fetched.items():
+                if value is not None:
+                    self.local.set(key, value)
+            values = [
+                fetched[key] if value is _MISSING else value
+                for key, value in zip(keys, values)
+            ]
+        return values
+
+    async def set(self, key: str, value: Any, expire: int = 3600):
+        await redis_client.set(key, value, expire=expire)
+        self.local.set(key, value, ttl=expire)
+        await cache_invalidator.publish(keys=[key])
+
+    async def mset(self, items: List[Tuple[str, Any, int]]):
+        await redis_client.mset(items)
+        for key, value, expire in items:
+            self.local.set(key, value, ttl=expire)
+        await cache_invalidator.publish(keys=[key for key, _, _ in items])
+
+    async def delete(self, key: str):
+        await redis_client.delete(key)
+        self.local.delete(key)
+        await cache_invalidator.publish(keys=[key])
+
+    async def delete_many(self, keys: List[str]):
+        await redis_client.delete_many(keys)
+        for key in keys:
+            self.local.delete(key)
+        await cache_invalidator.publish(keys=keys)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        deleted = await redis_client.delete_prefix(prefix)
+        self.local.delete_prefix(prefix)
+        await cache_invalidator.publish(prefix=prefix)
+        return deleted
+
+    async def exists(self, key: str) -> bool:
+        if self.local.get(key) is not _MISSING:
+            return True
+        return await redis_client.exists(key)
+
+
+class CacheInvalidator:
+    def __init__(self):
+        self.instance_id = uuid.uuid4().hex
+        self.caches: List[TwoTierCache] = []
+        self._listener: Optional[asyncio.Task] = None
+
+    def register(self, cache: TwoTierCache):
+        self.caches.append(cache)
+
+    def invalidate_local(self, keys: List[str] = (), prefix: Optional[str] = None):
+        for cache in self.caches:
+            for key in keys:
+                cache.local.delete(key)
+            if prefix is not None:
+                cache.local.delete_prefix(prefix)
+
+    def clear_local(self):
+        for cache in self.caches:
+            cache.local.clear()
+
+    async def publish(self, keys: List[str] = (), prefix: Optional[str] = None):
+        if not keys and prefix is None:
+            return
+        try:
+            message = json.dumps(
+                {"origin": self.instance_id, "keys": list(keys), "prefix": prefix}
+            )
+            await redis_client.publish(INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            logger.error(
+                f"Failed to publish cache invalidation | keys: {list(keys)} | prefix: {prefix} | error: {e}"
+            )
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = await redis_client.pubsub(INVALIDATION_CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        payload = json.loads(message["data"])
+                        if payload.get("origin") != self.instance_id:
+                            self.invalidate_local(
+                                payload.get("keys", []), payload.get("prefix")
+                            )
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener failed: {e}")
+                self.clear_local()
+                await asyncio.sleep(1)
+
+    async def start(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+            logger.info("Cache invalidation listener started")
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+cache_invalidator = CacheInvalidator()
+
+
+def make_cache_store(name: str, max_size: int, local_ttl: float):
+    if os.getenv("LOCAL_CACHE_ENABLED", "true").lower() != "true":
+        return redis_client
+    return TwoTierCache(name, max_size=max_size, local_ttl=local_ttl)
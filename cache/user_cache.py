@@ -1,10 +1,16 @@
+import os
 from loguru import logger
-from cache.redis_client import redis_client
+from cache.two_tier_cache import make_cache_store
 
 
 class UserCache:
     def __init__(self):
         self.user_tll = 43200
+        self.store = make_cache_store(
+            "user",
+            max_size=int(os.getenv("LOCAL_CACHE_USER_SIZE", "10000")),
+            local_ttl=float(os.getenv("LOCAL_CACHE_TTL", "300")),
+        )
 
     def _get_user_language_key(self, user_id: int) -> str:
         return f"language:{user_id}"
@@ -12,7 +18,7 @@ class UserCache:
     async def user_language(self, user_id: int, language: str):
         try:
             key = self._get_user_language_key(user_id)
-            await redis_client.set(key, language, expire=self.user_tll)
+            await self.store.set(key, language, expire=self.user_tll)
             logger.info(f"User language saved {key}")
         except Exception:
             logger.error(f"Language caching error {user_id}:{language}")
@@ -20,7 +26,7 @@ class UserCache:
     async def get_user_language(self, user_id: int) -> str | None:
         try:
             key = self._get_user_language_key(user_id)
-            data = await redis_client.get(key)
+            data = await self.store.get(key)
             logger.info(f"User language received {key}")
             return data
         except Exception as e:
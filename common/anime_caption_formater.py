@@ -1,10 +1,12 @@
 import html
 from datetime import datetime
+from typing import Optional
 
 from loguru import logger
 
 from api.translate import translate_text
 from common.anime_info_formatter import AnimeInfo
+from utils.api_capture import api_capture
 from utils.i18n import i18n
 from utils.utils import (
     _format_description,
@@ -13,22 +15,21 @@ from utils.utils import (
     format_genres,
     format_status,
     format_type,
-    log_api_response,
 )
 from utils.utils import classify_airing_schedule
 
 
-async def format_anime_caption(anime_info: AnimeInfo, lang: str):
-    log_api_response("anime_info_input", anime_info.__dict__)
-
-    title_data = anime_info.title()
-    type_data = anime_info.type()
-    status_data = anime_info.status()
-    genres_data = anime_info.genres()
+def description_to_translate(anime_info: AnimeInfo, lang: str) -> Optional[str]:
+    if lang != "ru":
+        return None
     description_data = anime_info.description()
-    airing_schedule_data = anime_info.airing_schedule()
+    if strip_html_tags(description_data.get("desc_shikimori")):
+        return None
+    return strip_html_tags(description_data.get("desc_anilist")) or None
 
-    airing_schedule = airing_schedule_data.get("airing_schedule_coming")[:3]
+
+def anime_db_data(anime_info: AnimeInfo) -> dict:
+    airing_schedule_data = anime_info.airing_schedule()
     airing_schedule_classified = airing_schedule_data.get("airing_schedule_anilist", [])
     classified_schedule = classify_airing_schedule(airing_schedule_classified)
     aired_episodes_count = len(classified_schedule.get("past", []))
@@ -38,17 +39,45 @@ async def format_anime_caption(anime_info: AnimeInfo, lang: str):
     status_data = anime_info.status()
 
     if aired_episodes_count == 0 and total_episodes and total_episodes > 0:
-        status_anilist = status_data.get("status_anilist", "").upper()
-        status_shikimori = status_data.get("status_shikimori", "").lower()
+        status_anilist = (status_data.get("status_anilist") or "").upper()
+        status_shikimori = (status_data.get("status_shikimori") or "").lower()
 
-        is_finished = (
-            status_anilist in ["FINISHED", "COMPLETED"] or
-            status_shikimori in ["released", "завершено"]
-        )
+        is_finished = status_anilist in [
+            "FINISHED",
+            "COMPLETED",
+        ] or status_shikimori in ["released", "завершено"]
 
         if is_finished:
             aired_episodes_count = total_episodes
 
+    title_data = anime_info.title()
+    return {
+        "total_episodes_relase": aired_episodes_count,
+        "title_ru": title_data.get("russian") or "",
+        "title_original": title_data.get("romaji")
+        or title_data.get("english")
+        or f"Unknown_{anime_info.ids.get('shikimori_id', 0)}",
+        "airing_schedule_count": aired_episodes_count,
+    }
+
+
+async def format_anime_caption(
+    anime_info: AnimeInfo,
+    lang: str,
+    translate: bool = True,
+    translated_description: Optional[str] = None,
+):
+    api_capture.capture("anime_info_input", anime_info.__dict__)
+
+    title_data = anime_info.title()
+    type_data = anime_info.type()
+    status_data = anime_info.status()
+    genres_data = anime_info.genres()
+    description_data = anime_info.description()
+    airing_schedule_data = anime_info.airing_schedule()
+
+    airing_schedule = airing_schedule_data.get("airing_schedule_coming")[:3]
+
     def format_episodes(episodes):
         res = []
         episode = "Эпизод" if lang == "ru" else "Episode"
@@ -79,7 +108,10 @@ async def format_anime_caption(anime_info: AnimeInfo, lang: str):
         if not description:
             description = description_data.get("desc_anilist")
             description = strip_html_tags(description)
-            description = await translate_text(description)
+            if translated_description:
+                description = translated_description
+            elif translate and description:
+                description = await translate_text(description)
 
     else:
         title = title_data.get("romaji")
@@ -104,14 +136,7 @@ async def format_anime_caption(anime_info: AnimeInfo, lang: str):
     description = _format_description(description, airing_schedule_str)
     cover_image = get_cover_image(cover_image_data)
 
-    raw_data_db = {
-        "total_episodes_relase": aired_episodes_count,
-        "title_ru": title_data.get("russian") or "",
-        "title_original": title_data.get("romaji")
-        or title_data.get("english")
-        or f"Unknown_{anime_info.ids.get('shikimori_id', 0)}",
-        "airing_schedule_count": aired_episodes_count
-    }
+    raw_data_db = anime_db_data(anime_info)
     logger.info(raw_data_db)
     caption_parts = []
     if title:
@@ -164,5 +189,5 @@ async def format_anime_caption(anime_info: AnimeInfo, lang: str):
         "raw_data_db": raw_data_db,
         "anime_info_ids": getattr(anime_info, "ids", {}),
     }
-    log_api_response("caption_debug", debug_info)
+    api_capture.capture("caption_debug", debug_info)
     return caption, cover_image, raw_data_db
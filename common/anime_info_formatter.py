@@ -1,11 +1,39 @@
 from utils.utils import classify_airing_schedule
 
+SHIKIMORI_RECORD_FIELDS = (
+    "id",
+    "name",
+    "russian",
+    "description",
+    "image",
+    "genres",
+    "score",
+    "episodes",
+    "aired_on",
+    "kind",
+    "status",
+)
+
 
 class AnimeInfo:
     def __init__(self, shikimori_data: dict, anilist_data: dict):
         self.shikimori = shikimori_data
         self.anilist = anilist_data.get("data", {}).get("Media", {})
 
+    def to_record(self) -> dict:
+        return {
+            "shikimori": {
+                field: self.shikimori[field]
+                for field in SHIKIMORI_RECORD_FIELDS
+                if field in self.shikimori
+            },
+            "anilist": self.anilist or {},
+        }
+
+    @classmethod
+    def from_record(cls, record: dict) -> "AnimeInfo":
+        return cls(record["shikimori"], {"data": {"Media": record["anilist"]}})
+
     @property
     def ids(self):
         return {
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Dict, Optional, Tuple
+
+from aiogram import types
+from loguru import logger
+
+_caption_updates: Dict[Tuple[int, int], asyncio.Task] = {}
+_caption_markups: Dict[Tuple[int, int], Optional[types.InlineKeyboardMarkup]] = {}
+
+
+def _message_key(message: types.Message) -> Tuple[int, int]:
+    return message.chat.id, message.message_id
+
+
+def cancel_caption_update(message: types.Message):
+    key = _message_key(message)
+    task = _caption_updates.pop(key, None)
+    _caption_markups.pop(key, None)
+    if task and not task.done():
+        task.cancel()
+
+
+def set_caption_update_markup(
+    message: types.Message, reply_markup: Optional[types.InlineKeyboardMarkup]
+):
+    key = _message_key(message)
+    if key in _caption_updates:
+        _caption_markups[key] = reply_markup
+
+
+def _forget_caption_update(key: Tuple[int, int], task: asyncio.Task):
+    if _caption_updates.get(key) is task:
+        _caption_updates.pop(key, None)
+        _caption_markups.pop(key, None)
+
+
+async def _apply_caption_update(message: types.Message, caption_task: asyncio.Task):
+    try:
+        caption = await asyncio.shield(caption_task)
+        await message.edit_caption(
+            caption=caption,
+            parse_mode="HTML",
+            reply_markup=_caption_markups.get(_message_key(message)),
+        )
+        logger.info(
+            f"Caption updated in place | chat_id: {message.chat.id} | message_id: {message.message_id}"
+        )
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(
+            f"Caption update skipped | chat_id: {message.chat.id} | message_id: {message.message_id} | error: {e}"
+        )
+
+
+def schedule_caption_update(
+    message: types.Message,
+    caption_task: asyncio.Task,
+    reply_markup: Optional[types.InlineKeyboardMarkup] = None,
+):
+    cancel_caption_update(message)
+    key = _message_key(message)
+    task = asyncio.create_task(_apply_caption_update(message, caption_task))
+    _caption_updates[key] = task
+    _caption_markups[key] = reply_markup
+    task.add_done_callback(lambda done: _forget_caption_update(key, done))
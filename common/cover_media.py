@@ -0,0 +1,47 @@
+from typing import Optional
+
+from aiogram import types
+from aiogram.exceptions import TelegramBadRequest
+from loguru import logger
+
+from cache.media_cache import media_cache
+from utils.metrics import metrics
+
+
+async def _edit_photo(
+    message: types.Message,
+    media: str,
+    caption: str,
+    reply_markup: Optional[types.InlineKeyboardMarkup],
+):
+    return await message.edit_media(
+        media=types.InputMediaPhoto(media=media, caption=caption, parse_mode="HTML"),
+        reply_markup=reply_markup,
+    )
+
+
+async def edit_cover_media(
+    message: types.Message,
+    cover_image: str,
+    caption: str,
+    reply_markup: Optional[types.InlineKeyboardMarkup] = None,
+):
+    file_id = await media_cache.get_file_id(cover_image)
+    if file_id:
+        try:
+            await _edit_photo(message, file_id, caption, reply_markup)
+            metrics.increment("media_cache.file_id_hit")
+            return
+        except TelegramBadRequest as e:
+            if "not modified" in str(e).lower():
+                raise
+            logger.warning(
+                f"Cached file_id rejected, falling back to URL | cover: {cover_image} | error: {e}"
+            )
+            metrics.increment("media_cache.file_id_rejected")
+            await media_cache.invalidate(cover_image)
+
+    metrics.increment("media_cache.file_id_miss")
+    result = await _edit_photo(message, cover_image, caption, reply_markup)
+    if isinstance(result, types.Message) and result.photo:
+        await media_cache.cache_file_id(cover_image, result.photo[-1].file_id)
@@ -2,31 +2,97 @@ import asyncpg
 import asyncio
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
 
 from loguru import logger
 
+from utils.metrics import metrics
+
 _db_pool = None
+_pool_lock = asyncio.Lock()
+
+
+class InstrumentedPool:
+    def __init__(self, pool: asyncpg.Pool, max_size: int, acquire_timeout: float):
+        self.pool = pool
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.waiting = 0
+
+    def __getattr__(self, name):
+        return getattr(self.pool, name)
+
+    def _report(self):
+        size = self.pool.get_size()
+        in_use = size - self.pool.get_idle_size()
+        metrics.set_gauge("db_pool.size", size)
+        metrics.set_gauge("db_pool.in_use", in_use)
+        metrics.set_gauge("db_pool.waiting", self.waiting)
+        metrics.set_gauge("db_pool.saturation", in_use / self.max_size)
+
+    @asynccontextmanager
+    async def acquire(self):
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            conn = await self.pool.acquire(timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            metrics.increment("db_pool.acquire_timeout")
+            logger.warning(
+                f"Database pool acquire timed out | timeout: {self.acquire_timeout} | max_size: {self.max_size}"
+            )
+            raise
+        finally:
+            self.waiting -= 1
+        metrics.observe("db_pool.acquire_wait_seconds", time.monotonic() - started)
+        self._report()
+        try:
+            yield conn
+        finally:
+            await self.pool.release(conn)
+            self._report()
+
+
+async def _create_pool() -> InstrumentedPool:
+    min_size = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+    max_size = int(os.getenv("DB_POOL_MAX_SIZE", "5"))
+    pool = await asyncpg.create_pool(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=int(os.getenv("DB_PORT", "5432")),
+        database=os.getenv("DB_NAME", "postgres"),
+        user=os.getenv("DB_USER", "root"),
+        password=os.getenv("DB_PASSWORD", "root"),
+        min_size=min_size,
+        max_size=max_size,
+        command_timeout=float(os.getenv("DB_COMMAND_TIMEOUT", "60")),
+        statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100")),
+        max_inactive_connection_lifetime=float(
+            os.getenv("DB_MAX_INACTIVE_CONNECTION_LIFETIME", "300")
+        ),
+    )
+    logger.info(f"Database pool sizing | min_size: {min_size} | max_size: {max_size}")
+    return InstrumentedPool(
+        pool, max_size, float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", "10"))
+    )
 
 
 async def get_db_pool():
     global _db_pool
-    if _db_pool is None:
+    if _db_pool is not None:
+        return _db_pool
+
+    async with _pool_lock:
+        if _db_pool is not None:
+            return _db_pool
+
         logger.info("Creating new database connection pool")
         max_retries = 3
         retry_delay = 2
 
         for attempt in range(max_retries):
             try:
-                _db_pool = await asyncpg.create_pool(
-                    host=os.getenv("DB_HOST", "localhost"),
-                    port=int(os.getenv("DB_PORT", "5432")),
-                    database=os.getenv("DB_NAME", "postgres"),
-                    user=os.getenv("DB_USER", "root"),
-                    password=os.getenv("DB_PASSWORD", "root"),
-                    min_size=1,
-                    max_size=5,
-                    command_timeout=60,
-                )
+                _db_pool = await _create_pool()
                 logger.info(
                     f"Database pool created successfully | attempt: {attempt + 1}"
                 )
@@ -41,7 +107,13 @@ async def get_db_pool():
                     f"Database connection attempt {attempt + 1} failed: {e}"
                 )
                 await asyncio.sleep(retry_delay * (attempt + 1))
-    else:
-        logger.debug("Using existing database pool")
 
     return _db_pool
+
+
+async def close_db_pool():
+    global _db_pool
+    if _db_pool is not None:
+        await _db_pool.close()
+        _db_pool = None
+        logger.info("Database pool closed")
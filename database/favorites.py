@@ -1,19 +1,61 @@
+import os
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
 from database.database import get_db_pool
 from loguru import logger
 
+FOLLOWED_ANIME_PAGE_SIZE = int(os.getenv("FOLLOWED_ANIME_PAGE_SIZE", "50"))
+FOLLOWERS_PAGE_SIZE = int(os.getenv("FOLLOWERS_PAGE_SIZE", "1000"))
+
 
-async def add_favorite_anime_user(anime_id: int, user_id: int):
+async def add_favorite_with_anime(anime_data: dict, user_id: int) -> Tuple[int, bool]:
     pool = await get_db_pool()
     async with pool.acquire() as conn:
-        await conn.execute(
+        row = await conn.fetchrow(
             """
-            INSERT INTO favorites (user_id, anime_id)
-            VALUES ($1, $2) ON CONFLICT (user_id, anime_id) DO NOTHING
+            WITH existing AS (
+                (SELECT id FROM anime WHERE id_shikimori = $4)
+                UNION ALL
+                (SELECT id FROM anime WHERE id_anilist = $3)
+                LIMIT 1
+            ),
+            inserted_anime AS (
+                INSERT INTO anime (title_original, title_ru, id_anilist, id_shikimori, total_episodes_relase)
+                SELECT $1, $2, $3, $4, $5
+                WHERE NOT EXISTS (SELECT 1 FROM existing)
+                ON CONFLICT (id_shikimori) DO UPDATE SET
+                    title_original = EXCLUDED.title_original,
+                    title_ru = EXCLUDED.title_ru,
+                    id_anilist = EXCLUDED.id_anilist,
+                    total_episodes_relase = EXCLUDED.total_episodes_relase
+                RETURNING id
+            ),
+            target AS (
+                SELECT id FROM existing
+                UNION ALL
+                SELECT id FROM inserted_anime
+            ),
+            inserted_favorite AS (
+                INSERT INTO favorites (user_id, anime_id)
+                SELECT $6, id FROM target
+                ON CONFLICT (user_id, anime_id) DO NOTHING
+                RETURNING anime_id
+            )
+            SELECT t.id AS anime_id,
+                   EXISTS (SELECT 1 FROM inserted_favorite) AS added
+            FROM target t
             """,
+            anime_data["title_original"],
+            anime_data["title_ru"],
+            anime_data["id_anilist"],
+            anime_data["id_shikimori"],
+            anime_data["total_episodes_relase"],
             user_id,
-            anime_id,
         )
-    logger.info(f"The anime {anime_id} was saved to favorites list for user {user_id}")
+    logger.info(
+        f"Add favorite anime_id={row['anime_id']} for user {user_id} | added: {row['added']}"
+    )
+    return row["anime_id"], row["added"]
 
 
 async def get_favorite_anime_user(user_id: int):
@@ -54,46 +96,75 @@ async def clear_favorites_user(user_id: int):
     logger.info(f"Cleared all favorites for user {user_id}")
 
 
-async def is_favorite_anime_user(anime_id: int, user_id: int):
+async def iter_followed_anime(
+    anilist_ids: Optional[List[int]] = None,
+    page_size: int = FOLLOWED_ANIME_PAGE_SIZE,
+) -> AsyncIterator[List[Dict]]:
     pool = await get_db_pool()
-    async with pool.acquire() as conn:
-        existing = await conn.fetchrow(
-            "SELECT 1 FROM favorites WHERE anime_id = $1 AND user_id = $2",
-            anime_id,
-            user_id,
-        )
-    return existing is not None
+    last_anime_id = None
+    while True:
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT a.id,
+                       a.id_anilist,
+                       a.id_shikimori,
+                       a.title_original,
+                       a.title_ru,
+                       a.total_episodes_relase
+                FROM anime a
+                WHERE EXISTS (SELECT 1 FROM favorites f WHERE f.anime_id = a.id)
+                  AND ($1::bigint[] IS NULL OR a.id_anilist = ANY($1::bigint[]))
+                  AND ($2::bigint IS NULL OR a.id > $2::bigint)
+                ORDER BY a.id
+                LIMIT $3
+                """,
+                anilist_ids,
+                last_anime_id,
+                page_size,
+            )
+        if not rows:
+            return
+        yield [
+            {
+                "id": row["id"],
+                "id_anilist": row["id_anilist"],
+                "id_shikimori": row["id_shikimori"],
+                "title_original": row["title_original"],
+                "title_ru": row["title_ru"],
+                "current_episodes": row["total_episodes_relase"],
+            }
+            for row in rows
+        ]
+        if len(rows) < page_size:
+            return
+        last_anime_id = rows[-1]["id"]
 
 
-async def get_anime_with_users():
+async def iter_anime_followers(
+    anime_id: int, page_size: int = FOLLOWERS_PAGE_SIZE
+) -> AsyncIterator[List[Tuple[int, str]]]:
     pool = await get_db_pool()
-    async with pool.acquire() as conn:
-        rows = await conn.fetch("""
-                                SELECT a.id,
-                                       a.id_anilist,
-                                       a.id_shikimori,
-                                       a.title_original,
-                                       a.title_ru,
-                                       a.total_episodes_relase,
-                                       array_agg(f.user_id)       as user_ids,
-                                       array_agg(COALESCE(u.user_language, 'ru')) as user_languages
-                                FROM anime a
-                                         JOIN favorites f ON a.id = f.anime_id
-                                         LEFT JOIN users u ON f.user_id = u.telegram_user_id
-                                GROUP BY a.id, a.id_anilist, a.id_shikimori, a.title_original, a.title_ru,
-                                         a.total_episodes_relase
-                                """)
-    logger.info(f"Retrieved {len(rows)} anime with associated users")
-
-    return {
-        row["id"]: {
-            "id_anilist": row["id_anilist"],
-            "id_shikimori": row["id_shikimori"],
-            "title_original": row["title_original"],
-            "title_ru": row["title_ru"],
-            "current_episodes": row["total_episodes_relase"],
-            "user_ids": row["user_ids"],
-            "user_languages": row["user_languages"],
-        }
-        for row in rows
-    }
+    last_user_id = None
+    while True:
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT f.user_id, COALESCE(u.user_language, 'ru') AS user_language
+                FROM favorites f
+                         LEFT JOIN users u ON f.user_id = u.telegram_user_id
+                WHERE f.anime_id = $1
+                  AND ($2::bigint IS NULL OR f.user_id > $2::bigint)
+                ORDER BY f.user_id
+                LIMIT $3
+                """,
+                anime_id,
+                last_user_id,
+                page_size,
+            )
+        if not rows:
+            return
+        yield [(row["user_id"], row["user_language"]) for row in rows]
+        if len(rows) < page_size:
+            return
+        last_user_id = rows[-1]["user_id"]
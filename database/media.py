@@ -0,0 +1,48 @@
+from typing import List, Optional
+
+from database.database import get_db_pool
+
+
+async def get_media_file_id(cover_url: str) -> Optional[str]:
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        return await conn.fetchval(
+            "SELECT file_id FROM telegram_media WHERE cover_url = $1", cover_url
+        )
+
+
+async def save_media_file_id(cover_url: str, file_id: str):
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(
+            """
+            INSERT INTO telegram_media (cover_url, file_id)
+            VALUES ($1, $2)
+            ON CONFLICT (cover_url) DO UPDATE SET
+                file_id = EXCLUDED.file_id,
+                updated_at = now()
+            """,
+            cover_url,
+            file_id,
+        )
+
+
+async def delete_media_file_id(cover_url: str):
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        await conn.execute("DELETE FROM telegram_media WHERE cover_url = $1", cover_url)
+
+
+async def get_recent_media_file_ids(limit: int) -> List[dict]:
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT cover_url, file_id
+            FROM telegram_media
+            ORDER BY updated_at DESC
+            LIMIT $1
+            """,
+            limit,
+        )
+    return [dict(row) for row in rows]
@@ -12,7 +12,13 @@ from markup.keyboards import (
     get_main_menu_keyboard,
 )
 from database.favorites import *
-from services.favorite_service import formating_data_to_db
+from common.caption_updates import set_caption_update_markup
+from middleware.user_context import UserContext
+from services.favorite_service import (
+    favorite_entry,
+    formating_data_to_db,
+    get_user_favorites,
+)
 from utils.i18n import i18n
 
 favorite_router = Router()
@@ -27,17 +33,7 @@ async def show_favorites(message: types.Message, lang: str = None):
     )
 
     try:
-        cached_favorites = await favorite_cache.get_cached_user_favorites(user_id)
-        if cached_favorites:
-            favorites_list = cached_favorites
-        else:
-            favorites_raw = await get_favorite_anime_user(user_id)
-            favorites_list = [dict(row) for row in favorites_raw]
-            if favorites_list:
-                await favorite_cache.cache_user_favorites(user_id, favorites_list)
-                logger.debug(
-                    f"Cached new favorites | user_id: {user_id} | count: {len(favorites_list)}"
-                )
+        favorites_list = await get_user_favorites(user_id)
 
         if not favorites_list:
             await message.answer(i18n.t("favorites.empty", lang=lang))
@@ -59,14 +55,7 @@ async def show_favorites(message: types.Message, lang: str = None):
 @favorite_router.callback_query(lambda c: c.data.startswith("show_favorites"))
 async def show_favorites(callback: types.CallbackQuery, lang: str = None):
     user_id = callback.from_user.id
-    cached_favorites = await favorite_cache.get_cached_user_favorites(user_id)
-    if cached_favorites:
-        favorite_anime = cached_favorites
-    else:
-        favorite_anime_raw = await get_favorite_anime_user(user_id)
-        favorite_anime = [dict(row) for row in favorite_anime_raw]
-        if favorite_anime:
-            await favorite_cache.cache_user_favorites(user_id, favorite_anime)
+    favorite_anime = await get_user_favorites(user_id)
 
     if not favorite_anime:
         text = i18n.t("favorites.empty", lang=lang)
@@ -99,7 +88,9 @@ async def show_favorites(callback: types.CallbackQuery, lang: str = None):
 
 
 @favorite_router.callback_query(lambda c: c.data.startswith("add_favorite:"))
-async def add_favorite(callback: types.CallbackQuery, lang: str = None):
+async def add_favorite(
+    callback: types.CallbackQuery, lang: str = None, user_context: UserContext = None
+):
     user_id = callback.from_user.id
     username = callback.from_user.username or "no_username"
     callback_data = callback.data.split(":")
@@ -110,7 +101,13 @@ async def add_favorite(callback: types.CallbackQuery, lang: str = None):
     try:
         shikimori_id = int(callback_data[1])
 
-        cached_anime = await anime_cache.get_cached_anime(shikimori_id, lang)
+        if user_context is not None and user_context.favorite_anime_id(shikimori_id):
+            await callback.answer(
+                i18n.t("favorites.error_added", lang=lang), show_alert=True
+            )
+            return
+
+        cached_anime = await anime_cache.get_cached_anime(shikimori_id)
         if not cached_anime:
             await callback.answer(
                 i18n.t("favorites.not_found", lang=lang), show_alert=True
@@ -118,30 +115,24 @@ async def add_favorite(callback: types.CallbackQuery, lang: str = None):
             return
 
         anilist_id = cached_anime.get("anilist_id", 0)
+        data = await formating_data_to_db(shikimori_id, anilist_id)
+        if not data:
+            await callback.answer(i18n.t("favorites.error", lang=lang), show_alert=True)
+            return
+        logger.debug(f"{data}")
 
-        anime_id = await existing_anime(shikimori_id, anilist_id)
-
-        if not anime_id:
-            data = await formating_data_to_db(shikimori_id, anilist_id, lang=lang)
-            if not data:
-                await callback.answer(
-                    i18n.t("favorites.error", lang=lang), show_alert=True
-                )
-                return
-            logger.debug(f"{data}")
-            anime_id = await upsert_anime(data)
-        is_already_favorite = await is_favorite_anime_user(anime_id, user_id)
-        if is_already_favorite:
+        anime_id, added = await add_favorite_with_anime(data, user_id)
+        await favorite_cache.add_user_favorite(user_id, favorite_entry(anime_id, data))
+        if not added:
             await callback.answer(
                 i18n.t("favorites.error_added", lang=lang), show_alert=True
             )
             return
-        await add_favorite_anime_user(anime_id, user_id)
-        await favorite_cache.invalidate_user_favorites(user_id)
 
         keyboard = get_anime_menu_keyboard(
             shikimori_id, is_favorite=True, lang=lang, anime_id=anime_id
         )
+        set_caption_update_markup(callback.message, keyboard)
         await callback.message.edit_reply_markup(reply_markup=keyboard)
         await callback.answer(i18n.t("favorites.added", lang=lang))
         logger.info(
@@ -174,7 +165,7 @@ async def remove_favorite_from_list(callback: types.CallbackQuery, lang: str = N
             shikimori_id = None
 
         await del_favorite_anime_user(anime_id, user_id)
-        await favorite_cache.invalidate_user_favorites(user_id)
+        await favorite_cache.remove_user_favorite(user_id, anime_id)
 
         if callback.message.photo:
             if shikimori_id is None:
@@ -182,6 +173,7 @@ async def remove_favorite_from_list(callback: types.CallbackQuery, lang: str = N
             keyboard = get_anime_menu_keyboard(
                 shikimori_id, is_favorite=False, lang=lang, anime_id=anime_id
             )
+            set_caption_update_markup(callback.message, keyboard)
             await callback.message.edit_reply_markup(reply_markup=keyboard)
             await callback.answer(i18n.t("favorites.removed", lang=lang))
             logger.info(
@@ -189,8 +181,7 @@ async def remove_favorite_from_list(callback: types.CallbackQuery, lang: str = N
             )
             return
 
-        favorites_raw = await get_favorite_anime_user(user_id)
-        favorites_list = [dict(row) for row in favorites_raw]
+        favorites_list = await get_user_favorites(user_id)
 
         if not favorites_list:
             await callback.message.edit_text(
@@ -225,7 +216,7 @@ async def clear_favorites(callback: types.CallbackQuery, lang: str = None):
     )
     try:
         await clear_favorites_user(user_id)
-        await favorite_cache.invalidate_user_favorites(user_id)
+        await favorite_cache.cache_user_favorites(user_id, [])
 
         await callback.message.edit_text(
             i18n.t("favorites.cleared_success", lang=lang),
@@ -245,13 +236,7 @@ async def favorites_page_callback(callback: types.CallbackQuery, lang: str = Non
     user_id = callback.from_user.id
     page = int(callback.data.split(":")[1])
 
-    cached_favorites = await favorite_cache.get_cached_user_favorites(user_id)
-    if cached_favorites:
-        favorites_list = cached_favorites
-    else:
-        favorites_raw = await get_favorite_anime_user(user_id)
-        favorites_list = [dict(row) for row in favorites_raw]
-        await favorite_cache.cache_user_favorites(user_id, favorites_list)
+    favorites_list = await get_user_favorites(user_id)
 
     if not favorites_list:
         await callback.message.edit_text(i18n.t("favorites.empty", lang=lang))
@@ -1,16 +1,22 @@
 from aiogram import types, Router, F
-from aiogram.types import InputMediaPhoto
 from loguru import logger
 
+from api.rate_limiter import RequestShed
 from api.shikimori import get_many_info_about_anime_from_shikimori
 from cache.search_cache import search_cache
-from database.anime import existing_anime
 from markup.keyboards import get_anime_selection_keyboard, get_anime_menu_keyboard
-from services.anime_service import filter_top_anime, get_caption_and_cover_image
-from database.favorites import is_favorite_anime_user
+from common.caption_updates import cancel_caption_update, schedule_caption_update
+from common.cover_media import edit_cover_media
+from services.anime_service import (
+    filter_top_anime,
+    get_caption_and_cover_image,
+)
+from services.favorite_service import get_user_favorites
+from services.prefetch_service import anime_prefetcher
+from middleware.user_context import UserContext
 
 from utils.i18n import i18n
-from utils.utils import log_api_response
+from utils.api_capture import api_capture
 
 search_router = Router()
 
@@ -25,11 +31,11 @@ async def handle_anime_search(message: types.Message, lang: str):
         f"Handler 'handle_anime_search' started | user_id: {user_id} | username: @{username} | query: '{anime_name}'"
     )
 
+    anime_prefetcher.cancel(user_id)
+
     try:
         wait_msg = await message.answer(i18n.t("search.loading", lang=lang))
-        cached_search = await search_cache.get_cached_search_results(
-            user_id, anime_name
-        )
+        cached_search = await search_cache.get_cached_search_results(anime_name)
 
         if cached_search:
             filtered_anime = cached_search["results"]
@@ -38,31 +44,43 @@ async def handle_anime_search(message: types.Message, lang: str):
             )
         else:
             multiple_results = await get_many_info_about_anime_from_shikimori(
-                anime_name
+                anime_name, user_id=user_id
             )
+            if not isinstance(multiple_results, list):
+                logger.warning(
+                    f"Shikimori search failed, result not cached | user_id: {user_id} | query: '{anime_name}'"
+                )
+                await wait_msg.delete()
+                await message.answer(i18n.t("search.no_results", lang=lang))
+                return
             filtered_anime = filter_top_anime(
                 multiple_results, query=anime_name, top_n=5
             )
-            await search_cache.cache_search_results(user_id, anime_name, filtered_anime)
             logger.info(
                 f"New search performed | user_id: {user_id} | query: '{anime_name}' | results_count: {len(filtered_anime)}"
             )
 
-        log_api_response("filtered_anime", filtered_anime)
+        api_capture.capture("filtered_anime", filtered_anime)
 
         if filtered_anime:
-            await search_cache.save_user_last_search(
-                user_id, anime_name, filtered_anime
-            )
+            if cached_search:
+                await search_cache.save_user_last_search(user_id, anime_name)
+            else:
+                await search_cache.save_search_results(
+                    user_id, anime_name, filtered_anime
+                )
             keyboard = get_anime_selection_keyboard(filtered_anime, lang=lang)
             await wait_msg.edit_text(
                 i18n.t("search.result_select", lang=lang, query=anime_name),
                 reply_markup=keyboard,
             )
+            anime_prefetcher.schedule(user_id, filtered_anime, lang)
             logger.info(
                 f"Handler 'handle_anime_search' completed | user_id: {user_id} | results_shown: {len(filtered_anime)}"
             )
         else:
+            if not cached_search:
+                await search_cache.cache_search_results(anime_name, filtered_anime)
             await wait_msg.delete()
             await message.answer(
                 i18n.t("search.not_found", lang=lang, query=anime_name)
@@ -71,6 +89,11 @@ async def handle_anime_search(message: types.Message, lang: str):
                 f"Handler 'handle_anime_search' completed | user_id: {user_id} | no_results_found"
             )
 
+    except RequestShed as e:
+        logger.info(
+            f"Handler 'handle_anime_search' dropped | user_id: {user_id} | query: '{anime_name}' | reason: {e}"
+        )
+        await wait_msg.delete()
     except Exception as e:
         logger.error(
             f"Handler 'handle_anime_search' failed | user_id: {user_id} | query: '{anime_name}' | error: {e}"
@@ -79,7 +102,9 @@ async def handle_anime_search(message: types.Message, lang: str):
 
 
 @search_router.callback_query(lambda c: c.data.startswith("view_anime:"))
-async def handle_anime_view(callback: types.CallbackQuery, lang: str):
+async def handle_anime_view(
+    callback: types.CallbackQuery, lang: str, user_context: UserContext = None
+):
     user_id = callback.from_user.id
     username = callback.from_user.username or "no_username"
     callback_data = callback.data
@@ -88,6 +113,8 @@ async def handle_anime_view(callback: types.CallbackQuery, lang: str):
         f"Handler 'handle_anime_view' started | user_id: {user_id} | username: @{username} | data: {callback_data}"
     )
 
+    cancel_caption_update(callback.message)
+
     try:
         data_parts = callback.data.split(":")
         from_favorites = len(data_parts) >= 3 and data_parts[1] == "from_favorites"
@@ -98,25 +125,34 @@ async def handle_anime_view(callback: types.CallbackQuery, lang: str):
             cover_image,
             anilist_id,
             raw_data_db,
+            pending_translation,
         ) = await get_caption_and_cover_image(shikimori_id, lang=lang)
-        anime_id = await existing_anime(shikimori_id, anilist_id or 0)
-
-        is_favorite = False
-        if anime_id is not None:
-            is_favorite = await is_favorite_anime_user(anime_id, user_id)
-
-        await callback.message.edit_media(
-            media=InputMediaPhoto(
-                media=cover_image, caption=caption, parse_mode="HTML"
-            ),
-            reply_markup=get_anime_menu_keyboard(
-                shikimori_id,
-                is_favorite=is_favorite,
-                lang=lang,
-                anime_id=anime_id,
-                from_favorites=from_favorites,
-            ),
+
+        if user_context is not None and user_context.favorites_loaded:
+            anime_id = user_context.favorite_anime_id(shikimori_id)
+        else:
+            favorites = await get_user_favorites(user_id)
+            anime_id = next(
+                (
+                    row["anime_id"]
+                    for row in favorites
+                    if row["id_shikimori"] == shikimori_id
+                ),
+                None,
+            )
+        is_favorite = anime_id is not None
+
+        keyboard = get_anime_menu_keyboard(
+            shikimori_id,
+            is_favorite=is_favorite,
+            lang=lang,
+            anime_id=anime_id,
+            from_favorites=from_favorites,
         )
+        await edit_cover_media(callback.message, cover_image, caption, keyboard)
+
+        if pending_translation:
+            schedule_caption_update(callback.message, pending_translation, keyboard)
 
         await callback.answer()
         logger.info(
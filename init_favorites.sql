@@ -34,3 +34,14 @@ CREATE TABLE IF NOT EXISTS favorites (
     anime_id INTEGER NOT NULL REFERENCES anime(id) ON DELETE CASCADE,
     PRIMARY KEY (user_id, anime_id)
 );
+
+CREATE INDEX IF NOT EXISTS idx_favorites_anime_user ON favorites (anime_id, user_id);
+
+
+CREATE TABLE IF NOT EXISTS telegram_media (
+    cover_url TEXT PRIMARY KEY,
+    file_id TEXT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_telegram_media_updated_at ON telegram_media (updated_at DESC);
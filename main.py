@@ -8,9 +8,14 @@ from loguru import logger
 from scheduler import start_scheduler
 from common.commands_bot import commands_ru, commands_en
 from cache.redis_client import redis_client
+from cache.two_tier_cache import cache_invalidator
+from cache.media_cache import media_cache
+from api.http_client import http_client
+from database.database import close_db_pool, get_db_pool
+from utils.api_capture import api_capture
 
 from middleware.antiflood import AntiFloodMiddleware
-from middleware.language import LanguageMiddleware
+from middleware.user_context import UserContextMiddleware
 
 from handlers.search import search_router
 from handlers.favorites import favorite_router
@@ -23,8 +28,8 @@ bot = Bot(token=os.getenv("TOKEN"))
 
 dp = Dispatcher()
 
-dp.message.middleware(LanguageMiddleware())
-dp.callback_query.middleware(LanguageMiddleware())
+dp.message.middleware(UserContextMiddleware())
+dp.callback_query.middleware(UserContextMiddleware())
 
 dp.message.middleware(AntiFloodMiddleware())
 dp.callback_query.middleware(AntiFloodMiddleware())
@@ -40,6 +45,16 @@ async def main():
         await redis_client.connect()
         logger.info("Redis connection established")
 
+        await cache_invalidator.start()
+
+        await get_db_pool()
+        logger.info("Database pool created")
+
+        await http_client.connect()
+        logger.info("HTTP client pools created")
+
+        await media_cache.warm_up()
+
         await bot.set_my_commands(
             commands_ru, scope=types.BotCommandScopeDefault(), language_code="ru"
         )
@@ -62,8 +77,12 @@ async def main():
         raise
     finally:
         logger.info("Bot shutdown initiated")
+        await api_capture.stop()
+        await cache_invalidator.stop()
+        await http_client.disconnect()
+        await close_db_pool()
         await redis_client.disconnect()
-        logger.info("Redis connection closed, bot stopped")
+        logger.info("HTTP, database and Redis connections closed, bot stopped")
 
 
 if __name__ == "__main__":
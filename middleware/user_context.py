@@ -0,0 +1,103 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from loguru import logger
+
+from cache.favorite_cache import favorite_cache
+from cache.redis_client import redis_client
+from cache.two_tier_cache import LocalCache
+from cache.user_cache import user_cache
+from database.users import get_user_language_from_db
+
+
+class UserContext:
+    def __init__(
+        self,
+        user_id: int,
+        lang: str,
+        favorite_ids: Optional[Dict[int, int]] = None,
+        throttled: bool = False,
+    ):
+        self.user_id = user_id
+        self.lang = lang
+        self.favorite_ids = favorite_ids
+        self.throttled = throttled
+
+    @property
+    def favorites_loaded(self) -> bool:
+        return self.favorite_ids is not None
+
+    def favorite_anime_id(self, shikimori_id: int) -> Optional[int]:
+        return (self.favorite_ids or {}).get(shikimori_id)
+
+
+class UserContextMiddleware(BaseMiddleware):
+    def __init__(self, rate_limit: float = 0.5):
+        self.rate_limit_ms = int(rate_limit * 1000)
+        self.local_throttle = LocalCache(max_size=10000, ttl=rate_limit)
+
+    def _get_throttle_key(self, user_id: int) -> str:
+        return f"antiflood:{user_id}"
+
+    def _throttle_locally(self, user_id: int) -> bool:
+        if self.local_throttle.get(str(user_id)) is True:
+            return True
+        self.local_throttle.set(str(user_id), True)
+        return False
+
+    async def _language_from_db(self, user_id: int) -> str:
+        try:
+            return await get_user_language_from_db(user_id) or "en"
+        except Exception as e:
+            logger.error(
+                f"Failed to get user language | user_id: {user_id} | error: {e}"
+            )
+            return "en"
+
+    async def load(self, user_id: int) -> UserContext:
+        lang = await user_cache.get_user_language(user_id)
+        async with redis_client.pipeline() as pipe:
+            pipe.hgetall(favorite_cache._get_user_favorite_ids_key(user_id))
+            pipe.set(self._get_throttle_key(user_id), 1, nx=True, px=self.rate_limit_ms)
+            favorite_ids, allowed = await pipe.execute()
+
+        if not lang:
+            lang = await get_user_language_from_db(user_id)
+            if lang:
+                await user_cache.user_language(user_id, lang)
+
+        return UserContext(
+            user_id,
+            lang or "en",
+            favorite_ids=favorite_cache.favorite_ids_from_hash(
+                redis_client.decode_hash(favorite_ids)
+            ),
+            throttled=not allowed,
+        )
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = getattr(event, "from_user", None)
+        if user is None:
+            return await handler(event, data)
+
+        try:
+            context = await self.load(user.id)
+        except Exception as e:
+            logger.error(
+                f"User context middleware failed | user_id: {user.id} | error: {e}"
+            )
+            context = UserContext(
+                user.id,
+                await self._language_from_db(user.id),
+                throttled=self._throttle_locally(user.id),
+            )
+
+        data["user_context"] = context
+        data["lang"] = context.lang
+        return await handler(event, data)
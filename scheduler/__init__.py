@@ -1,12 +1,31 @@
+import os
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from aiogram import Bot
-from scheduler.episode_checker import check_new_episodes
+from loguru import logger
+from scheduler.episode_checker import (
+    check_new_episodes,
+    check_new_episodes_from_airing_feed,
+)
+from utils.metrics import metrics
+
+CHECKER_MODES = {
+    "per_title": check_new_episodes,
+    "airing_feed": check_new_episodes_from_airing_feed,
+}
 
 
 def start_scheduler(bot: Bot):
+    mode = os.getenv("EPISODE_CHECKER_MODE", "airing_feed")
+    checker = CHECKER_MODES.get(mode)
+    if checker is None:
+        logger.warning(
+            f"Unknown EPISODE_CHECKER_MODE '{mode}', falling back to per_title | modes: {', '.join(CHECKER_MODES)}"
+        )
+        checker = check_new_episodes
     scheduler = AsyncIOScheduler()
     scheduler.add_job(
-        check_new_episodes,
+        checker,
         trigger="cron",
         hour=6,
         minute=0,
@@ -15,7 +34,7 @@ def start_scheduler(bot: Bot):
     )
 
     scheduler.add_job(
-        check_new_episodes,
+        checker,
         trigger="cron",
         hour=18,
         minute=0,
@@ -23,6 +42,15 @@ def start_scheduler(bot: Bot):
         max_instances=10,
     )
 
+    metrics_interval = int(os.getenv("METRICS_LOG_INTERVAL", "60"))
+    if metrics_interval > 0:
+        scheduler.add_job(
+            metrics.log_snapshot,
+            trigger="interval",
+            seconds=metrics_interval,
+            max_instances=1,
+        )
+
     scheduler.start()
 
 
@@ -1,6 +1,5 @@
 import asyncio
 import time
-import random
 import logging
 
 from typing import List, Dict
@@ -9,11 +8,21 @@ from aiogram import Bot
 from database.anime import update_anime_episodes
 from utils.i18n import i18n
 
-from api.anilist import get_info_about_anime_from_anilist_by_id
-from database.favorites import get_anime_with_users
+from api.anilist import (
+    ANILIST_PAGE_SIZE,
+    get_airing_schedules,
+    get_many_info_about_anime_from_anilist_by_ids,
+)
+from cache.anime_cache import anime_cache
+from cache.redis_client import redis_client
+from database.favorites import iter_anime_followers, iter_followed_anime
 
 logger = logging.getLogger("episode_checker")
 
+LAST_RUN_KEY = "episode_checker:last_run"
+LAST_RUN_TTL = 7 * 24 * 3600
+AIRING_FEED_OVERLAP_SECONDS = 3600
+
 
 async def _send_notification_safe(bot: Bot, user_id: int, message: str) -> None:
     try:
@@ -97,65 +106,132 @@ async def _check_anime_for_updates_cached(
 
         await update_anime_episodes(anime_id, current_available)
         updated_episodes[anime_id] = current_available
+        await anime_cache.invalidate_anime([anime_data["id_shikimori"]])
         logger.info(f"Updated anime {anime_id} episodes to {current_available}")
 
-        await _notify_users_about_specific_episodes(
-            bot,
-            anime_data["user_ids"],
-            anime_data["user_languages"],
-            {"ru": anime_data["title_ru"], "original": anime_data["title_original"]},
-            new_episodes,
-        )
+        anime_titles = {
+            "ru": anime_data["title_ru"],
+            "original": anime_data["title_original"],
+        }
+        async for followers in iter_anime_followers(anime_id):
+            await _notify_users_about_specific_episodes(
+                bot,
+                [user_id for user_id, _ in followers],
+                [lang for _, lang in followers],
+                anime_titles,
+                new_episodes,
+            )
     else:
         logger.info(f"No new episodes for anime {anime_id}")
 
 
+async def _check_anime_batch(
+    bot: Bot, batch: List[Dict], batch_number: int, updated_episodes: Dict
+) -> None:
+    logger.info(f"Processing batch {batch_number} with {len(batch)} anime")
+
+    try:
+        media_by_id = await get_many_info_about_anime_from_anilist_by_ids(
+            [anime_data["id_anilist"] for anime_data in batch]
+        )
+    except Exception as e:
+        logger.error(f"Error fetching AniList batch: {e}")
+        return
+
+    tasks = []
+    for anime_data in batch:
+        media = media_by_id.get(anime_data["id_anilist"])
+        if media:
+            tasks.append(
+                _check_anime_for_updates_cached(
+                    bot, anime_data["id"], anime_data, media, updated_episodes
+                )
+            )
+        else:
+            logger.warning(f"No valid data for anime {anime_data['id']}")
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 async def check_new_episodes(bot: Bot) -> None:
     logger.info("Starting check_new_episodes scheduler job")
 
-    anime_list = await get_anime_with_users()
-    if not anime_list:
+    updated_episodes = {}
+    batch_number = 0
+    checked = 0
+
+    async for page in iter_followed_anime(page_size=ANILIST_PAGE_SIZE):
+        batch = []
+        for anime_data in page:
+            if not anime_data["id_anilist"]:
+                logger.warning(f"Anime {anime_data['id']} has no AniList id, skipping")
+                continue
+            batch.append(anime_data)
+        if not batch:
+            continue
+        batch_number += 1
+        checked += len(batch)
+        await _check_anime_batch(bot, batch, batch_number, updated_episodes)
+
+    if not checked:
         logger.warning("No anime with users found for episode check")
         return
 
-    batch_size = 3
-    anime_items = list(anime_list.items())
+    logger.info("Completed check_new_episodes scheduler job")
 
-    updated_episodes = {}
 
-    for i in range(0, len(anime_items), batch_size):
-        batch = anime_items[i : i + batch_size]
-        logger.info(f"Processing batch {i // batch_size + 1}: {batch}")
+async def check_new_episodes_from_airing_feed(bot: Bot) -> None:
+    logger.info("Starting check_new_episodes_from_airing_feed scheduler job")
 
-        fetch_tasks = [
-            get_info_about_anime_from_anilist_by_id(anime_data["id_anilist"])
-            if anime_data["id_anilist"]
-            else None
-            for _, anime_data in batch
-        ]
+    run_started_at = int(time.time())
+    last_run = await redis_client.get(LAST_RUN_KEY)
 
-        anilist_results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
+    if not last_run:
+        logger.info("No previous airing feed run recorded, running full check")
+        await check_new_episodes(bot)
+        await redis_client.set(LAST_RUN_KEY, run_started_at, expire=LAST_RUN_TTL)
+        return
 
-        tasks = []
-        for (anime_id, anime_data), result in zip(batch, anilist_results):
-            if isinstance(result, Exception):
-                logger.error(f"Error fetching info for anime {anime_id}: {result}")
-                continue
-            if isinstance(result, dict) and "data" in result:
-                media = result["data"]["Media"]
+    try:
+        schedules, truncated = await get_airing_schedules(
+            int(last_run) - AIRING_FEED_OVERLAP_SECONDS, run_started_at + 1
+        )
+    except Exception as e:
+        logger.error(f"Failed to fetch AniList airing feed: {e}")
+        return
+
+    if truncated:
+        logger.warning("AniList airing feed was truncated, running full check")
+        await check_new_episodes(bot)
+        await redis_client.set(LAST_RUN_KEY, run_started_at, expire=LAST_RUN_TTL)
+        return
+
+    aired_by_anilist_id: Dict[int, List[Dict]] = {}
+    for schedule in schedules:
+        aired_by_anilist_id.setdefault(schedule["mediaId"], []).append(
+            {"episode": schedule["episode"], "airingAt": schedule["airingAt"]}
+        )
+
+    if aired_by_anilist_id:
+        updated_episodes = {}
+        matched = 0
+        async for page in iter_followed_anime(
+            list(aired_by_anilist_id), page_size=ANILIST_PAGE_SIZE
+        ):
+            matched += len(page)
+            tasks = []
+            for anime_data in page:
+                nodes = aired_by_anilist_id[anime_data["id_anilist"]]
+                media = {"airingSchedule": {"nodes": nodes}}
                 tasks.append(
                     _check_anime_for_updates_cached(
-                        bot, anime_id, anime_data, media, updated_episodes
+                        bot, anime_data["id"], anime_data, media, updated_episodes
                     )
                 )
-            else:
-                logger.warning(f"No valid data for anime {anime_id}")
-
-        await asyncio.gather(*tasks, return_exceptions=True)
-
-        if i + batch_size < len(anime_items):
-            sleep_time = random.uniform(5, 60)
-            logger.info(f"Sleeping for {sleep_time:.2f} seconds before next batch")
-            await asyncio.sleep(sleep_time)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(
+            f"Airing feed matched {matched} followed anime out of {len(aired_by_anilist_id)} aired"
+        )
 
-    logger.info("Completed check_new_episodes scheduler job")
+    await redis_client.set(LAST_RUN_KEY, run_started_at, expire=LAST_RUN_TTL)
+    logger.info("Completed check_new_episodes_from_airing_feed scheduler job")
@@ -1,12 +1,26 @@
+import asyncio
 import re
+import time
+from typing import Dict, Optional, Tuple
 
 from loguru import logger
 
 from api.anilist import get_info_about_anime_from_anilist_by_mal_id
+from api.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, Priority
 from api.shikimori import get_info_about_anime_from_shikimori_by_id
-from common.anime_caption_formater import format_anime_caption
+from api.single_flight import SingleFlight
+from api.translate import cached_translation
+from common.anime_caption_formater import (
+    anime_db_data,
+    description_to_translate,
+    format_anime_caption,
+)
 from common.anime_info_formatter import AnimeInfo
 from cache.anime_cache import anime_cache
+from cache.build_lock import BuildLock
+from cache.media_cache import media_cache
+from utils.metrics import metrics
+from utils.utils import get_cover_image
 
 
 def filter_top_anime(results: list[dict], query: str, top_n: int = 5) -> list[dict]:
@@ -86,41 +100,198 @@ def filter_top_anime(results: list[dict], query: str, top_n: int = 5) -> list[di
     return sorted_anime[:top_n]
 
 
-async def get_caption_and_cover_image(shikimori_id: int, lang: str):
+_pending_translations: Dict[Tuple[int, str], asyncio.Task] = {}
+
+
+async def _translate_caption(
+    shikimori_id: int, lang: str, anime_info: AnimeInfo, version: Optional[float]
+) -> str:
+    try:
+        caption, _, _ = await format_anime_caption(anime_info, lang=lang)
+        anime_cache.cache_rendered_caption(shikimori_id, lang, version, caption)
+        logger.info(
+            f"Translated caption cached | shikimori_id: {shikimori_id} | lang: {lang}"
+        )
+        return caption
+    except Exception as e:
+        logger.error(
+            f"Caption translation failed | shikimori_id: {shikimori_id} | lang: {lang} | error: {e}"
+        )
+        raise
+
+
+def _schedule_caption_translation(
+    shikimori_id: int, lang: str, anime_info: AnimeInfo, version: Optional[float]
+) -> asyncio.Task:
+    key = (shikimori_id, lang)
+    if key in _pending_translations:
+        return _pending_translations[key]
+    task = asyncio.create_task(
+        _translate_caption(shikimori_id, lang, anime_info, version)
+    )
+    _pending_translations[key] = task
+    task.add_done_callback(lambda done: _forget_translation(key, done))
+    return task
+
+
+def _forget_translation(key: Tuple[int, str], task: asyncio.Task):
+    _pending_translations.pop(key, None)
+    if not task.cancelled():
+        task.exception()
+
+
+_pending_refreshes: Dict[int, asyncio.Task] = {}
+_build_flights = SingleFlight("anime_build")
+anime_build_lock = BuildLock("anime")
+
+
+async def _render_caption(
+    shikimori_id: int, lang: str, cached_data: dict
+) -> Tuple[str, Optional[asyncio.Task]]:
+    version = cached_data.get("cached_at")
+    caption = anime_cache.get_rendered_caption(shikimori_id, lang, version)
+    if caption is not None:
+        metrics.increment("anime_cache.caption_hit")
+        return caption, None
+
+    metrics.increment("anime_cache.caption_miss")
+    anime_info = AnimeInfo.from_record(cached_data["record"])
+    text = description_to_translate(anime_info, lang)
+    translated = await cached_translation(text) if text else None
+
+    caption, _, _ = await format_anime_caption(
+        anime_info, lang=lang, translate=False, translated_description=translated
+    )
+    if text and translated is None:
+        return caption, _schedule_caption_translation(
+            shikimori_id, lang, anime_info, version
+        )
+    anime_cache.cache_rendered_caption(shikimori_id, lang, version, caption)
+    return caption, None
+
+
+async def _build_anime_data(shikimori_id: int, priority: Priority) -> dict:
+    data_from_shikimori, data_from_anilist = await asyncio.gather(
+        get_info_about_anime_from_shikimori_by_id(shikimori_id, priority=priority),
+        get_info_about_anime_from_anilist_by_mal_id(shikimori_id, priority=priority),
+    )
+    mal_id = data_from_shikimori.get("myanimelist_id")
+    if mal_id and mal_id != shikimori_id:
+        logger.info(
+            f"MAL id differs from Shikimori id, refetching AniList | shikimori_id: {shikimori_id} | mal_id: {mal_id}"
+        )
+        data_from_anilist = await get_info_about_anime_from_anilist_by_mal_id(
+            mal_id, priority=priority
+        )
+    anilist_id = data_from_anilist.get("data", {}).get("Media", {}).get("id")
+    anime_info = AnimeInfo(data_from_shikimori, data_from_anilist)
+    anime_data = anime_cache.build_anime_entry(
+        shikimori_id,
+        anime_info.to_record(),
+        get_cover_image(anime_info.cover_image()),
+        anilist_id,
+        anime_db_data(anime_info),
+    )
+    if await anime_cache.cache_anime(shikimori_id, anime_data):
+        logger.info(f"Anime data cached successfully | shikimori_id: {shikimori_id}")
+    else:
+        metrics.increment("anime_cache.write_failed")
+        logger.warning(
+            f"Serving anime data without caching it | shikimori_id: {shikimori_id}"
+        )
+    return anime_data
+
+
+async def _refresh_anime_data(shikimori_id: int, previous_cover: Optional[str] = None):
+    lock_key = str(shikimori_id)
+    token = await anime_build_lock.acquire(lock_key)
+    if token is None:
+        logger.debug(
+            f"Stale anime data is refreshed elsewhere | shikimori_id: {shikimori_id}"
+        )
+        return
+
+    started = time.monotonic()
+    try:
+        cached_data = await _build_anime_data(shikimori_id, PRIORITY_BACKGROUND)
+        metrics.observe("anime_cache.refresh_seconds", time.monotonic() - started)
+        if previous_cover and cached_data["cover_image"] != previous_cover:
+            await media_cache.invalidate(previous_cover)
+        logger.info(f"Stale anime data refreshed | shikimori_id: {shikimori_id}")
+    except Exception as e:
+        metrics.increment("anime_cache.refresh_failed")
+        logger.warning(
+            f"Stale anime data refresh failed | shikimori_id: {shikimori_id} | error: {e}"
+        )
+    finally:
+        await anime_build_lock.release(lock_key, token)
+
+
+async def _build_with_lock(shikimori_id: int, priority: int) -> dict:
+    lock_key = str(shikimori_id)
+    token = await anime_build_lock.acquire(lock_key)
+    if token is None:
+        logger.info(
+            f"Waiting for anime data built elsewhere | shikimori_id: {shikimori_id}"
+        )
+        cached_data = await anime_build_lock.wait_for(
+            lock_key, lambda: anime_cache.get_cached_anime(shikimori_id)
+        )
+        if cached_data:
+            return cached_data
+        token = await anime_build_lock.acquire(lock_key)
+
+    try:
+        return await _build_anime_data(
+            shikimori_id, lambda: _build_flights.priority(shikimori_id, priority)
+        )
+    finally:
+        if token is not None:
+            await anime_build_lock.release(lock_key, token)
+
+
+def _schedule_refresh(shikimori_id: int, previous_cover: Optional[str] = None):
+    if shikimori_id in _pending_refreshes:
+        return
+    task = asyncio.create_task(_refresh_anime_data(shikimori_id, previous_cover))
+    _pending_refreshes[shikimori_id] = task
+    task.add_done_callback(lambda done: _pending_refreshes.pop(shikimori_id, None))
+
+
+async def get_caption_and_cover_image(
+    shikimori_id: int, lang: str, priority: int = PRIORITY_INTERACTIVE
+):
     logger.info(
         f"Getting anime caption and cover | shikimori_id: {shikimori_id} | lang: {lang}"
     )
 
     try:
-        cached_data = await anime_cache.get_cached_anime(shikimori_id, lang)
+        cached_data = await anime_cache.get_cached_anime(shikimori_id)
         if cached_data:
             logger.info(f"Using cached anime data | shikimori_id: {shikimori_id}")
-            caption = cached_data["caption"]
-            cover_image = cached_data["cover_image"]
-            anilist_id = cached_data["anilist_id"]
-            raw_data_db = cached_data["raw_data_db"]
+            stale_for = anime_cache.stale_for(cached_data)
+            if stale_for > 0:
+                metrics.increment("anime_cache.stale_served")
+                metrics.observe("anime_cache.stale_age_seconds", stale_for)
+                _schedule_refresh(shikimori_id, cached_data["cover_image"])
         else:
             logger.info(f"Fetching fresh anime data | shikimori_id: {shikimori_id}")
-
-            data_from_shikimori = await get_info_about_anime_from_shikimori_by_id(
-                shikimori_id
-            )
-            data_from_anilist = await get_info_about_anime_from_anilist_by_mal_id(
-                data_from_shikimori.get("myanimelist_id", "")
-            )
-            anilist_id = data_from_anilist.get("data", {}).get("Media", {}).get("id")
-            anime_info = AnimeInfo(data_from_shikimori, data_from_anilist)
-            caption, cover_image, raw_data_db = await format_anime_caption(
-                anime_info, lang=lang
-            )
-            await anime_cache.cache_anime(
-                shikimori_id, caption, cover_image, anilist_id, raw_data_db, lang=lang
-            )
-            logger.info(
-                f"Anime data cached successfully | shikimori_id: {shikimori_id}"
+            cached_data = await _build_flights.do(
+                shikimori_id,
+                lambda is_stale: _build_with_lock(shikimori_id, priority),
+                priority=priority,
             )
 
-        return caption, cover_image, anilist_id, raw_data_db
+        caption, pending_translation = await _render_caption(
+            shikimori_id, lang, cached_data
+        )
+        return (
+            caption,
+            cached_data["cover_image"],
+            cached_data["anilist_id"],
+            cached_data["raw_data_db"],
+            pending_translation,
+        )
     except Exception as e:
         logger.error(
             f"Failed to get anime caption/cover | shikimori_id: {shikimori_id} | error: {e}"
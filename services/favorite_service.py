@@ -1,8 +1,12 @@
+from typing import Dict, List
+
 from cache.anime_cache import anime_cache
+from cache.favorite_cache import favorite_cache
+from database.favorites import get_favorite_anime_user
 
 
-async def formating_data_to_db(shikimori_id, anilist_id, lang: str = "en"):
-    cached_anime = await anime_cache.get_cached_anime(shikimori_id, lang)
+async def formating_data_to_db(shikimori_id, anilist_id):
+    cached_anime = await anime_cache.get_cached_anime(shikimori_id)
     if cached_anime and cached_anime.get("raw_data_db"):
         raw_data_db = cached_anime["raw_data_db"]
         romaji_name = raw_data_db.get("title_original", "")
@@ -18,3 +22,26 @@ async def formating_data_to_db(shikimori_id, anilist_id, lang: str = "en"):
         }
         return anime_data
     return None
+
+
+def favorite_entry(anime_id: int, anime_data: dict) -> dict:
+    return {
+        "anime_id": anime_id,
+        "anime_title": anime_data["title_original"],
+        "title_ru": anime_data["title_ru"],
+        "id_shikimori": anime_data["id_shikimori"],
+        "id_anilist": anime_data["id_anilist"],
+    }
+
+
+async def fill_user_favorites(user_id: int) -> List[Dict]:
+    favorites = [dict(row) for row in await get_favorite_anime_user(user_id)]
+    await favorite_cache.cache_user_favorites(user_id, favorites)
+    return favorites
+
+
+async def get_user_favorites(user_id: int) -> List[Dict]:
+    favorites = await favorite_cache.get_cached_user_favorites(user_id)
+    if favorites is None:
+        favorites = await fill_user_favorites(user_id)
+    return favorites
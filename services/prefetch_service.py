@@ -0,0 +1,65 @@
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from api.rate_limiter import PRIORITY_BACKGROUND
+from cache.anime_cache import anime_cache
+from services.anime_service import get_caption_and_cover_image
+
+
+class AnimePrefetcher:
+    def __init__(self):
+        self.top_k = int(os.getenv("PREFETCH_TOP_K", "3"))
+        self.concurrency = int(os.getenv("PREFETCH_CONCURRENCY", "2"))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def cancel(self, user_id: int):
+        task = self._tasks.pop(user_id, None)
+        if task and not task.done():
+            task.cancel()
+            logger.debug(f"Prefetch cancelled | user_id: {user_id}")
+
+    def schedule(self, user_id: int, results: List[Dict], lang: str):
+        self.cancel(user_id)
+        shikimori_ids = [
+            result["id"] for result in results[: self.top_k] if result.get("id")
+        ]
+        if self.top_k <= 0 or not shikimori_ids:
+            return
+
+        task = asyncio.create_task(self._prefetch(user_id, shikimori_ids, lang))
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda done: self._forget(user_id, done))
+
+    def _forget(self, user_id: int, task: asyncio.Task):
+        if self._tasks.get(user_id) is task:
+            del self._tasks[user_id]
+
+    async def _prefetch(self, user_id: int, shikimori_ids: List[int], lang: str):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        cached = await anime_cache.get_many_cached_anime(shikimori_ids)
+        for shikimori_id in shikimori_ids:
+            if shikimori_id in cached:
+                continue
+            async with self._semaphore:
+                try:
+                    await get_caption_and_cover_image(
+                        shikimori_id, lang=lang, priority=PRIORITY_BACKGROUND
+                    )
+                    logger.info(
+                        f"Prefetched anime | user_id: {user_id} | shikimori_id: {shikimori_id} | lang: {lang}"
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(
+                        f"Prefetch failed | user_id: {user_id} | shikimori_id: {shikimori_id} | error: {e}"
+                    )
+
+
+anime_prefetcher = AnimePrefetcher()
@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from api.anilist import (
+    ANILIST_PAGE_SIZE,
+    _ANILIST_QUERY_BY_IDS,
+    get_many_info_about_anime_from_anilist_by_ids,
+)
+
+
+def page(*anime_ids):
+    return {
+        "data": {
+            "Page": {
+                "media": [{"id": anime_id, "episodes": 12} for anime_id in anime_ids]
+            }
+        }
+    }
+
+
+class TestGetManyInfoAboutAnimeFromAnilistByIds:
+    @pytest.mark.asyncio
+    async def test_ids_are_requested_in_chunks_of_page_size(self):
+        anime_ids = list(range(1, ANILIST_PAGE_SIZE + 6))
+
+        async def fetch(variables, query):
+            return page(*variables["ids"])
+
+        with patch("api.anilist._fetch_anilist", side_effect=fetch) as mock_fetch:
+            media_by_id = await get_many_info_about_anime_from_anilist_by_ids(anime_ids)
+
+        chunks = [call.args[0]["ids"] for call in mock_fetch.call_args_list]
+        assert chunks == [anime_ids[:ANILIST_PAGE_SIZE], anime_ids[ANILIST_PAGE_SIZE:]]
+        assert all(
+            call.args[0]["perPage"] == ANILIST_PAGE_SIZE
+            and call.kwargs["query"] == _ANILIST_QUERY_BY_IDS
+            for call in mock_fetch.call_args_list
+        )
+        assert sorted(media_by_id) == anime_ids
+
+    @pytest.mark.asyncio
+    async def test_duplicate_and_empty_ids_are_dropped(self):
+        with patch(
+            "api.anilist._fetch_anilist",
+            new_callable=AsyncMock,
+            return_value=page(3, 1),
+        ) as mock_fetch:
+            await get_many_info_about_anime_from_anilist_by_ids([3, None, 1, 3, 0, 1])
+
+        mock_fetch.assert_called_once_with(
+            {"ids": [3, 1], "perPage": ANILIST_PAGE_SIZE}, query=_ANILIST_QUERY_BY_IDS
+        )
+
+    @pytest.mark.asyncio
+    async def test_page_media_is_keyed_by_anilist_id(self):
+        with patch(
+            "api.anilist._fetch_anilist",
+            new_callable=AsyncMock,
+            return_value=page(10, 20),
+        ):
+            media_by_id = await get_many_info_about_anime_from_anilist_by_ids(
+                [10, 20, 30]
+            )
+
+        assert media_by_id == {
+            10: {"id": 10, "episodes": 12},
+            20: {"id": 20, "episodes": 12},
+        }
+
+    @pytest.mark.asyncio
+    async def test_failed_request_returns_no_media(self):
+        with patch(
+            "api.anilist._fetch_anilist", new_callable=AsyncMock, return_value={}
+        ):
+            assert await get_many_info_about_anime_from_anilist_by_ids([10, 20]) == {}
+
+    @pytest.mark.asyncio
+    async def test_no_ids_makes_no_request(self):
+        with patch("api.anilist._fetch_anilist", new_callable=AsyncMock) as mock_fetch:
+            assert await get_many_info_about_anime_from_anilist_by_ids([]) == {}
+
+        mock_fetch.assert_not_called()
@@ -0,0 +1,254 @@
+import asyncio
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from api.rate_limiter import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RedisWindowLimiter,
+    RequestShed,
+    TokenBucketLimiter,
+    _parse_retry_after,
+)
+from utils.metrics import metrics
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert _parse_retry_after("5") == 5.0
+        assert _parse_retry_after("-3") == 0.0
+
+    def test_http_date(self):
+        retry_at = datetime.fromtimestamp(1030, tz=timezone.utc)
+
+        with patch("api.rate_limiter.time.time", return_value=1000):
+            assert _parse_retry_after(format_datetime(retry_at)) == 30.0
+
+    def test_missing_or_invalid(self):
+        assert _parse_retry_after(None) is None
+        assert _parse_retry_after("") is None
+        assert _parse_retry_after("soon") is None
+
+
+class TestTokenBucketRefill:
+    def test_refills_at_capacity_rate(self):
+        limiter = TokenBucketLimiter("test", capacity=60, period=60)
+        limiter.tokens = 0
+        limiter.updated_at = 100
+
+        with patch("api.rate_limiter.time.monotonic", return_value=130):
+            limiter._refill()
+
+        assert limiter.tokens == 30
+
+    def test_refill_is_capped_at_burst(self):
+        limiter = TokenBucketLimiter("test", capacity=60, period=60, burst=10)
+        limiter.tokens = 0
+        limiter.updated_at = 100
+
+        with patch("api.rate_limiter.time.monotonic", return_value=1000):
+            limiter._refill()
+
+        assert limiter.tokens == 10
+
+    def test_delay_until_next_token(self):
+        limiter = TokenBucketLimiter("test", capacity=60, period=60)
+        limiter.tokens = 0.25
+        limiter.updated_at = 100
+
+        with patch("api.rate_limiter.time.monotonic", return_value=100):
+            assert limiter._delay(PRIORITY_INTERACTIVE) == 0.75
+
+
+class TestTokenBucketQueue:
+    def make_limiter(self, **kwargs):
+        limiter = TokenBucketLimiter("test", capacity=100, period=1, burst=1, **kwargs)
+        limiter.tokens = 0
+        return limiter
+
+    @pytest.mark.asyncio
+    async def test_interactive_requests_jump_the_queue(self):
+        limiter = self.make_limiter()
+        order = []
+
+        async def acquire(name, priority):
+            await limiter.acquire(priority=priority)
+            order.append(name)
+
+        background = asyncio.create_task(acquire("background", PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(acquire("interactive", PRIORITY_INTERACTIVE))
+        await asyncio.wait_for(asyncio.gather(background, interactive), 1)
+
+        assert order == ["interactive", "background"]
+        assert limiter.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_raised_priority_moves_waiter_ahead(self):
+        limiter = self.make_limiter()
+        raised_priority = PRIORITY_BACKGROUND
+        order = []
+
+        async def acquire(name, priority):
+            await limiter.acquire(priority=priority)
+            order.append(name)
+
+        background = asyncio.create_task(acquire("background", PRIORITY_BACKGROUND))
+        raised = asyncio.create_task(acquire("raised", lambda: raised_priority))
+        await asyncio.sleep(0)
+        raised_priority = PRIORITY_INTERACTIVE
+        await asyncio.wait_for(asyncio.gather(background, raised), 1)
+
+        assert order == ["raised", "background"]
+        assert limiter.queue_depth == 0
+
+    def test_background_requests_leave_interactive_reserve(self):
+        limiter = TokenBucketLimiter(
+            "test", capacity=60, period=60, interactive_reserve=2
+        )
+        limiter.tokens = 2
+        limiter.updated_at = 100
+
+        with patch("api.rate_limiter.time.monotonic", return_value=100):
+            assert limiter._delay(PRIORITY_INTERACTIVE) == 0
+            assert limiter._delay(PRIORITY_BACKGROUND) == 1
+
+    @pytest.mark.asyncio
+    async def test_sheds_request_after_max_wait(self):
+        limiter = TokenBucketLimiter("test", capacity=1, period=60)
+        limiter.tokens = 0
+
+        with pytest.raises(RequestShed, match="timeout"):
+            await limiter.acquire(priority=PRIORITY_INTERACTIVE, max_wait=0.05)
+
+        assert limiter.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_sheds_stale_request(self):
+        limiter = TokenBucketLimiter("test", capacity=1, period=60)
+        limiter.tokens = 0
+
+        with pytest.raises(RequestShed, match="stale"):
+            await limiter.acquire(is_stale=lambda: True)
+
+        assert limiter.queue_depth == 0
+
+    def test_stats_are_exported_with_metrics_snapshot(self):
+        limiter = TokenBucketLimiter("exported", capacity=60, period=60)
+        limiter.tokens = 4
+
+        stats = metrics.snapshot()["collected"]["rate_limiter.exported"]
+
+        assert stats["queue_depth"] == 0
+        assert stats["tokens"] == 4
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        limiter = TokenBucketLimiter("test", capacity=1, period=60)
+        limiter.tokens = 0
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.queue_depth == 0
+
+
+class TestUpdateFromHeaders:
+    def make_limiter(self):
+        limiter = TokenBucketLimiter("test", capacity=90, period=60)
+        limiter.updated_at = 100
+        return limiter
+
+    def test_retry_after_blocks_limiter(self):
+        limiter = self.make_limiter()
+
+        with patch("api.rate_limiter.time.monotonic", return_value=100):
+            limiter.update_from_headers(429, {"Retry-After": "5"})
+            assert limiter._delay(PRIORITY_INTERACTIVE) == 5
+
+    def test_rate_limited_without_headers_uses_fallback(self):
+        limiter = self.make_limiter()
+
+        with patch("api.rate_limiter.time.monotonic", return_value=100):
+            limiter.update_from_headers(429, {}, fallback_delay=2.0)
+
+        assert limiter.blocked_until == 102
+
+    def test_reset_header_blocks_when_exhausted(self):
+        limiter = self.make_limiter()
+        headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1020"}
+
+        with patch("api.rate_limiter.time.monotonic", return_value=100), patch(
+            "api.rate_limiter.time.time", return_value=1000
+        ):
+            limiter.update_from_headers(200, headers)
+
+        assert limiter.tokens == 0
+        assert limiter.blocked_until == 120
+
+    def test_limit_header_adjusts_rate_and_burst(self):
+        limiter = self.make_limiter()
+        headers = {"X-RateLimit-Limit": "30", "X-RateLimit-Remaining": "12"}
+
+        with patch("api.rate_limiter.time.monotonic", return_value=100):
+            limiter.update_from_headers(200, headers)
+
+        assert limiter.refill_per_second == 0.5
+        assert limiter.burst == 30
+        assert limiter.tokens == 12
+        assert limiter.blocked_until == 0
+
+
+class TestRedisWindowLimiter:
+    @pytest.mark.asyncio
+    async def test_acquires_all_windows_in_one_script(self):
+        limiter = RedisWindowLimiter("test", {1: 5, 60: 90})
+
+        with patch("api.rate_limiter.time.time", return_value=120.5), patch(
+            "api.rate_limiter.redis_client.eval",
+            new_callable=AsyncMock,
+            return_value=[],
+        ) as mock_eval, patch(
+            "api.rate_limiter.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            await limiter.acquire()
+
+            mock_eval.assert_called_once()
+            _, keys, args = mock_eval.call_args.args
+            assert keys == ["ratelimit:test:1:120", "ratelimit:test:60:2"]
+            assert args == [5, 90, 2, 120]
+            mock_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_waits_for_rejecting_window_only(self):
+        limiter = RedisWindowLimiter("test", {1: 5, 60: 90})
+
+        with patch("api.rate_limiter.time.time", return_value=120.25), patch(
+            "api.rate_limiter.redis_client.eval",
+            new_callable=AsyncMock,
+            side_effect=[[1], []],
+        ) as mock_eval, patch(
+            "api.rate_limiter.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            await limiter.acquire()
+
+            assert mock_eval.call_count == 2
+            mock_sleep.assert_called_once_with(0.75)
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_lets_request_through(self):
+        limiter = RedisWindowLimiter("test", {1: 5})
+
+        with patch(
+            "api.rate_limiter.redis_client.eval",
+            new_callable=AsyncMock,
+            side_effect=ConnectionError("Redis down"),
+        ):
+            await limiter.acquire()
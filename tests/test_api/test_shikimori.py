@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from api.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from api.shikimori import (
+    SHIKIMORI_MAX_QUEUE_WAIT,
+    get_info_about_anime_from_shikimori_by_id,
+)
+
+
+class TestGetInfoAboutAnimeFromShikimoriById:
+    @pytest.mark.asyncio
+    async def test_interactive_caller_gets_own_flight(self):
+        background_started = asyncio.Event()
+        release_background = asyncio.Event()
+        calls = []
+
+        async def fetch(url, priority, max_wait):
+            calls.append((priority, max_wait))
+            if priority == PRIORITY_BACKGROUND:
+                background_started.set()
+                await release_background.wait()
+            return {"id": 1, "priority": priority}
+
+        with patch("api.shikimori.fetch_json_with_retries", side_effect=fetch):
+            background = asyncio.create_task(
+                get_info_about_anime_from_shikimori_by_id(
+                    1, priority=PRIORITY_BACKGROUND
+                )
+            )
+            await background_started.wait()
+
+            data = await asyncio.wait_for(
+                get_info_about_anime_from_shikimori_by_id(1), 1
+            )
+
+            assert data["priority"] == PRIORITY_INTERACTIVE
+            assert calls == [
+                (PRIORITY_BACKGROUND, None),
+                (PRIORITY_INTERACTIVE, SHIKIMORI_MAX_QUEUE_WAIT),
+            ]
+            release_background.set()
+            assert (await background)["priority"] == PRIORITY_BACKGROUND
+
+    @pytest.mark.asyncio
+    async def test_same_priority_callers_share_flight(self):
+        calls = []
+
+        async def fetch(url, priority, max_wait):
+            calls.append(priority)
+            await asyncio.sleep(0.01)
+            return {"id": 2}
+
+        with patch("api.shikimori.fetch_json_with_retries", side_effect=fetch):
+            results = await asyncio.gather(
+                *(get_info_about_anime_from_shikimori_by_id(2) for _ in range(3))
+            )
+
+            assert results == [{"id": 2}] * 3
+            assert calls == [PRIORITY_INTERACTIVE]
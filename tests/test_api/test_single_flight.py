@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from api.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        flights = SingleFlight("test")
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch(is_stale):
+            calls.append(1)
+            await release.wait()
+            return "result"
+
+        callers = [asyncio.create_task(flights.do("key", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*callers) == ["result"] * 3
+        assert len(calls) == 1
+        assert flights._flights == {}
+
+    @pytest.mark.asyncio
+    async def test_different_keys_do_not_share(self):
+        flights = SingleFlight("test")
+
+        async def fetch(value):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            flights.do("a", lambda _: fetch("a")),
+            flights.do("b", lambda _: fetch("b")),
+        )
+
+        assert results == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_caller(self):
+        flights = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def fetch(is_stale):
+            await release.wait()
+            raise ValueError("upstream failed")
+
+        callers = [asyncio.create_task(flights.do("key", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_flight_survives_while_one_caller_remains(self):
+        flights = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def fetch(is_stale):
+            await release.wait()
+            return "result"
+
+        leaving = asyncio.create_task(flights.do("key", fetch))
+        staying = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0)
+
+        leaving.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        release.set()
+
+        assert await staying == "result"
+
+    @pytest.mark.asyncio
+    async def test_flight_cancelled_when_all_callers_leave(self):
+        flights = SingleFlight("test")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def fetch(is_stale):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(flights.do("key", fetch)) for _ in range(2)]
+        await started.wait()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        assert flights._flights == {}
+
+    @pytest.mark.asyncio
+    async def test_flight_is_stale_only_when_every_caller_is(self):
+        flights = SingleFlight("test")
+        release = asyncio.Event()
+        stale_checks = []
+
+        async def fetch(is_stale):
+            await release.wait()
+            stale_checks.append(is_stale())
+            return "result"
+
+        first = asyncio.create_task(flights.do("key", fetch, is_stale=lambda: False))
+        second = asyncio.create_task(flights.do("key", fetch, is_stale=lambda: True))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, second)
+
+        assert stale_checks == [False]
+
+    @pytest.mark.asyncio
+    async def test_priority_is_highest_among_callers(self):
+        flights = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def fetch(is_stale):
+            await release.wait()
+            return "result"
+
+        background = asyncio.create_task(flights.do("key", fetch, priority=1))
+        await asyncio.sleep(0)
+        assert flights.priority("key", 1) == 1
+
+        interactive = asyncio.create_task(flights.do("key", fetch, priority=0))
+        await asyncio.sleep(0)
+        assert flights.priority("key", 1) == 0
+
+        release.set()
+        await asyncio.gather(background, interactive)
+        assert flights.priority("key", 1) == 1
@@ -0,0 +1,116 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from api import translate
+from api.translate import translate_text, translate_texts
+
+
+def upper_texts(texts, source="en", target="ru"):
+    return {text: text.upper() for text in texts}
+
+
+@pytest.fixture
+def empty_cache():
+    with patch(
+        "api.translate.translation_cache.get_translations",
+        new_callable=AsyncMock,
+        return_value={},
+    ) as mock_get:
+        yield mock_get
+
+
+class TestTranslateTexts:
+    @pytest.mark.asyncio
+    async def test_only_missing_texts_are_requested(self):
+        with patch(
+            "api.translate.translation_cache.get_translations",
+            new_callable=AsyncMock,
+            return_value={"cached": "CACHED"},
+        ), patch(
+            "api.translate.translation_cache.cache_translations",
+            new_callable=AsyncMock,
+        ) as mock_cache, patch(
+            "api.translate._request_translations",
+            new_callable=AsyncMock,
+            return_value=["NEW"],
+        ) as mock_request:
+            result = await translate_texts(["cached", "new", "new"])
+
+        assert result == ["CACHED", "NEW", "NEW"]
+        mock_request.assert_called_once_with(["new"], "en", "ru")
+        mock_cache.assert_called_once_with({"new": "NEW"}, "en", "ru")
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_request(self):
+        with patch(
+            "api.translate.translation_cache.get_translations",
+            new_callable=AsyncMock,
+            return_value={"cached": "CACHED"},
+        ), patch(
+            "api.translate._request_translations", new_callable=AsyncMock
+        ) as mock_request:
+            assert await translate_texts(["cached"]) == ["CACHED"]
+
+        mock_request.assert_not_called()
+
+
+class TestTranslateText:
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_batch(self):
+        with patch(
+            "api.translate.translation_cache.get_translations",
+            new_callable=AsyncMock,
+            return_value={"a": "А"},
+        ), patch(
+            "api.translate._translate_uncached", new_callable=AsyncMock
+        ) as mock_translate:
+            assert await translate_text("a") == "А"
+
+        mock_translate.assert_not_called()
+        assert translate._pending_batches == {}
+
+    @pytest.mark.asyncio
+    async def test_texts_within_window_share_one_batch(self, empty_cache):
+        with patch(
+            "api.translate._translate_uncached",
+            new_callable=AsyncMock,
+            side_effect=upper_texts,
+        ) as mock_translate:
+            results = await asyncio.gather(translate_text("a"), translate_text("b"))
+
+        assert results == ["A", "B"]
+        mock_translate.assert_called_once_with(["a", "b"], "en", "ru")
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting(self, empty_cache):
+        with patch("api.translate.TRANSLATE_BATCH_WINDOW", 10), patch(
+            "api.translate.TRANSLATE_BATCH_SIZE", 2
+        ), patch(
+            "api.translate._translate_uncached",
+            new_callable=AsyncMock,
+            side_effect=upper_texts,
+        ) as mock_translate:
+            results = await asyncio.wait_for(
+                asyncio.gather(translate_text("a"), translate_text("b")), 1
+            )
+
+        assert results == ["A", "B"]
+        mock_translate.assert_called_once_with(["a", "b"], "en", "ru")
+        for task in list(translate._flush_tasks):
+            task.cancel()
+        await asyncio.gather(*translate._flush_tasks, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_batch_error_reaches_every_caller(self, empty_cache):
+        with patch(
+            "api.translate._translate_uncached",
+            new_callable=AsyncMock,
+            side_effect=ValueError("LibreTranslate down"),
+        ):
+            results = await asyncio.gather(
+                translate_text("a"), translate_text("b"), return_exceptions=True
+            )
+
+        assert all(isinstance(result, ValueError) for result in results)
@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from cache.build_lock import BuildLock
+from utils.metrics import metrics
+
+
+@pytest.fixture
+def lock_store():
+    store = {}
+
+    async def set_nx(key, value, expire_ms):
+        if key in store:
+            return False
+        store[key] = value
+        return True
+
+    async def delete_if_equals(key, value):
+        if store.get(key) != value:
+            return False
+        del store[key]
+        return True
+
+    async def exists(key):
+        return key in store
+
+    with patch("cache.build_lock.redis_client.set_nx", side_effect=set_nx), patch(
+        "cache.build_lock.redis_client.delete_if_equals",
+        side_effect=delete_if_equals,
+    ), patch("cache.build_lock.redis_client.exists", side_effect=exists):
+        yield store
+
+
+def make_lock(wait_timeout=1.0):
+    lock = BuildLock("test")
+    lock.wait_timeout = wait_timeout
+    lock.poll_interval = 0.01
+    return lock
+
+
+class TestBuildLock:
+    @pytest.mark.asyncio
+    async def test_second_acquire_is_contended(self, lock_store):
+        lock = make_lock()
+
+        token = await lock.acquire("456")
+
+        assert token is not None
+        assert await lock.acquire("456") is None
+        assert lock_store == {"lock:test:456": token}
+
+    @pytest.mark.asyncio
+    async def test_release_deletes_only_owner_token(self, lock_store):
+        lock = make_lock()
+        token = await lock.acquire("456")
+
+        await lock.release("456", "expired-owner")
+        assert lock_store == {"lock:test:456": token}
+
+        await lock.release("456", token)
+        assert lock_store == {}
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_lets_caller_build(self):
+        lock = make_lock()
+
+        with patch(
+            "cache.build_lock.redis_client.set_nx",
+            new_callable=AsyncMock,
+            side_effect=ConnectionError("Redis down"),
+        ):
+            assert await lock.acquire("456") is not None
+
+    @pytest.mark.asyncio
+    async def test_wait_for_returns_built_value(self, lock_store):
+        lock = make_lock()
+        await lock.acquire("456")
+        lookup = AsyncMock(side_effect=[None, {"cover_image": "cover.jpg"}])
+
+        assert await lock.wait_for("456", lookup) == {"cover_image": "cover.jpg"}
+        assert lookup.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_wait_for_returns_when_key_disappears(self, lock_store):
+        lock = make_lock(wait_timeout=5)
+        token = await lock.acquire("456")
+        lookup = AsyncMock(return_value=None)
+
+        waiter = asyncio.create_task(lock.wait_for("456", lookup))
+        await asyncio.sleep(0.02)
+        await lock.release("456", token)
+
+        assert await asyncio.wait_for(waiter, 1) is None
+
+    @pytest.mark.asyncio
+    async def test_takeover_after_wait_timeout(self, lock_store):
+        lock = make_lock(wait_timeout=0.05)
+        await lock.acquire("456")
+        failed = metrics.counters.get("build_lock.test.wait_failed", 0)
+
+        assert await lock.wait_for("456", AsyncMock(return_value=None)) is None
+        assert metrics.counters["build_lock.test.wait_failed"] == failed + 1
+
+        lock_store.clear()  # the stuck holder's lease expires
+        assert await lock.acquire("456") is not None
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from cache.codec import (
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    MAGIC,
+    SERIALIZER_JSON,
+    SERIALIZER_ORJSON,
+    CacheCodec,
+    orjson,
+)
+
+ANIME_DATA = {
+    "caption": "<b>Naruto</b>\n" + "Описание " * 200,
+    "cover_image": "https://example.com/cover.jpg",
+    "anilist_id": 20,
+    "shikimori_id": 20,
+    "raw_data_db": {"title_ru": "Наруто", "episodes": 220},
+}
+
+
+class TestCacheCodec:
+    @pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+    def test_roundtrip(self, serializer):
+        codec = CacheCodec(serializer=serializer, compression="zlib")
+
+        assert codec.decode(codec.encode(ANIME_DATA)) == ANIME_DATA
+        assert codec.decode(codec.encode("ru")) == "ru"
+        assert codec.decode(codec.encode([])) == []
+
+    def test_header(self):
+        codec = CacheCodec(serializer="json", compression="none")
+
+        data = codec.encode({"a": 1})
+
+        assert data[:4] == bytes((MAGIC, 1, SERIALIZER_JSON, COMPRESSION_NONE))
+
+    def test_compresses_only_above_threshold(self):
+        codec = CacheCodec(
+            serializer="json", compression="zlib", compress_threshold=1024
+        )
+
+        small = codec.encode({"a": 1})
+        large = codec.encode(ANIME_DATA)
+
+        assert small[3] == COMPRESSION_NONE
+        assert large[3] == COMPRESSION_ZLIB
+        assert len(large) < len(json.dumps(ANIME_DATA, ensure_ascii=False).encode())
+
+    def test_decodes_legacy_json_text(self):
+        codec = CacheCodec()
+
+        assert codec.decode(json.dumps(ANIME_DATA, ensure_ascii=False)) == ANIME_DATA
+        assert codec.decode(b"ru") == "ru"
+        assert codec.decode(b"") is None
+        assert codec.decode(None) is None
+
+    @pytest.mark.skipif(orjson is None, reason="orjson is not installed")
+    def test_reads_values_written_with_another_serializer(self):
+        writer = CacheCodec(serializer="orjson", compression="zlib")
+        reader = CacheCodec(serializer="json", compression="none")
+
+        data = writer.encode({1: "one"})
+
+        assert data[2] == SERIALIZER_ORJSON
+        assert reader.decode(data) == {"1": "one"}
+
+    def test_corrupt_value_is_a_miss(self):
+        codec = CacheCodec()
+
+        assert (
+            codec.decode(bytes((MAGIC, 1, SERIALIZER_JSON, COMPRESSION_ZLIB)) + b"xx")
+            is None
+        )
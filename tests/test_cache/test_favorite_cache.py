@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import AsyncMock, call, patch
+
+from cache.favorite_cache import favorite_cache
+
+ROW_1 = {
+    "anime_id": 1,
+    "anime_title": "A",
+    "title_ru": "А",
+    "id_shikimori": 10,
+    "id_anilist": 100,
+}
+ROW_2 = {
+    "anime_id": 2,
+    "anime_title": "B",
+    "title_ru": "Б",
+    "id_shikimori": 20,
+    "id_anilist": 200,
+}
+
+
+class TestFavoriteCache:
+    def test_partial_hash_is_a_miss(self):
+        assert favorite_cache.favorites_from_hash({}) is None
+        assert favorite_cache.favorites_from_hash({"2": ROW_2}) is None
+
+    def test_complete_hash_returns_rows(self):
+        values = {"2": ROW_2, "__complete__": 1, "1": ROW_1}
+
+        assert favorite_cache.favorites_from_hash(values) == [ROW_1, ROW_2]
+        assert favorite_cache.favorites_from_hash({"__complete__": 1}) == []
+
+    def test_complete_ids_hash_maps_shikimori_to_anime_id(self):
+        assert favorite_cache.favorite_ids_from_hash({"1": 10}) is None
+        assert favorite_cache.favorite_ids_from_hash(
+            {"1": 10, "2": 20, "__complete__": 1}
+        ) == {10: 1, 20: 2}
+
+    @pytest.mark.asyncio
+    async def test_cache_user_favorites_replaces_hash(self):
+        with patch(
+            "cache.favorite_cache.redis_client.hset", new_callable=AsyncMock
+        ) as mock_hset:
+            await favorite_cache.cache_user_favorites(5, [ROW_1])
+
+            assert mock_hset.call_args_list == [
+                call(
+                    "favorites:hash:5",
+                    {"1": ROW_1, "__complete__": 1},
+                    favorite_cache.favorite_ttl,
+                    replace=True,
+                ),
+                call(
+                    "favorites:ids:5",
+                    {"1": 10, "__complete__": 1},
+                    favorite_cache.favorite_ttl,
+                    replace=True,
+                ),
+            ]
+
+    @pytest.mark.asyncio
+    async def test_add_and_remove_are_incremental(self):
+        with patch(
+            "cache.favorite_cache.redis_client.hset", new_callable=AsyncMock
+        ) as mock_hset, patch(
+            "cache.favorite_cache.redis_client.hdel", new_callable=AsyncMock
+        ) as mock_hdel, patch(
+            "cache.favorite_cache.redis_client.delete_many", new_callable=AsyncMock
+        ) as mock_delete:
+            await favorite_cache.add_user_favorite(5, ROW_2)
+            await favorite_cache.remove_user_favorite(5, 1)
+
+            assert mock_hset.call_args_list == [
+                call("favorites:hash:5", {"2": ROW_2}, favorite_cache.favorite_ttl),
+                call("favorites:ids:5", {"2": 20}, favorite_cache.favorite_ttl),
+            ]
+            assert mock_hdel.call_args_list == [
+                call("favorites:hash:5", ["1"]),
+                call("favorites:ids:5", ["1"]),
+            ]
+            mock_delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_update_drops_hash(self):
+        with patch(
+            "cache.favorite_cache.redis_client.hdel",
+            new_callable=AsyncMock,
+            side_effect=Exception("Redis down"),
+        ), patch(
+            "cache.favorite_cache.redis_client.delete_many", new_callable=AsyncMock
+        ) as mock_delete:
+            await favorite_cache.remove_user_favorite(5, 1)
+
+            mock_delete.assert_called_once_with(["favorites:hash:5", "favorites:ids:5"])
@@ -0,0 +1,95 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from cache.media_cache import media_cache
+
+
+class TestMediaCache:
+    @pytest.mark.asyncio
+    async def test_db_hit_is_cached(self):
+        key = media_cache._get_media_key("cover.jpg")
+
+        with patch(
+            "cache.media_cache.media_cache.store.get",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "cache.media_cache.get_media_file_id",
+            new_callable=AsyncMock,
+            return_value="file-id",
+        ), patch(
+            "cache.media_cache.media_cache.store.set", new_callable=AsyncMock
+        ) as mock_set:
+            assert await media_cache.get_file_id("cover.jpg") == "file-id"
+
+        mock_set.assert_awaited_once_with(key, "file-id", expire=media_cache.media_ttl)
+
+    @pytest.mark.asyncio
+    async def test_db_miss_is_cached_briefly(self):
+        key = media_cache._get_media_key("cover.jpg")
+
+        with patch(
+            "cache.media_cache.media_cache.store.get",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "cache.media_cache.get_media_file_id",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "cache.media_cache.media_cache.store.set", new_callable=AsyncMock
+        ) as mock_set:
+            assert await media_cache.get_file_id("cover.jpg") is None
+
+        mock_set.assert_awaited_once_with(key, "", expire=media_cache.miss_ttl)
+
+    @pytest.mark.asyncio
+    async def test_cached_miss_skips_db(self):
+        with patch(
+            "cache.media_cache.media_cache.store.get",
+            new_callable=AsyncMock,
+            return_value="",
+        ), patch(
+            "cache.media_cache.get_media_file_id", new_callable=AsyncMock
+        ) as mock_db:
+            assert await media_cache.get_file_id("cover.jpg") is None
+
+        mock_db.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_loads_recent_file_ids(self):
+        rows = [
+            {"cover_url": "a.jpg", "file_id": "file-a"},
+            {"cover_url": "b.jpg", "file_id": "file-b"},
+        ]
+
+        with patch(
+            "cache.media_cache.get_recent_media_file_ids",
+            new_callable=AsyncMock,
+            return_value=rows,
+        ) as mock_recent, patch(
+            "cache.media_cache.media_cache.store.mset", new_callable=AsyncMock
+        ) as mock_mset:
+            await media_cache.warm_up()
+
+        mock_recent.assert_awaited_once_with(media_cache.warm_up_limit)
+        mock_mset.assert_awaited_once_with(
+            [
+                (media_cache._get_media_key("a.jpg"), "file-a", media_cache.media_ttl),
+                (media_cache._get_media_key("b.jpg"), "file-b", media_cache.media_ttl),
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_warm_up_failure_is_logged(self):
+        with patch(
+            "cache.media_cache.get_recent_media_file_ids",
+            new_callable=AsyncMock,
+            side_effect=ConnectionError("Postgres down"),
+        ), patch(
+            "cache.media_cache.media_cache.store.mset", new_callable=AsyncMock
+        ) as mock_mset:
+            await media_cache.warm_up()
+
+        mock_mset.assert_not_called()
@@ -0,0 +1,83 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from cache.search_cache import search_cache
+
+RESULTS = [{"id": 1, "name": "Naruto"}]
+
+
+class TestSearchCache:
+    @pytest.mark.asyncio
+    async def test_save_search_results_writes_results_and_pointer(self):
+        with patch.object(
+            search_cache.store, "mset", new_callable=AsyncMock
+        ) as mock_mset:
+            await search_cache.save_search_results(5, "Naruto!", RESULTS)
+
+        mock_mset.assert_called_once_with(
+            [
+                (
+                    "search:query:naruto",
+                    {"query": "Naruto!", "results": RESULTS},
+                    search_cache.search_ttl,
+                ),
+                (
+                    "last_search:5",
+                    {"query": "Naruto!", "key": "search:query:naruto"},
+                    search_cache.search_ttl,
+                ),
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_empty_results_get_short_ttl(self):
+        with patch.object(
+            search_cache.store, "set", new_callable=AsyncMock
+        ) as mock_set:
+            await search_cache.cache_search_results("Nothing", [])
+            await search_cache.cache_search_results("Naruto", RESULTS)
+
+        assert [c.kwargs["expire"] for c in mock_set.call_args_list] == [
+            search_cache.empty_search_ttl,
+            search_cache.search_ttl,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_last_search_follows_pointer(self):
+        stored = {
+            "last_search:5": {"query": "Naruto!", "key": "search:query:naruto"},
+            "search:query:naruto": {"query": "naruto", "results": RESULTS},
+        }
+
+        with patch.object(
+            search_cache.store,
+            "get",
+            new_callable=AsyncMock,
+            side_effect=lambda key: stored.get(key),
+        ):
+            last_search = await search_cache.get_user_last_search(5)
+
+        assert last_search == {"query": "Naruto!", "results": RESULTS}
+
+    @pytest.mark.asyncio
+    async def test_last_search_pointer_to_expired_results(self):
+        stored = {"last_search:5": {"query": "Naruto", "key": "search:query:naruto"}}
+
+        with patch.object(
+            search_cache.store,
+            "get",
+            new_callable=AsyncMock,
+            side_effect=lambda key: stored.get(key),
+        ):
+            assert await search_cache.get_user_last_search(5) is None
+
+    @pytest.mark.asyncio
+    async def test_legacy_last_search_with_results(self):
+        legacy = {"query": "Naruto", "results": RESULTS}
+
+        with patch.object(
+            search_cache.store, "get", new_callable=AsyncMock, return_value=legacy
+        ) as mock_get:
+            assert await search_cache.get_user_last_search(5) == legacy
+
+        mock_get.assert_called_once_with("last_search:5")
@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from cache.translation_cache import translation_cache
+
+
+class TestTranslationCache:
+    def test_key_depends_on_language_pair(self):
+        en_ru = translation_cache._get_translation_key("Hello", "en", "ru")
+        en_de = translation_cache._get_translation_key("Hello", "en", "de")
+
+        assert en_ru.startswith("translation:en:ru:")
+        assert en_ru != en_de
+
+    @pytest.mark.asyncio
+    async def test_get_translations_returns_hits_only(self):
+        with patch(
+            "cache.translation_cache.redis_client.mget",
+            new_callable=AsyncMock,
+            return_value=[{"text": "Привет"}, None],
+        ) as mock_mget:
+            found = await translation_cache.get_translations(
+                ["Hello", "Bye"], "en", "ru"
+            )
+
+        assert found == {"Hello": "Привет"}
+        mock_mget.assert_called_once_with(
+            [
+                translation_cache._get_translation_key("Hello", "en", "ru"),
+                translation_cache._get_translation_key("Bye", "en", "ru"),
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_translations_redis_error_is_a_miss(self):
+        with patch(
+            "cache.translation_cache.redis_client.mget",
+            new_callable=AsyncMock,
+            side_effect=ConnectionError("Redis down"),
+        ):
+            assert await translation_cache.get_translations(["Hello"], "en", "ru") == {}
+
+    @pytest.mark.asyncio
+    async def test_cache_translations_sets_ttl(self):
+        with patch(
+            "cache.translation_cache.redis_client.mset", new_callable=AsyncMock
+        ) as mock_mset:
+            await translation_cache.cache_translations({"Hello": "Привет"}, "en", "ru")
+
+        mock_mset.assert_called_once_with(
+            [
+                (
+                    translation_cache._get_translation_key("Hello", "en", "ru"),
+                    {"text": "Привет"},
+                    translation_cache.translation_ttl,
+                )
+            ]
+        )
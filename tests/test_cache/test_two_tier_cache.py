@@ -0,0 +1,113 @@
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from cache.two_tier_cache import LocalCache, TwoTierCache, cache_invalidator
+
+
+class TestLocalCache:
+    def test_evicts_least_recently_used(self):
+        local = LocalCache(max_size=2, ttl=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert local.get("a") == 1
+        assert local.get("c") == 3
+        assert "b" not in local._data
+
+    def test_expired_entry_is_dropped(self):
+        local = LocalCache(max_size=10, ttl=60)
+        with patch("cache.two_tier_cache.time.monotonic", return_value=100):
+            local.set("a", 1, ttl=5)
+        with patch("cache.two_tier_cache.time.monotonic", return_value=106):
+            local.get("a")
+            assert len(local) == 0
+
+
+class TestTwoTierCache:
+    @pytest.mark.asyncio
+    async def test_get_reads_redis_once(self):
+        cache = TwoTierCache("test", max_size=10, local_ttl=60)
+
+        with patch(
+            "cache.two_tier_cache.redis_client.get",
+            new_callable=AsyncMock,
+            return_value={"x": 1},
+        ) as mock_get:
+            assert await cache.get("key") == {"x": 1}
+            assert await cache.get("key") == {"x": 1}
+
+            mock_get.assert_called_once_with("key")
+
+    @pytest.mark.asyncio
+    async def test_mget_fetches_only_missing(self):
+        cache = TwoTierCache("test", max_size=10, local_ttl=60)
+        cache.local.set("a", 1)
+
+        with patch(
+            "cache.two_tier_cache.redis_client.mget",
+            new_callable=AsyncMock,
+            return_value=[2, None],
+        ) as mock_mget:
+            assert await cache.mget(["a", "b", "c"]) == [1, 2, None]
+
+            mock_mget.assert_called_once_with(["b", "c"])
+            assert cache.local.get("b") == 2
+
+    @pytest.mark.asyncio
+    async def test_set_and_delete_publish_invalidation(self):
+        cache = TwoTierCache("test", max_size=10, local_ttl=60)
+
+        with patch(
+            "cache.two_tier_cache.redis_client.set", new_callable=AsyncMock
+        ), patch(
+            "cache.two_tier_cache.redis_client.delete", new_callable=AsyncMock
+        ), patch(
+            "cache.two_tier_cache.redis_client.publish", new_callable=AsyncMock
+        ) as mock_publish:
+            await cache.set("key", "value", expire=10)
+            assert cache.local.get("key") == "value"
+
+            await cache.delete("key")
+            assert len(cache.local) == 0
+
+            assert mock_publish.call_count == 2
+            payload = json.loads(mock_publish.call_args.args[1])
+            assert payload == {
+                "origin": cache_invalidator.instance_id,
+                "keys": ["key"],
+                "prefix": None,
+            }
+
+    def test_remote_invalidation_drops_local_entry(self):
+        cache = TwoTierCache("test", max_size=10, local_ttl=60)
+        cache.local.set("key", "value")
+
+        cache.local.set("anime:1:en", "en")
+        cache.local.set("anime:1:ru", "ru")
+        cache.local.set("anime:2:en", "other")
+
+        cache_invalidator.invalidate_local(["key"], prefix="anime:1:")
+
+        assert list(cache.local._data) == ["anime:2:en"]
+
+    @pytest.mark.asyncio
+    async def test_mset_writes_once_and_publishes_once(self):
+        cache = TwoTierCache("test", max_size=10, local_ttl=60)
+        items = [("a", 1, 10), ("b", 2, 20)]
+
+        with patch(
+            "cache.two_tier_cache.redis_client.mset", new_callable=AsyncMock
+        ) as mock_mset, patch(
+            "cache.two_tier_cache.redis_client.publish", new_callable=AsyncMock
+        ) as mock_publish:
+            await cache.mset(items)
+
+            mock_mset.assert_called_once_with(items)
+            mock_publish.assert_called_once()
+            assert json.loads(mock_publish.call_args.args[1])["keys"] == ["a", "b"]
+            assert cache.local.get("a") == 1
+            assert cache.local.get("b") == 2
@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from common.caption_updates import (
+    schedule_caption_update,
+    set_caption_update_markup,
+)
+
+
+def make_message():
+    return SimpleNamespace(
+        chat=SimpleNamespace(id=1),
+        message_id=2,
+        edit_caption=AsyncMock(),
+    )
+
+
+class TestCaptionUpdates:
+    @pytest.mark.asyncio
+    async def test_pending_update_uses_latest_markup(self):
+        message = make_message()
+        caption_ready = asyncio.get_running_loop().create_future()
+
+        schedule_caption_update(message, caption_ready, reply_markup="old")
+        set_caption_update_markup(message, "new")
+        caption_ready.set_result("Translated")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        message.edit_caption.assert_awaited_once_with(
+            caption="Translated", parse_mode="HTML", reply_markup="new"
+        )
+
+    @pytest.mark.asyncio
+    async def test_markup_ignored_without_pending_update(self):
+        message = make_message()
+        caption_ready = asyncio.get_running_loop().create_future()
+        caption_ready.set_result("Translated")
+
+        set_caption_update_markup(message, "new")
+        schedule_caption_update(message, caption_ready, reply_markup="old")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        message.edit_caption.assert_awaited_once_with(
+            caption="Translated", parse_mode="HTML", reply_markup="old"
+        )
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiogram import types
+from aiogram.exceptions import TelegramBadRequest
+
+from common.cover_media import edit_cover_media
+
+
+def make_sent_message(file_id):
+    sent = MagicMock(spec=types.Message)
+    sent.photo = [SimpleNamespace(file_id="small"), SimpleNamespace(file_id=file_id)]
+    return sent
+
+
+class TestEditCoverMedia:
+    @pytest.mark.asyncio
+    async def test_reuses_cached_file_id(self):
+        message = SimpleNamespace(edit_media=AsyncMock())
+
+        with patch(
+            "common.cover_media.media_cache.get_file_id",
+            new_callable=AsyncMock,
+            return_value="cached-file-id",
+        ), patch(
+            "common.cover_media.media_cache.cache_file_id", new_callable=AsyncMock
+        ) as mock_cache_file_id:
+            await edit_cover_media(message, "cover.jpg", "Caption", "markup")
+
+        message.edit_media.assert_awaited_once()
+        media = message.edit_media.call_args.kwargs["media"]
+        assert media.media == "cached-file-id"
+        assert media.caption == "Caption"
+        assert message.edit_media.call_args.kwargs["reply_markup"] == "markup"
+        mock_cache_file_id.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rejected_file_id_falls_back_to_url(self):
+        message = SimpleNamespace(
+            edit_media=AsyncMock(
+                side_effect=[
+                    TelegramBadRequest(MagicMock(), "wrong file identifier"),
+                    make_sent_message("new-file-id"),
+                ]
+            )
+        )
+
+        with patch(
+            "common.cover_media.media_cache.get_file_id",
+            new_callable=AsyncMock,
+            return_value="stale-file-id",
+        ), patch(
+            "common.cover_media.media_cache.invalidate", new_callable=AsyncMock
+        ) as mock_invalidate, patch(
+            "common.cover_media.media_cache.cache_file_id", new_callable=AsyncMock
+        ) as mock_cache_file_id:
+            await edit_cover_media(message, "cover.jpg", "Caption")
+
+        sent_media = [
+            call.kwargs["media"].media for call in message.edit_media.call_args_list
+        ]
+        assert sent_media == ["stale-file-id", "cover.jpg"]
+        mock_invalidate.assert_awaited_once_with("cover.jpg")
+        mock_cache_file_id.assert_awaited_once_with("cover.jpg", "new-file-id")
+
+    @pytest.mark.asyncio
+    async def test_not_modified_is_not_retried_with_url(self):
+        message = SimpleNamespace(
+            edit_media=AsyncMock(
+                side_effect=TelegramBadRequest(MagicMock(), "message is not modified")
+            )
+        )
+
+        with patch(
+            "common.cover_media.media_cache.get_file_id",
+            new_callable=AsyncMock,
+            return_value="cached-file-id",
+        ), patch(
+            "common.cover_media.media_cache.invalidate", new_callable=AsyncMock
+        ) as mock_invalidate:
+            with pytest.raises(TelegramBadRequest):
+                await edit_cover_media(message, "cover.jpg", "Caption")
+
+        message.edit_media.assert_awaited_once()
+        mock_invalidate.assert_not_called()
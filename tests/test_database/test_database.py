@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+import database.database as database
+from database.database import InstrumentedPool, close_db_pool, get_db_pool
+from utils.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_pool():
+    database._db_pool = None
+    yield
+    database._db_pool = None
+
+
+def make_raw_pool(size=5, idle=3):
+    raw_pool = Mock()
+    raw_pool.acquire = AsyncMock(return_value="conn")
+    raw_pool.release = AsyncMock()
+    raw_pool.close = AsyncMock()
+    raw_pool.get_size.return_value = size
+    raw_pool.get_idle_size.return_value = idle
+    return raw_pool
+
+
+class TestGetDbPool:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_create_one_pool(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL_MAX_SIZE", "20")
+        monkeypatch.setenv("DB_STATEMENT_CACHE_SIZE", "0")
+
+        async def slow_create_pool(**kwargs):
+            await asyncio.sleep(0.01)
+            return make_raw_pool()
+
+        with patch(
+            "database.database.asyncpg.create_pool", side_effect=slow_create_pool
+        ) as mock_create:
+            pools = await asyncio.gather(*(get_db_pool() for _ in range(5)))
+
+            assert all(pool is pools[0] for pool in pools)
+            mock_create.assert_called_once()
+            kwargs = mock_create.call_args.kwargs
+            assert kwargs["max_size"] == 20
+            assert kwargs["statement_cache_size"] == 0
+            assert pools[0].max_size == 20
+
+    @pytest.mark.asyncio
+    async def test_close_db_pool(self):
+        raw_pool = make_raw_pool()
+        database._db_pool = InstrumentedPool(raw_pool, 5, 10)
+
+        await close_db_pool()
+
+        raw_pool.close.assert_called_once()
+        assert database._db_pool is None
+
+
+class TestInstrumentedPool:
+    @pytest.mark.asyncio
+    async def test_acquire_reports_saturation(self):
+        raw_pool = make_raw_pool(size=4, idle=2)
+        pool = InstrumentedPool(raw_pool, 5, 3)
+
+        async with pool.acquire() as conn:
+            assert conn == "conn"
+
+        raw_pool.acquire.assert_called_once_with(timeout=3)
+        raw_pool.release.assert_called_once_with("conn")
+        assert metrics.gauges["db_pool.in_use"] == 2
+        assert metrics.gauges["db_pool.saturation"] == 0.4
+        assert metrics.gauges["db_pool.waiting"] == 0
+        assert metrics.observations["db_pool.acquire_wait_seconds"]["count"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout_is_counted(self):
+        raw_pool = make_raw_pool()
+        raw_pool.acquire.side_effect = asyncio.TimeoutError
+        pool = InstrumentedPool(raw_pool, 5, 0.1)
+        timeouts = metrics.counters.get("db_pool.acquire_timeout", 0)
+
+        with pytest.raises(asyncio.TimeoutError):
+            async with pool.acquire():
+                pass
+
+        assert metrics.counters["db_pool.acquire_timeout"] == timeouts + 1
+        assert pool.waiting == 0
+        raw_pool.release.assert_not_called()
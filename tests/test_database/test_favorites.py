@@ -2,58 +2,16 @@ import pytest
 from unittest.mock import AsyncMock, Mock, patch
 
 from database.favorites import (
-    add_favorite_anime_user,
+    FOLLOWED_ANIME_PAGE_SIZE,
     get_favorite_anime_user,
     del_favorite_anime_user,
     clear_favorites_user,
-    is_favorite_anime_user,
-    get_anime_with_users
+    add_favorite_with_anime,
+    iter_anime_followers,
+    iter_followed_anime,
 )
 
 
-class TestAddFavoriteAnimeUser:
-    @pytest.mark.asyncio
-    async def test_add_favorite_success(self):
-        mock_conn = AsyncMock()
-        mock_pool = Mock()
-        mock_context = AsyncMock()
-        mock_context.__aenter__.return_value = mock_conn
-        mock_context.__aexit__.return_value = None
-        mock_pool.acquire.return_value = mock_context
-
-        with patch('database.favorites.get_db_pool', return_value=mock_pool), \
-             patch('database.favorites.logger') as mock_logger:
-
-            await add_favorite_anime_user(123, 456)
-
-            mock_conn.execute.assert_called_once_with(
-                """
-            INSERT INTO favorites (user_id, anime_id)
-            VALUES ($1, $2) ON CONFLICT (user_id, anime_id) DO NOTHING
-            """,
-                456,
-                123
-            )
-            mock_logger.info.assert_called_once_with("The anime 123 was saved to favorites list for user 456")
-
-    @pytest.mark.asyncio
-    async def test_add_favorite_duplicate(self):
-        mock_conn = AsyncMock()
-        mock_pool = Mock()
-        mock_context = AsyncMock()
-        mock_context.__aenter__.return_value = mock_conn
-        mock_context.__aexit__.return_value = None
-        mock_pool.acquire.return_value = mock_context
-
-        with patch('database.favorites.get_db_pool', return_value=mock_pool), \
-             patch('database.favorites.logger') as mock_logger:
-
-            await add_favorite_anime_user(789, 101112)
-
-            mock_conn.execute.assert_called_once()
-            mock_logger.info.assert_called_once()
-
-
 class TestGetFavoriteAnimeUser:
     @pytest.mark.asyncio
     async def test_get_favorites_with_results(self):
@@ -171,123 +129,184 @@ class TestClearFavoritesUser:
             mock_logger.info.assert_called_once_with("Cleared all favorites for user 123")
 
 
-class TestIsFavoriteAnimeUser:
+class TestAddFavoriteWithAnime:
+    anime_data = {
+        "title_original": "Test Anime",
+        "title_ru": "Тестовое аниме",
+        "id_anilist": 123,
+        "id_shikimori": 456,
+        "total_episodes_relase": 12,
+    }
+
     @pytest.mark.asyncio
-    async def test_is_favorite_exists(self):
+    async def test_added_in_one_statement(self):
         mock_conn = AsyncMock()
-        mock_conn.fetchrow.return_value = {"1": 1}
+        mock_conn.fetchrow.return_value = {"anime_id": 7, "added": True}
         mock_pool = Mock()
         mock_context = AsyncMock()
         mock_context.__aenter__.return_value = mock_conn
         mock_context.__aexit__.return_value = None
         mock_pool.acquire.return_value = mock_context
 
-        with patch('database.favorites.get_db_pool', return_value=mock_pool):
-            result = await is_favorite_anime_user(123, 456)
+        with patch("database.favorites.get_db_pool", return_value=mock_pool), patch(
+            "database.favorites.logger"
+        ):
+            result = await add_favorite_with_anime(self.anime_data, 42)
 
-            assert result is True
-            mock_conn.fetchrow.assert_called_once_with(
-                "SELECT 1 FROM favorites WHERE anime_id = $1 AND user_id = $2",
-                123,
-                456
-            )
+            assert result == (7, True)
+            mock_pool.acquire.assert_called_once()
+            mock_conn.fetchrow.assert_called_once()
+            mock_conn.execute.assert_not_called()
+            query, *args = mock_conn.fetchrow.call_args.args
+            assert "INSERT INTO anime" in query
+            assert "INSERT INTO favorites" in query
+            assert args == ["Test Anime", "Тестовое аниме", 123, 456, 12, 42]
 
     @pytest.mark.asyncio
-    async def test_is_favorite_not_exists(self):
+    async def test_already_present(self):
         mock_conn = AsyncMock()
-        mock_conn.fetchrow.return_value = None
+        mock_conn.fetchrow.return_value = {"anime_id": 7, "added": False}
         mock_pool = Mock()
         mock_context = AsyncMock()
         mock_context.__aenter__.return_value = mock_conn
         mock_context.__aexit__.return_value = None
         mock_pool.acquire.return_value = mock_context
 
-        with patch('database.favorites.get_db_pool', return_value=mock_pool):
-            result = await is_favorite_anime_user(999, 888)
+        with patch("database.favorites.get_db_pool", return_value=mock_pool), patch(
+            "database.favorites.logger"
+        ):
+            result = await add_favorite_with_anime(self.anime_data, 42)
+
+            assert result == (7, False)
 
-            assert result is False
 
+def make_anime_row(anime_id, anilist_id):
+    return {
+        "id": anime_id,
+        "id_anilist": anilist_id,
+        "id_shikimori": anime_id + 100,
+        "title_original": f"Test Anime {anime_id}",
+        "title_ru": f"Тестовое аниме {anime_id}",
+        "total_episodes_relase": 12,
+    }
 
-class TestGetAnimeWithUsers:
+
+class TestIterFollowedAnime:
     @pytest.mark.asyncio
-    async def test_get_anime_with_users_success(self):
-        mock_rows = [
-            {
-                "id": 1,
-                "id_anilist": 100,
-                "id_shikimori": 200,
-                "title_original": "Test Anime 1",
-                "title_ru": "Тестовое аниме 1",
-                "total_episodes_relase": 12,
-                "user_ids": [101, 102],
-                "user_languages": ["ru", "en"]
-            },
-            {
-                "id": 2,
-                "id_anilist": 101,
-                "id_shikimori": 201,
-                "title_original": "Test Anime 2",
-                "title_ru": "Тестовое аниме 2",
-                "total_episodes_relase": 24,
-                "user_ids": [103],
-                "user_languages": ["ru"]
-            }
+    async def test_followed_anime_are_paged_by_id(self):
+        mock_conn = AsyncMock()
+        mock_conn.fetch.side_effect = [
+            [make_anime_row(1, 100), make_anime_row(2, 101)],
+            [make_anime_row(5, 102)],
         ]
+        mock_pool = Mock()
+        mock_context = AsyncMock()
+        mock_context.__aenter__.return_value = mock_conn
+        mock_context.__aexit__.return_value = None
+        mock_pool.acquire.return_value = mock_context
 
-        expected_result = {
-            1: {
+        with patch("database.favorites.get_db_pool", return_value=mock_pool):
+            pages = [
+                page async for page in iter_followed_anime([100, 101, 102], page_size=2)
+            ]
+
+            assert [[anime["id"] for anime in page] for page in pages] == [[1, 2], [5]]
+            assert pages[0][0] == {
+                "id": 1,
                 "id_anilist": 100,
-                "id_shikimori": 200,
+                "id_shikimori": 101,
                 "title_original": "Test Anime 1",
                 "title_ru": "Тестовое аниме 1",
                 "current_episodes": 12,
-                "user_ids": [101, 102],
-                "user_languages": ["ru", "en"]
-            },
-            2: {
-                "id_anilist": 101,
-                "id_shikimori": 201,
-                "title_original": "Test Anime 2",
-                "title_ru": "Тестовое аниме 2",
-                "current_episodes": 24,
-                "user_ids": [103],
-                "user_languages": ["ru"]
             }
-        }
+            assert [c.args[1:] for c in mock_conn.fetch.call_args_list] == [
+                ([100, 101, 102], None, 2),
+                ([100, 101, 102], 2, 2),
+            ]
+            assert mock_pool.acquire.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_connection_released_before_page_is_processed(self):
         mock_conn = AsyncMock()
-        mock_conn.fetch.return_value = mock_rows
+        mock_conn.fetch.side_effect = [[make_anime_row(1, 100)], []]
         mock_pool = Mock()
         mock_context = AsyncMock()
         mock_context.__aenter__.return_value = mock_conn
         mock_context.__aexit__.return_value = None
         mock_pool.acquire.return_value = mock_context
 
-        with patch('database.favorites.get_db_pool', return_value=mock_pool), \
-             patch('database.favorites.logger') as mock_logger:
+        with patch("database.favorites.get_db_pool", return_value=mock_pool):
+            async for _ in iter_followed_anime(page_size=1):
+                assert (
+                    mock_context.__aexit__.await_count
+                    == mock_context.__aenter__.await_count
+                )
+
+    @pytest.mark.asyncio
+    async def test_no_followed_anime(self):
+        mock_conn = AsyncMock()
+        mock_conn.fetch.return_value = []
+        mock_pool = Mock()
+        mock_context = AsyncMock()
+        mock_context.__aenter__.return_value = mock_conn
+        mock_context.__aexit__.return_value = None
+        mock_pool.acquire.return_value = mock_context
 
-            result = await get_anime_with_users()
+        with patch("database.favorites.get_db_pool", return_value=mock_pool):
+            pages = [page async for page in iter_followed_anime()]
+
+            assert pages == []
+            assert mock_conn.fetch.call_args.args[1:] == (
+                None,
+                None,
+                FOLLOWED_ANIME_PAGE_SIZE,
+            )
 
-            assert result == expected_result
-            mock_logger.info.assert_called_once_with("Retrieved 2 anime with associated users")
 
+class TestIterAnimeFollowers:
     @pytest.mark.asyncio
-    async def test_get_anime_with_users_empty(self):
+    async def test_followers_are_paged_by_user_id(self):
         mock_conn = AsyncMock()
-        mock_conn.fetch.return_value = []
+        mock_conn.fetch.side_effect = [
+            [
+                {"user_id": 1, "user_language": "ru"},
+                {"user_id": 2, "user_language": "en"},
+            ],
+            [{"user_id": 3, "user_language": "ru"}],
+        ]
         mock_pool = Mock()
         mock_context = AsyncMock()
         mock_context.__aenter__.return_value = mock_conn
         mock_context.__aexit__.return_value = None
         mock_pool.acquire.return_value = mock_context
 
-        with patch('database.favorites.get_db_pool', return_value=mock_pool), \
-             patch('database.favorites.logger') as mock_logger:
+        with patch("database.favorites.get_db_pool", return_value=mock_pool):
+            pages = [page async for page in iter_anime_followers(7, page_size=2)]
+
+            assert pages == [[(1, "ru"), (2, "en")], [(3, "ru")]]
+            assert [c.args[1:] for c in mock_conn.fetch.call_args_list] == [
+                (7, None, 2),
+                (7, 2, 2),
+            ]
+
+    @pytest.mark.asyncio
+    async def test_full_last_page_stops_on_empty_page(self):
+        mock_conn = AsyncMock()
+        mock_conn.fetch.side_effect = [
+            [{"user_id": 1, "user_language": "ru"}],
+            [],
+        ]
+        mock_pool = Mock()
+        mock_context = AsyncMock()
+        mock_context.__aenter__.return_value = mock_conn
+        mock_context.__aexit__.return_value = None
+        mock_pool.acquire.return_value = mock_context
 
-            result = await get_anime_with_users()
+        with patch("database.favorites.get_db_pool", return_value=mock_pool):
+            pages = [page async for page in iter_anime_followers(7, page_size=1)]
 
-            assert result == {}
-            mock_logger.info.assert_called_once_with("Retrieved 0 anime with associated users")
+            assert pages == [[(1, "ru")]]
+            assert mock_conn.fetch.call_count == 2
 
 
 class TestDatabaseConnection:
@@ -295,7 +314,7 @@ class TestDatabaseConnection:
     async def test_database_connection_error(self):
         with patch('database.favorites.get_db_pool', side_effect=Exception("Database connection failed")):
             with pytest.raises(Exception, match="Database connection failed"):
-                await add_favorite_anime_user(1, 1)
+                await del_favorite_anime_user(1, 1)
 
     @pytest.mark.asyncio
     async def test_pool_acquire_error(self):
@@ -307,4 +326,4 @@ class TestDatabaseConnection:
 
         with patch('database.favorites.get_db_pool', return_value=mock_pool):
             with pytest.raises(Exception, match="Pool acquire failed"):
-                await is_favorite_anime_user(1, 1)
\ No newline at end of file
+                await clear_favorites_user(1)
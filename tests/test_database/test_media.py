@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from database.media import (
+    get_media_file_id,
+    save_media_file_id,
+    get_recent_media_file_ids,
+)
+
+
+def _mock_pool(mock_conn):
+    mock_pool = Mock()
+    mock_context = AsyncMock()
+    mock_context.__aenter__.return_value = mock_conn
+    mock_context.__aexit__.return_value = None
+    mock_pool.acquire.return_value = mock_context
+    return mock_pool
+
+
+class TestMediaFileIds:
+    @pytest.mark.asyncio
+    async def test_get_media_file_id(self):
+        mock_conn = AsyncMock()
+        mock_conn.fetchval.return_value = "file-id"
+
+        with patch("database.media.get_db_pool", return_value=_mock_pool(mock_conn)):
+            result = await get_media_file_id("https://example.com/cover.jpg")
+
+            assert result == "file-id"
+            mock_conn.fetchval.assert_called_once_with(
+                "SELECT file_id FROM telegram_media WHERE cover_url = $1",
+                "https://example.com/cover.jpg",
+            )
+
+    @pytest.mark.asyncio
+    async def test_save_media_file_id_upserts(self):
+        mock_conn = AsyncMock()
+
+        with patch("database.media.get_db_pool", return_value=_mock_pool(mock_conn)):
+            await save_media_file_id("https://example.com/cover.jpg", "file-id")
+
+            query, *args = mock_conn.execute.call_args.args
+            assert "ON CONFLICT (cover_url) DO UPDATE" in query
+            assert args == ["https://example.com/cover.jpg", "file-id"]
+
+    @pytest.mark.asyncio
+    async def test_get_recent_media_file_ids(self):
+        mock_conn = AsyncMock()
+        mock_conn.fetch.return_value = [
+            {"cover_url": "https://example.com/a.jpg", "file_id": "a"},
+        ]
+
+        with patch("database.media.get_db_pool", return_value=_mock_pool(mock_conn)):
+            result = await get_recent_media_file_ids(10)
+
+            assert result == [
+                {"cover_url": "https://example.com/a.jpg", "file_id": "a"}
+            ]
+            assert mock_conn.fetch.call_args.args[1] == 10
@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from handlers.search import handle_anime_search, handle_anime_view
+from middleware.user_context import UserContext
+
+
+def make_message(text):
+    message = MagicMock()
+    message.text = text
+    message.from_user.id = 5
+    message.from_user.username = "user"
+    message.answer = AsyncMock(return_value=MagicMock(delete=AsyncMock()))
+    return message
+
+
+class TestHandleAnimeSearch:
+    @pytest.mark.asyncio
+    async def test_failed_upstream_search_is_not_cached(self):
+        message = make_message("Naruto")
+
+        with patch(
+            "handlers.search.search_cache.get_cached_search_results",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "handlers.search.get_many_info_about_anime_from_shikimori",
+            new_callable=AsyncMock,
+            return_value={},
+        ), patch(
+            "handlers.search.search_cache.cache_search_results", new_callable=AsyncMock
+        ) as mock_cache, patch(
+            "handlers.search.search_cache.save_search_results", new_callable=AsyncMock
+        ) as mock_save:
+            await handle_anime_search(message, lang="en")
+
+        mock_cache.assert_not_called()
+        mock_save.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_search_is_cached(self):
+        message = make_message("Nothing")
+
+        with patch(
+            "handlers.search.search_cache.get_cached_search_results",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "handlers.search.get_many_info_about_anime_from_shikimori",
+            new_callable=AsyncMock,
+            return_value=[],
+        ), patch(
+            "handlers.search.search_cache.cache_search_results", new_callable=AsyncMock
+        ) as mock_cache:
+            await handle_anime_search(message, lang="en")
+
+        mock_cache.assert_called_once_with("Nothing", [])
+
+
+class TestHandleAnimeView:
+    @pytest.mark.asyncio
+    async def test_favorites_miss_fills_hash_instead_of_status_query(self):
+        callback = MagicMock()
+        callback.data = "view_anime:10"
+        callback.from_user.id = 5
+        callback.answer = AsyncMock()
+        row = {"anime_id": 1, "id_shikimori": 10}
+
+        with patch(
+            "handlers.search.get_caption_and_cover_image",
+            new_callable=AsyncMock,
+            return_value=("Caption", "cover.jpg", 100, {}, None),
+        ), patch("handlers.search.edit_cover_media", new_callable=AsyncMock), patch(
+            "handlers.search.get_user_favorites",
+            new_callable=AsyncMock,
+            return_value=[row],
+        ) as mock_favorites, patch(
+            "handlers.search.get_anime_menu_keyboard"
+        ) as mock_keyboard:
+            await handle_anime_view(
+                callback, lang="en", user_context=UserContext(5, "en")
+            )
+
+        mock_favorites.assert_called_once_with(5)
+        assert mock_keyboard.call_args.kwargs["is_favorite"] is True
+        assert mock_keyboard.call_args.kwargs["anime_id"] == 1
+
+    @pytest.mark.asyncio
+    async def test_loaded_context_answers_membership(self):
+        callback = MagicMock()
+        callback.data = "view_anime:10"
+        callback.from_user.id = 5
+        callback.answer = AsyncMock()
+
+        with patch(
+            "handlers.search.get_caption_and_cover_image",
+            new_callable=AsyncMock,
+            return_value=("Caption", "cover.jpg", 100, {}, None),
+        ), patch("handlers.search.edit_cover_media", new_callable=AsyncMock), patch(
+            "handlers.search.get_user_favorites", new_callable=AsyncMock
+        ) as mock_favorites, patch(
+            "handlers.search.get_anime_menu_keyboard"
+        ) as mock_keyboard:
+            await handle_anime_view(
+                callback, lang="en", user_context=UserContext(5, "en", {10: 1})
+            )
+
+        mock_favorites.assert_not_called()
+        assert mock_keyboard.call_args.kwargs["is_favorite"] is True
+        assert mock_keyboard.call_args.kwargs["anime_id"] == 1
@@ -0,0 +1,137 @@
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiogram.types import CallbackQuery
+
+from cache.redis_client import redis_client
+from middleware.antiflood import AntiFloodMiddleware
+from middleware.user_context import UserContext, UserContextMiddleware
+
+
+def fake_pipeline(results):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=results)
+
+    @asynccontextmanager
+    async def pipeline():
+        yield pipe
+
+    return pipe, pipeline
+
+
+class TestUserContextMiddleware:
+    @pytest.mark.asyncio
+    async def test_load_reads_context_in_one_pipeline(self):
+        favorite_ids = {
+            b"1": redis_client.encode(10),
+            b"__complete__": redis_client.encode(1),
+        }
+        pipe, pipeline = fake_pipeline([favorite_ids, True])
+
+        with patch("middleware.user_context.redis_client.pipeline", pipeline), patch(
+            "middleware.user_context.user_cache.get_user_language",
+            new_callable=AsyncMock,
+            return_value="ru",
+        ) as mock_language, patch(
+            "middleware.user_context.get_user_language_from_db",
+            new_callable=AsyncMock,
+        ) as mock_db:
+            context = await UserContextMiddleware(rate_limit=0.5).load(5)
+
+        assert context.lang == "ru"
+        assert context.favorite_ids == {10: 1}
+        assert context.favorite_anime_id(10) == 1
+        assert context.throttled is False
+        mock_language.assert_awaited_once_with(5)
+        pipe.hgetall.assert_called_once_with("favorites:ids:5")
+        pipe.set.assert_called_once_with("antiflood:5", 1, nx=True, px=500)
+        pipe.execute.assert_awaited_once()
+        mock_db.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_load_falls_back_to_database_language(self):
+        _, pipeline = fake_pipeline([{}, None])
+
+        with patch("middleware.user_context.redis_client.pipeline", pipeline), patch(
+            "middleware.user_context.user_cache.get_user_language",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "middleware.user_context.get_user_language_from_db",
+            new_callable=AsyncMock,
+            return_value="ru",
+        ), patch(
+            "middleware.user_context.user_cache.user_language", new_callable=AsyncMock
+        ) as mock_cache_language:
+            context = await UserContextMiddleware().load(5)
+
+        assert context.lang == "ru"
+        assert context.favorites_loaded is False
+        assert context.throttled is True
+        mock_cache_language.assert_awaited_once_with(5, "ru")
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_database_language(self):
+        middleware = UserContextMiddleware()
+        handler = AsyncMock(return_value="handled")
+        event = MagicMock()
+        event.from_user.id = 5
+        data = {}
+
+        with patch.object(
+            middleware, "load", AsyncMock(side_effect=ConnectionError("Redis down"))
+        ), patch(
+            "middleware.user_context.get_user_language_from_db",
+            new_callable=AsyncMock,
+            return_value="ru",
+        ):
+            assert await middleware(handler, event, data) == "handled"
+
+        assert data["lang"] == "ru"
+        assert data["user_context"].throttled is False
+        assert data["user_context"].favorites_loaded is False
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_throttles_in_process(self):
+        middleware = UserContextMiddleware(rate_limit=60)
+        handler = AsyncMock()
+        event = MagicMock()
+        event.from_user.id = 5
+        first, second = {}, {}
+
+        with patch.object(
+            middleware, "load", AsyncMock(side_effect=ConnectionError("Redis down"))
+        ), patch(
+            "middleware.user_context.get_user_language_from_db",
+            new_callable=AsyncMock,
+            return_value="ru",
+        ):
+            await middleware(handler, event, first)
+            await middleware(handler, event, second)
+
+        assert first["user_context"].throttled is False
+        assert second["user_context"].throttled is True
+
+
+class TestAntiFloodMiddleware:
+    @pytest.mark.asyncio
+    async def test_throttled_callback_is_answered_without_handler(self):
+        handler = AsyncMock()
+        event = MagicMock(spec=CallbackQuery)
+        event.answer = AsyncMock()
+        data = {"user_context": UserContext(5, "en", throttled=True)}
+
+        await AntiFloodMiddleware()(handler, event, data)
+
+        handler.assert_not_called()
+        event.answer.assert_awaited_once()
+        assert event.answer.call_args.kwargs["show_alert"] is True
+
+    @pytest.mark.asyncio
+    async def test_allowed_callback_reaches_handler(self):
+        handler = AsyncMock(return_value="handled")
+        event = MagicMock(spec=CallbackQuery)
+        data = {"user_context": UserContext(5, "en")}
+
+        assert await AntiFloodMiddleware()(handler, event, data) == "handled"
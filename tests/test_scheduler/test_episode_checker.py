@@ -0,0 +1,163 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from api.anilist import ANILIST_PAGE_SIZE
+from scheduler.episode_checker import (
+    LAST_RUN_KEY,
+    check_new_episodes,
+    check_new_episodes_from_airing_feed,
+)
+
+
+def make_anime(anime_id, anilist_id):
+    return {
+        "id": anime_id,
+        "id_anilist": anilist_id,
+        "id_shikimori": anime_id + 100,
+        "title_original": f"Anime {anime_id}",
+        "title_ru": f"Аниме {anime_id}",
+        "current_episodes": 1,
+    }
+
+
+def fake_followed_anime(pages, events=None):
+    calls = []
+
+    async def iter_followed_anime(anilist_ids=None, page_size=None):
+        calls.append((anilist_ids, page_size))
+        for page in pages:
+            if events is not None:
+                events.append("page")
+            yield page
+
+    return iter_followed_anime, calls
+
+
+class TestCheckNewEpisodes:
+    @pytest.mark.asyncio
+    async def test_each_page_is_checked_before_the_next_is_fetched(self):
+        bot = AsyncMock()
+        first, missing, second = (
+            make_anime(1, 100),
+            make_anime(2, None),
+            make_anime(3, 102),
+        )
+        events = []
+        iter_followed_anime, calls = fake_followed_anime(
+            [[first, missing], [second]], events
+        )
+
+        with patch(
+            "scheduler.episode_checker.iter_followed_anime", iter_followed_anime
+        ), patch(
+            "scheduler.episode_checker._check_anime_batch",
+            new_callable=AsyncMock,
+            side_effect=lambda *args: events.append("batch"),
+        ) as mock_batch:
+            await check_new_episodes(bot)
+
+        assert calls == [(None, ANILIST_PAGE_SIZE)]
+        assert events == ["page", "batch", "page", "batch"]
+        assert [c.args[1:3] for c in mock_batch.call_args_list] == [
+            ([first], 1),
+            ([second], 2),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_page_without_anilist_ids_is_skipped(self):
+        iter_followed_anime, _ = fake_followed_anime([[make_anime(1, None)]])
+
+        with patch(
+            "scheduler.episode_checker.iter_followed_anime", iter_followed_anime
+        ), patch(
+            "scheduler.episode_checker._check_anime_batch", new_callable=AsyncMock
+        ) as mock_batch:
+            await check_new_episodes(AsyncMock())
+
+        mock_batch.assert_not_called()
+
+
+class TestCheckNewEpisodesFromAiringFeed:
+    @pytest.mark.asyncio
+    async def test_truncated_feed_runs_full_check(self):
+        bot = AsyncMock()
+
+        with patch(
+            "scheduler.episode_checker.redis_client.get",
+            new_callable=AsyncMock,
+            return_value=1000,
+        ), patch(
+            "scheduler.episode_checker.redis_client.set", new_callable=AsyncMock
+        ) as mock_set, patch(
+            "scheduler.episode_checker.get_airing_schedules",
+            new_callable=AsyncMock,
+            return_value=([{"mediaId": 1, "episode": 2, "airingAt": 1500}], True),
+        ), patch(
+            "scheduler.episode_checker.check_new_episodes", new_callable=AsyncMock
+        ) as mock_full_check:
+            await check_new_episodes_from_airing_feed(bot)
+
+            mock_full_check.assert_called_once_with(bot)
+            mock_set.assert_called_once()
+            assert mock_set.call_args.args[0] == LAST_RUN_KEY
+
+    @pytest.mark.asyncio
+    async def test_failed_feed_keeps_last_run(self):
+        with patch(
+            "scheduler.episode_checker.redis_client.get",
+            new_callable=AsyncMock,
+            return_value=1000,
+        ), patch(
+            "scheduler.episode_checker.redis_client.set", new_callable=AsyncMock
+        ) as mock_set, patch(
+            "scheduler.episode_checker.get_airing_schedules",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("AniList down"),
+        ):
+            await check_new_episodes_from_airing_feed(AsyncMock())
+
+            mock_set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_aired_anime_are_checked_page_by_page(self):
+        bot = AsyncMock()
+        first, second = make_anime(1, 100), make_anime(2, 200)
+        iter_followed_anime, calls = fake_followed_anime([[first], [second]])
+        schedules = [
+            {"mediaId": 100, "episode": 3, "airingAt": 1500},
+            {"mediaId": 200, "episode": 7, "airingAt": 1600},
+            {"mediaId": 300, "episode": 1, "airingAt": 1700},
+        ]
+
+        with patch(
+            "scheduler.episode_checker.redis_client.get",
+            new_callable=AsyncMock,
+            return_value=1000,
+        ), patch(
+            "scheduler.episode_checker.redis_client.set", new_callable=AsyncMock
+        ) as mock_set, patch(
+            "scheduler.episode_checker.get_airing_schedules",
+            new_callable=AsyncMock,
+            return_value=(schedules, False),
+        ), patch(
+            "scheduler.episode_checker.iter_followed_anime", iter_followed_anime
+        ), patch(
+            "scheduler.episode_checker._check_anime_for_updates_cached",
+            new_callable=AsyncMock,
+        ) as mock_check:
+            await check_new_episodes_from_airing_feed(bot)
+
+        assert calls == [([100, 200, 300], ANILIST_PAGE_SIZE)]
+        assert [c.args[1:4] for c in mock_check.call_args_list] == [
+            (
+                1,
+                first,
+                {"airingSchedule": {"nodes": [{"episode": 3, "airingAt": 1500}]}},
+            ),
+            (
+                2,
+                second,
+                {"airingSchedule": {"nodes": [{"episode": 7, "airingAt": 1600}]}},
+            ),
+        ]
+        assert mock_set.call_args.args[0] == LAST_RUN_KEY
@@ -0,0 +1,26 @@
+from unittest.mock import MagicMock, patch
+
+from scheduler import start_scheduler
+from utils.metrics import metrics
+
+
+class TestStartScheduler:
+    def test_metrics_snapshot_is_exported_periodically(self):
+        with patch("scheduler.AsyncIOScheduler") as mock_scheduler, patch.dict(
+            "os.environ", {"METRICS_LOG_INTERVAL": "30"}
+        ):
+            start_scheduler(MagicMock())
+
+        jobs = mock_scheduler.return_value.add_job.call_args_list
+        metrics_jobs = [job for job in jobs if job.args[0] == metrics.log_snapshot]
+        assert len(metrics_jobs) == 1
+        assert metrics_jobs[0].kwargs["seconds"] == 30
+
+    def test_metrics_export_can_be_disabled(self):
+        with patch("scheduler.AsyncIOScheduler") as mock_scheduler, patch.dict(
+            "os.environ", {"METRICS_LOG_INTERVAL": "0"}
+        ):
+            start_scheduler(MagicMock())
+
+        jobs = mock_scheduler.return_value.add_job.call_args_list
+        assert all(job.args[0] != metrics.log_snapshot for job in jobs)
@@ -1,3 +1,5 @@
+import asyncio
+import time
 import pytest
 from unittest.mock import AsyncMock, patch
 
@@ -6,7 +8,13 @@ from services.anime_service import filter_top_anime, get_caption_and_cover_image
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
-from services.anime_service import filter_top_anime, get_caption_and_cover_image
+from api.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from cache.anime_cache import anime_cache
+from services.anime_service import (
+    filter_top_anime,
+    get_caption_and_cover_image,
+    _pending_refreshes,
+)
 
 
 class TestFilterTopAnime:
@@ -78,79 +86,300 @@ class TestFilterTopAnime:
         assert any(anime["name"] == "UPPERCASE" for anime in filtered)
 
 
+@pytest.fixture(autouse=True)
+def mock_build_lock():
+    anime_cache.captions.clear()
+    with patch(
+        "services.anime_service.anime_build_lock.acquire",
+        new_callable=AsyncMock,
+        return_value="token",
+    ) as mock_acquire, patch(
+        "services.anime_service.anime_build_lock.release", new_callable=AsyncMock
+    ):
+        yield mock_acquire
+
+
+def called_priorities(mock):
+    return [call.kwargs["priority"]() for call in mock.call_args_list]
+
+
+def make_cached_data(**overrides):
+    cached_data = {
+        "record": {
+            "shikimori": {
+                "id": 456,
+                "name": "Test",
+                "russian": "Тест",
+                "description": "",
+            },
+            "anilist": {"id": 123, "description": "English description"},
+        },
+        "cover_image": "test_image.jpg",
+        "anilist_id": 123,
+        "shikimori_id": 456,
+        "raw_data_db": {"title": "Test"},
+        "cached_at": 1000.0,
+        "fresh_until": time.time() + 3600,
+    }
+    cached_data.update(overrides)
+    return cached_data
+
+
 class TestGetCaptionAndCoverImage:
     @pytest.mark.asyncio
     async def test_get_with_cached_data(self):
-        mock_cached_data = {
-            "caption": "Test Caption",
-            "cover_image": "test_image.jpg",
-            "anilist_id": 123,
-            "raw_data_db": {"title": "Test"}
-        }
-
-        with patch('services.anime_service.anime_cache.get_cached_anime', new_callable=AsyncMock) as mock_cache:
-            mock_cache.return_value = mock_cached_data
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+        ) as mock_cache, patch(
+            "services.anime_service.format_anime_caption", new_callable=AsyncMock
+        ) as mock_format:
+            mock_cache.return_value = make_cached_data()
+            mock_format.return_value = ("Test Caption", "test_image.jpg", {})
 
-            caption, cover_image, anilist_id, raw_data_db = await get_caption_and_cover_image(456, "en")
+            caption, cover_image, anilist_id, raw_data_db, _ = (
+                await get_caption_and_cover_image(456, "en")
+            )
 
             assert caption == "Test Caption"
             assert cover_image == "test_image.jpg"
             assert anilist_id == 123
             assert raw_data_db == {"title": "Test"}
-            mock_cache.assert_called_once_with(456, "en")
+            mock_cache.assert_called_once_with(456)
+
+    @pytest.mark.asyncio
+    async def test_rendered_caption_reused_per_language(self):
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+        ) as mock_cache, patch(
+            "services.anime_service.cached_translation",
+            new_callable=AsyncMock,
+            return_value="Описание",
+        ) as mock_cached_translation, patch(
+            "services.anime_service.format_anime_caption", new_callable=AsyncMock
+        ) as mock_format:
+            mock_cache.return_value = make_cached_data()
+            mock_format.side_effect = lambda anime_info, lang, **kwargs: (
+                f"Caption {lang}",
+                "test_image.jpg",
+                {},
+            )
+
+            for _ in range(3):
+                assert (await get_caption_and_cover_image(456, "en"))[0] == "Caption en"
+                assert (await get_caption_and_cover_image(456, "ru"))[0] == "Caption ru"
+
+            assert [c.kwargs["lang"] for c in mock_format.call_args_list] == [
+                "en",
+                "ru",
+            ]
+            assert (
+                mock_format.call_args_list[1].kwargs["translated_description"]
+                == "Описание"
+            )
+            mock_cached_translation.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_rebuilt_record_is_rendered_again(self):
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+        ) as mock_cache, patch(
+            "services.anime_service.format_anime_caption", new_callable=AsyncMock
+        ) as mock_format:
+            mock_format.return_value = ("Caption", "test_image.jpg", {})
+            mock_cache.return_value = make_cached_data()
+            await get_caption_and_cover_image(456, "en")
+            mock_cache.return_value = make_cached_data(cached_at=2000.0)
+            await get_caption_and_cover_image(456, "en")
+
+            assert mock_format.call_count == 2
 
     @pytest.mark.asyncio
     async def test_get_without_cached_data(self):
-        mock_shikimori_data = {"myanimelist_id": 789}
+        mock_shikimori_data = {"id": 456, "myanimelist_id": 789, "russian": "Тест"}
         mock_anilist_data = {"data": {"Media": {"id": 123}}}
 
-        with patch('services.anime_service.anime_cache.get_cached_anime', new_callable=AsyncMock) as mock_get_cache, \
-                patch('services.anime_service.get_info_about_anime_from_shikimori_by_id',
-                      new_callable=AsyncMock) as mock_shiki, \
-                patch('services.anime_service.get_info_about_anime_from_anilist_by_mal_id',
-                      new_callable=AsyncMock) as mock_anilist, \
-                patch('services.anime_service.AnimeInfo') as mock_anime_info, \
-                patch('services.anime_service.format_anime_caption', new_callable=AsyncMock) as mock_format, \
-                patch('services.anime_service.anime_cache.cache_anime', new_callable=AsyncMock) as mock_cache_set:
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+        ) as mock_get_cache, patch(
+            "services.anime_service.get_info_about_anime_from_shikimori_by_id",
+            new_callable=AsyncMock,
+        ) as mock_shiki, patch(
+            "services.anime_service.get_info_about_anime_from_anilist_by_mal_id",
+            new_callable=AsyncMock,
+        ) as mock_anilist, patch(
+            "services.anime_service.format_anime_caption", new_callable=AsyncMock
+        ) as mock_format, patch(
+            "services.anime_service.anime_cache.cache_anime",
+            new_callable=AsyncMock,
+            return_value=True,
+        ) as mock_cache_set:
             mock_get_cache.return_value = None
             mock_shiki.return_value = mock_shikimori_data
             mock_anilist.return_value = mock_anilist_data
-            mock_format.return_value = ("New Caption", "new_image.jpg", {"title": "New"})
+            mock_format.return_value = ("New Caption", "new_image.jpg", {})
 
-            caption, cover_image, anilist_id, raw_data_db = await get_caption_and_cover_image(456, "ru")
+            caption, cover_image, anilist_id, raw_data_db, _ = (
+                await get_caption_and_cover_image(456, "ru")
+            )
 
             assert caption == "New Caption"
-            assert cover_image == "new_image.jpg"
             assert anilist_id == 123
-            assert raw_data_db == {"title": "New"}
 
-            mock_shiki.assert_called_once_with(456)
-            mock_anilist.assert_called_once_with(789)
+            assert [c.args for c in mock_shiki.call_args_list] == [(456,)]
+            assert called_priorities(mock_shiki) == [PRIORITY_INTERACTIVE]
+            assert [c.args for c in mock_anilist.call_args_list] == [(456,), (789,)]
             mock_cache_set.assert_called_once()
+            cached_data = mock_cache_set.call_args.args[1]
+            assert cached_data["record"]["shikimori"] == {"id": 456, "russian": "Тест"}
+            assert cached_data["record"]["anilist"] == {"id": 123}
+            assert cached_data["anilist_id"] == 123
+            assert cover_image == cached_data["cover_image"]
+
+    @pytest.mark.asyncio
+    async def test_get_without_cached_data_matching_mal_id(self):
+        mock_shikimori_data = {"myanimelist_id": 456}
+        mock_anilist_data = {"data": {"Media": {"id": 123}}}
+
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+        ) as mock_get_cache, patch(
+            "services.anime_service.get_info_about_anime_from_shikimori_by_id",
+            new_callable=AsyncMock,
+        ) as mock_shiki, patch(
+            "services.anime_service.get_info_about_anime_from_anilist_by_mal_id",
+            new_callable=AsyncMock,
+        ) as mock_anilist, patch(
+            "services.anime_service.format_anime_caption", new_callable=AsyncMock
+        ) as mock_format, patch(
+            "services.anime_service.anime_cache.cache_anime",
+            new_callable=AsyncMock,
+            return_value=True,
+        ) as mock_cache_set:
+            mock_get_cache.return_value = None
+            mock_shiki.return_value = mock_shikimori_data
+            mock_anilist.return_value = mock_anilist_data
+            mock_format.return_value = ("Caption", "image.jpg", {})
+
+            await get_caption_and_cover_image(456, "en")
+
+            assert [c.args for c in mock_shiki.call_args_list] == [(456,)]
+            assert called_priorities(mock_shiki) == [PRIORITY_INTERACTIVE]
+            assert [c.args for c in mock_anilist.call_args_list] == [(456,)]
+            assert called_priorities(mock_anilist) == [PRIORITY_INTERACTIVE]
+            assert mock_cache_set.call_args.args[1]["anilist_id"] == 123
 
     @pytest.mark.asyncio
     async def test_get_with_missing_mal_id(self):
         mock_shikimori_data = {}
         mock_anilist_data = {"data": {"Media": {"id": None}}}
 
-        with patch('services.anime_service.anime_cache.get_cached_anime', new_callable=AsyncMock) as mock_get_cache, \
-                patch('services.anime_service.get_info_about_anime_from_shikimori_by_id',
-                      new_callable=AsyncMock) as mock_shiki, \
-                patch('services.anime_service.get_info_about_anime_from_anilist_by_mal_id',
-                      new_callable=AsyncMock) as mock_anilist, \
-                patch('services.anime_service.AnimeInfo') as mock_anime_info, \
-                patch('services.anime_service.format_anime_caption', new_callable=AsyncMock) as mock_format, \
-                patch('services.anime_service.anime_cache.cache_anime', new_callable=AsyncMock) as mock_cache_set:
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+        ) as mock_get_cache, patch(
+            "services.anime_service.get_info_about_anime_from_shikimori_by_id",
+            new_callable=AsyncMock,
+        ) as mock_shiki, patch(
+            "services.anime_service.get_info_about_anime_from_anilist_by_mal_id",
+            new_callable=AsyncMock,
+        ) as mock_anilist, patch(
+            "services.anime_service.format_anime_caption", new_callable=AsyncMock
+        ) as mock_format, patch(
+            "services.anime_service.anime_cache.cache_anime",
+            new_callable=AsyncMock,
+            return_value=True,
+        ) as mock_cache_set:
             mock_get_cache.return_value = None
             mock_shiki.return_value = mock_shikimori_data
             mock_anilist.return_value = mock_anilist_data
             mock_format.return_value = ("Caption", "image.jpg", {})
 
-            caption, cover_image, anilist_id, raw_data_db = await get_caption_and_cover_image(456, "en")
+            _, _, anilist_id, _, _ = await get_caption_and_cover_image(456, "en")
 
-            mock_anilist.assert_called_once_with("")
+            assert [c.args for c in mock_anilist.call_args_list] == [(456,)]
+            assert called_priorities(mock_anilist) == [PRIORITY_INTERACTIVE]
+            assert mock_cache_set.call_args.args[1]["anilist_id"] is None
             assert anilist_id is None
 
+    @pytest.mark.asyncio
+    async def test_cache_write_failure_still_serves_data(self):
+        mock_shikimori_data = {"myanimelist_id": 456}
+        mock_anilist_data = {"data": {"Media": {"id": 123}}}
+
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+        ) as mock_get_cache, patch(
+            "services.anime_service.get_info_about_anime_from_shikimori_by_id",
+            new_callable=AsyncMock,
+            return_value=mock_shikimori_data,
+        ), patch(
+            "services.anime_service.get_info_about_anime_from_anilist_by_mal_id",
+            new_callable=AsyncMock,
+            return_value=mock_anilist_data,
+        ), patch(
+            "services.anime_service.format_anime_caption", new_callable=AsyncMock
+        ) as mock_format, patch(
+            "services.anime_service.anime_cache.cache_anime",
+            new_callable=AsyncMock,
+            return_value=False,
+        ) as mock_cache_set:
+            mock_get_cache.return_value = None
+            mock_format.return_value = ("Caption", "image.jpg", {})
+
+            caption, _, anilist_id, _, _ = await get_caption_and_cover_image(456, "en")
+
+            assert caption == "Caption"
+            assert anilist_id == 123
+            mock_cache_set.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_translation_runs_in_background(self):
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+        ) as mock_get_cache, patch(
+            "services.anime_service.cached_translation",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "services.anime_service.format_anime_caption", new_callable=AsyncMock
+        ) as mock_format:
+            mock_get_cache.return_value = make_cached_data()
+            translation_ready = asyncio.Event()
+
+            async def format_caption(
+                anime_info, lang, translate=True, translated_description=None
+            ):
+                if not translate:
+                    return ("Original Caption", "image.jpg", {})
+                await translation_ready.wait()
+                return ("Translated Caption", "image.jpg", {})
+
+            mock_format.side_effect = format_caption
+
+            caption, _, _, _, pending = await get_caption_and_cover_image(456, "ru")
+
+            assert caption == "Original Caption"
+            assert mock_format.call_args_list[0].kwargs["translate"] is False
+            assert pending is not None
+
+            _, _, _, _, joined = await get_caption_and_cover_image(456, "ru")
+            assert joined is pending
+
+            translation_ready.set()
+            assert await pending == "Translated Caption"
+
+            caption, _, _, _, pending = await get_caption_and_cover_image(456, "ru")
+            assert caption == "Translated Caption"
+            assert pending is None
+            assert mock_format.call_count == 3
+
     @pytest.mark.asyncio
     async def test_exception_handling(self):
         with patch('services.anime_service.anime_cache.get_cached_anime', new_callable=AsyncMock) as mock_cache:
@@ -160,14 +389,157 @@ class TestGetCaptionAndCoverImage:
                 await get_caption_and_cover_image(456, "en")
 
     @pytest.mark.asyncio
-    async def test_default_language(self):
-        with patch('services.anime_service.anime_cache.get_cached_anime', new_callable=AsyncMock) as mock_cache:
-            mock_cache.return_value = {
-                "caption": "Test",
-                "cover_image": "test.jpg",
-                "anilist_id": 123,
-                "raw_data_db": {}
-            }
+    async def test_stale_data_served_and_refreshed_once(self):
+        stale_data = make_cached_data(cover_image="old.jpg", fresh_until=0)
 
-            await get_caption_and_cover_image(456, "en")
-            mock_cache.assert_called_once_with(456, "en")
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+        ) as mock_get_cache, patch(
+            "services.anime_service.format_anime_caption", new_callable=AsyncMock
+        ) as mock_format, patch(
+            "services.anime_service._build_anime_data", new_callable=AsyncMock
+        ) as mock_build, patch(
+            "services.anime_service.media_cache.invalidate", new_callable=AsyncMock
+        ) as mock_invalidate:
+            mock_get_cache.return_value = stale_data
+            mock_format.return_value = ("Old Caption", "old.jpg", {})
+            mock_build.return_value = make_cached_data(cover_image="new.jpg")
+
+            first = await get_caption_and_cover_image(456, "en")
+            second = await get_caption_and_cover_image(456, "en")
+            refresh = _pending_refreshes[456]
+            await refresh
+
+            assert (
+                first
+                == second
+                == ("Old Caption", "old.jpg", 123, {"title": "Test"}, None)
+            )
+            mock_build.assert_called_once_with(456, PRIORITY_BACKGROUND)
+            mock_invalidate.assert_called_once_with("old.jpg")
+            assert 456 not in _pending_refreshes
+
+    @pytest.mark.asyncio
+    async def test_waits_for_build_on_another_worker(self, mock_build_lock):
+        mock_build_lock.return_value = None
+
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "services.anime_service.anime_build_lock.wait_for",
+            new_callable=AsyncMock,
+            return_value=make_cached_data(),
+        ) as mock_wait, patch(
+            "services.anime_service.format_anime_caption",
+            new_callable=AsyncMock,
+            return_value=("Built Caption", "test_image.jpg", {}),
+        ), patch(
+            "services.anime_service._build_anime_data", new_callable=AsyncMock
+        ) as mock_build:
+            result = await get_caption_and_cover_image(456, "en")
+
+            assert result == (
+                "Built Caption",
+                "test_image.jpg",
+                123,
+                {"title": "Test"},
+                None,
+            )
+            mock_wait.assert_called_once()
+            mock_build.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_builds_itself_when_wait_for_other_worker_times_out(
+        self, mock_build_lock
+    ):
+        mock_build_lock.side_effect = [None, "token"]
+
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "services.anime_service.anime_build_lock.wait_for",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "services.anime_service.format_anime_caption",
+            new_callable=AsyncMock,
+            return_value=("Built Caption", "test_image.jpg", {}),
+        ), patch(
+            "services.anime_service._build_anime_data",
+            new_callable=AsyncMock,
+            return_value=make_cached_data(),
+        ) as mock_build:
+            result = await get_caption_and_cover_image(456, "en")
+
+            assert result[0] == "Built Caption"
+            assert mock_build_lock.await_count == 2
+            mock_build.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_build_once(self):
+        async def slow_build(*args):
+            await asyncio.sleep(0.01)
+            return make_cached_data()
+
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "services.anime_service.format_anime_caption",
+            new_callable=AsyncMock,
+            return_value=("Caption", "test_image.jpg", {}),
+        ), patch(
+            "services.anime_service._build_anime_data", side_effect=slow_build
+        ) as mock_build:
+            results = await asyncio.gather(
+                *(get_caption_and_cover_image(456, "en") for _ in range(5))
+            )
+
+            assert all(result[0] == "Caption" for result in results)
+            mock_build.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_interactive_caller_joins_background_build_and_raises_priority(
+        self,
+    ):
+        background_started = asyncio.Event()
+        release_background = asyncio.Event()
+        priorities = []
+
+        async def build(shikimori_id, priority):
+            priorities.append(priority())
+            background_started.set()
+            await release_background.wait()
+            priorities.append(priority())
+            return make_cached_data()
+
+        with patch(
+            "services.anime_service.anime_cache.get_cached_anime",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "services.anime_service.format_anime_caption",
+            new_callable=AsyncMock,
+            return_value=("Caption", "test_image.jpg", {}),
+        ), patch(
+            "services.anime_service._build_anime_data", side_effect=build
+        ) as mock_build:
+            background = asyncio.create_task(
+                get_caption_and_cover_image(456, "en", priority=PRIORITY_BACKGROUND)
+            )
+            await background_started.wait()
+            interactive = asyncio.create_task(get_caption_and_cover_image(456, "en"))
+            await asyncio.sleep(0)
+            release_background.set()
+
+            results = await asyncio.gather(background, interactive)
+
+            assert [result[0] for result in results] == ["Caption", "Caption"]
+            mock_build.assert_called_once()
+            assert priorities == [PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE]
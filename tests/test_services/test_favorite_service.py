@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 
-from services.favorite_service import formating_data_to_db
+from services.favorite_service import formating_data_to_db, get_user_favorites
 
 
 class TestFormatingDataToDb:
@@ -20,7 +20,7 @@ class TestFormatingDataToDb:
                    new_callable=AsyncMock) as mock_get_cache:
             mock_get_cache.return_value = mock_cached_anime
 
-            result = await formating_data_to_db(456, 123, "ru")
+            result = await formating_data_to_db(456, 123)
 
             expected = {
                 "title_original": "Test Anime",
@@ -31,7 +31,7 @@ class TestFormatingDataToDb:
             }
 
             assert result == expected
-            mock_get_cache.assert_called_once_with(456, "ru")
+            mock_get_cache.assert_called_once_with(456)
 
     @pytest.mark.asyncio
     async def test_format_with_partial_data(self):
@@ -69,7 +69,7 @@ class TestFormatingDataToDb:
             result = await formating_data_to_db(123, 456)
 
             assert result is None
-            mock_get_cache.assert_called_once_with(123, "en")
+            mock_get_cache.assert_called_once_with(123)
 
     @pytest.mark.asyncio
     async def test_format_cached_without_raw_data(self):
@@ -119,4 +119,77 @@ class TestFormatingDataToDb:
 
             await formating_data_to_db(100, 200)
 
-            mock_get_cache.assert_called_once_with(100, "en")
\ No newline at end of file
+            mock_get_cache.assert_called_once_with(100)
+
+
+ROW = {
+    "anime_id": 1,
+    "anime_title": "A",
+    "title_ru": "А",
+    "id_shikimori": 10,
+    "id_anilist": 100,
+}
+
+
+class TestGetUserFavorites:
+    @pytest.mark.asyncio
+    async def test_cached_empty_list_skips_database(self):
+        with patch(
+            "services.favorite_service.favorite_cache.get_cached_user_favorites",
+            new_callable=AsyncMock,
+            return_value=[],
+        ), patch(
+            "services.favorite_service.get_favorite_anime_user", new_callable=AsyncMock
+        ) as mock_db:
+            assert await get_user_favorites(5) == []
+
+        mock_db.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_fills_hash(self):
+        with patch(
+            "services.favorite_service.favorite_cache.get_cached_user_favorites",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "services.favorite_service.get_favorite_anime_user",
+            new_callable=AsyncMock,
+            return_value=[ROW],
+        ), patch(
+            "services.favorite_service.favorite_cache.cache_user_favorites",
+            new_callable=AsyncMock,
+        ) as mock_cache:
+            assert await get_user_favorites(5) == [ROW]
+
+        mock_cache.assert_called_once_with(5, [ROW])
+
+    @pytest.mark.asyncio
+    async def test_empty_favorites_are_cached(self):
+        with patch(
+            "services.favorite_service.favorite_cache.get_cached_user_favorites",
+            new_callable=AsyncMock,
+            return_value=None,
+        ), patch(
+            "services.favorite_service.get_favorite_anime_user",
+            new_callable=AsyncMock,
+            return_value=[],
+        ), patch(
+            "services.favorite_service.favorite_cache.cache_user_favorites",
+            new_callable=AsyncMock,
+        ) as mock_cache:
+            assert await get_user_favorites(5) == []
+
+        mock_cache.assert_called_once_with(5, [])
+
+    @pytest.mark.asyncio
+    async def test_reads_cached_hash(self):
+        with patch(
+            "services.favorite_service.favorite_cache.get_cached_user_favorites",
+            new_callable=AsyncMock,
+            return_value=[ROW],
+        ), patch(
+            "services.favorite_service.get_favorite_anime_user", new_callable=AsyncMock
+        ) as mock_db:
+            assert await get_user_favorites(5) == [ROW]
+
+        mock_db.assert_not_called()
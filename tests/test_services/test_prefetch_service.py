@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from api.rate_limiter import PRIORITY_BACKGROUND
+from services.prefetch_service import AnimePrefetcher
+
+
+class TestAnimePrefetcher:
+    @pytest.mark.asyncio
+    async def test_prefetch_top_k_skips_cached(self):
+        prefetcher = AnimePrefetcher()
+        prefetcher.top_k = 2
+        results = [{"id": 1}, {"id": 2}, {"id": 3}]
+
+        with patch(
+            "services.prefetch_service.anime_cache.get_many_cached_anime",
+            new_callable=AsyncMock,
+        ) as mock_get_cache, patch(
+            "services.prefetch_service.get_caption_and_cover_image",
+            new_callable=AsyncMock,
+        ) as mock_build:
+            mock_get_cache.return_value = {1: {"caption": "cached"}}
+
+            prefetcher.schedule(100, results, "ru")
+            await prefetcher._tasks[100]
+
+            mock_get_cache.assert_called_once_with([1, 2])
+            mock_build.assert_called_once_with(
+                2, lang="ru", priority=PRIORITY_BACKGROUND
+            )
+            assert 100 not in prefetcher._tasks
+
+    @pytest.mark.asyncio
+    async def test_new_schedule_cancels_previous(self):
+        prefetcher = AnimePrefetcher()
+        started = asyncio.Event()
+
+        async def slow_build(*args, **kwargs):
+            started.set()
+            await asyncio.sleep(10)
+
+        with patch(
+            "services.prefetch_service.anime_cache.get_many_cached_anime",
+            new_callable=AsyncMock,
+            return_value={},
+        ), patch(
+            "services.prefetch_service.get_caption_and_cover_image",
+            side_effect=slow_build,
+        ):
+            prefetcher.schedule(100, [{"id": 1}], "en")
+            first = prefetcher._tasks[100]
+            await started.wait()
+
+            prefetcher.cancel(100)
+            await asyncio.sleep(0)
+
+            assert first.cancelled()
+            assert 100 not in prefetcher._tasks
+
+    @pytest.mark.asyncio
+    async def test_failed_prefetch_is_logged(self):
+        prefetcher = AnimePrefetcher()
+
+        with patch(
+            "services.prefetch_service.anime_cache.get_many_cached_anime",
+            new_callable=AsyncMock,
+            return_value={},
+        ), patch(
+            "services.prefetch_service.get_caption_and_cover_image",
+            new_callable=AsyncMock,
+            side_effect=Exception("boom"),
+        ), patch(
+            "services.prefetch_service.logger"
+        ) as mock_logger:
+            prefetcher.schedule(100, [{"id": 1}], "en")
+            await prefetcher._tasks[100]
+
+            mock_logger.warning.assert_called_once()
+
+    def test_schedule_without_results(self):
+        prefetcher = AnimePrefetcher()
+        prefetcher.schedule(100, [], "en")
+        assert prefetcher._tasks == {}
@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+import pytest
+
+from utils.api_capture import ApiCapture, _parse_sample_rates
+
+
+def make_capture(tmp_path, **overrides):
+    capture = ApiCapture()
+    capture.enabled = True
+    capture.file_path = tmp_path / "capture.jsonl"
+    capture.default_sample_rate = 1.0
+    capture.sample_rates = {}
+    for name, value in overrides.items():
+        setattr(capture, name, value)
+    return capture
+
+
+class TestParseSampleRates:
+    def test_parse_rates(self):
+        assert _parse_sample_rates("anilist=0.1, shikimori_id=1") == {
+            "anilist": 0.1,
+            "shikimori_id": 1.0,
+        }
+
+    def test_parse_empty(self):
+        assert _parse_sample_rates("") == {}
+
+
+class TestApiCapture:
+    @pytest.mark.asyncio
+    async def test_capture_appends_jsonl(self, tmp_path):
+        capture = make_capture(tmp_path)
+
+        capture.capture("anilist", {"id": 1})
+        capture.capture("shikimori_id", {"name": "Тест"})
+        await capture.stop()
+
+        lines = capture.file_path.read_text(encoding="utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [r["source"] for r in records] == ["anilist", "shikimori_id"]
+        assert records[1]["data"] == {"name": "Тест"}
+
+    @pytest.mark.asyncio
+    async def test_disabled_capture_writes_nothing(self, tmp_path):
+        capture = make_capture(tmp_path, enabled=False)
+
+        capture.capture("anilist", {"id": 1})
+        await capture.stop()
+
+        assert not capture.file_path.exists()
+        assert capture._writer is None
+
+    @pytest.mark.asyncio
+    async def test_zero_sample_rate_skips_source(self, tmp_path):
+        capture = make_capture(tmp_path, sample_rates={"anilist": 0.0})
+
+        capture.capture("anilist", {"id": 1})
+        capture.capture("caption_debug", {"id": 2})
+        await capture.stop()
+
+        records = capture.file_path.read_text(encoding="utf-8").splitlines()
+        assert len(records) == 1
+        assert json.loads(records[0])["source"] == "caption_debug"
+
+    @pytest.mark.asyncio
+    async def test_rotation(self, tmp_path):
+        capture = make_capture(tmp_path, max_bytes=200, backup_count=2)
+
+        for i in range(3):
+            capture.capture("anilist", {"payload": "x" * 100, "i": i})
+            await asyncio.sleep(0.05)
+        await capture.stop()
+
+        assert capture.file_path.exists()
+        assert (tmp_path / "capture.jsonl.1").exists()
+        assert (tmp_path / "capture.jsonl.2").exists()
+        assert not (tmp_path / "capture.jsonl.3").exists()
+
+    def test_capture_without_loop_is_dropped(self, tmp_path):
+        capture = make_capture(tmp_path)
+        capture.capture("anilist", {"id": 1})
+        assert capture._writer is None
@@ -0,0 +1,38 @@
+import json
+from unittest.mock import patch
+
+from utils.metrics import Metrics
+
+
+class TestMetrics:
+    def test_snapshot_includes_collectors(self):
+        metrics = Metrics()
+        metrics.set_gauge("db_pool.saturation", 0.5)
+        metrics.observe("db_pool.acquire_wait_seconds", 0.2)
+        metrics.register("rate_limiter.test", lambda: {"queue_depth": 3})
+
+        snapshot = metrics.snapshot()
+
+        assert snapshot["gauges"] == {"db_pool.saturation": 0.5}
+        assert snapshot["observations"]["db_pool.acquire_wait_seconds"]["avg"] == 0.2
+        assert snapshot["collected"] == {"rate_limiter.test": {"queue_depth": 3}}
+
+    def test_log_snapshot_exports_json(self):
+        metrics = Metrics()
+        metrics.set_gauge("db_pool.waiting", 2)
+
+        with patch("utils.metrics.logger") as mock_logger:
+            metrics.log_snapshot()
+
+        message = mock_logger.info.call_args.args[0]
+        exported = json.loads(message.split(" | ", 1)[1])
+        assert exported["gauges"] == {"db_pool.waiting": 2}
+
+    def test_failing_collector_does_not_raise(self):
+        metrics = Metrics()
+        metrics.register("broken", lambda: 1 / 0)
+
+        with patch("utils.metrics.logger") as mock_logger:
+            metrics.log_snapshot()
+
+        mock_logger.error.assert_called_once()
@@ -14,7 +14,7 @@ from utils.utils import (
     format_type,
     format_genres,
     get_cover_image,
-    log_api_response
+    normalize_search_query,
 )
 
 
@@ -136,3 +136,22 @@ class TestGetCoverImage:
         result = get_cover_image(data)
         assert result == "https://s4.anilist.co/file/anilistcdn/media/anime/cover/large/1.jpg"
 
+
+class TestNormalizeSearchQuery:
+    def test_case_punctuation_and_whitespace(self):
+        assert normalize_search_query("  Naruto:   SHIPPUDEN!! ") == "naruto shippuden"
+
+    def test_diacritics_and_yo(self):
+        assert normalize_search_query("Shippūden") == "shippuden"
+        assert normalize_search_query("Pokémon") == "pokemon"
+        assert normalize_search_query("Ёлка") == "елка"
+
+    def test_keeps_cyrillic_letters(self):
+        assert normalize_search_query("Атака титанов — финал") == "атака титанов финал"
+        assert normalize_search_query("Мой") == "мой"
+
+    def test_fullwidth_characters(self):
+        assert normalize_search_query("Ｆａｔｅ／Ｚｅｒｏ") == "fate zero"
+
+    def test_only_punctuation_falls_back(self):
+        assert normalize_search_query("!!!") == "!!!"
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from utils.metrics import metrics
+
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for item in value.split(","):
+        source, _, rate = item.partition("=")
+        if source.strip() and rate.strip():
+            rates[source.strip()] = float(rate)
+    return rates
+
+
+class ApiCapture:
+    def __init__(self):
+        base_dir = Path(__file__).resolve().parent.parent
+        self.enabled = os.getenv("API_CAPTURE_ENABLED", "false").lower() == "true"
+        self.file_path = Path(
+            os.getenv("API_CAPTURE_FILE", str(base_dir / "logs" / "api_capture.jsonl"))
+        )
+        self.max_bytes = int(os.getenv("API_CAPTURE_MAX_BYTES", str(10 * 1024 * 1024)))
+        self.backup_count = int(os.getenv("API_CAPTURE_BACKUP_COUNT", "5"))
+        self.default_sample_rate = float(os.getenv("API_CAPTURE_SAMPLE_RATE", "1.0"))
+        self.sample_rates = _parse_sample_rates(
+            os.getenv("API_CAPTURE_SAMPLE_RATES", "")
+        )
+        self.queue_size = int(os.getenv("API_CAPTURE_QUEUE_SIZE", "1000"))
+        self.batch_size = 100
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    def _should_capture(self, source: str) -> bool:
+        rate = self.sample_rates.get(source, self.default_sample_rate)
+        return rate >= 1 or random.random() < rate
+
+    def _ensure_writer(self) -> bool:
+        if self._writer is not None and not self._writer.done():
+            return True
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._writer = asyncio.create_task(self._run_writer())
+        return True
+
+    def capture(self, source: str, data: Any):
+        if not self.enabled or not self._should_capture(source):
+            return
+        if not self._ensure_writer():
+            return
+        record = {"ts": time.time(), "source": source, "data": data}
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            metrics.increment("api_capture.dropped")
+
+    async def _run_writer(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                logger.error(
+                    f"Failed to write API capture: {e} (path: {self.file_path})"
+                )
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _rotate(self):
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.file_path.with_name(f"{self.file_path.name}.{index}")
+            if source.exists():
+                source.replace(
+                    self.file_path.with_name(f"{self.file_path.name}.{index + 1}")
+                )
+        if self.backup_count > 0:
+            self.file_path.replace(self.file_path.with_name(f"{self.file_path.name}.1"))
+        else:
+            self.file_path.unlink()
+
+    def _write_batch(self, batch: List[Dict]):
+        lines = "".join(
+            json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            for record in batch
+        ).encode("utf-8")
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        if (
+            self.file_path.exists()
+            and self.file_path.stat().st_size + len(lines) > self.max_bytes
+        ):
+            self._rotate()
+        with open(self.file_path, "ab") as f:
+            f.write(lines)
+
+    async def stop(self):
+        if self._writer is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=5)
+        except asyncio.TimeoutError:
+            logger.warning("API capture queue was not flushed before shutdown")
+        self._writer.cancel()
+        self._writer = None
+
+
+api_capture = ApiCapture()
@@ -0,0 +1,54 @@
+import json
+from typing import Callable, Dict
+
+from loguru import logger
+
+
+class Metrics:
+    def __init__(self):
+        self.gauges: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.observations: Dict[str, Dict[str, float]] = {}
+        self.collectors: Dict[str, Callable[[], Dict]] = {}
+
+    def set_gauge(self, name: str, value: float):
+        self.gauges[name] = value
+
+    def increment(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float):
+        stats = self.observations.setdefault(
+            name, {"count": 0, "sum": 0.0, "max": 0.0, "last": 0.0}
+        )
+        stats["count"] += 1
+        stats["sum"] += value
+        stats["max"] = max(stats["max"], value)
+        stats["last"] = value
+
+    def register(self, name: str, collector: Callable[[], Dict]):
+        self.collectors[name] = collector
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {
+            "gauges": dict(self.gauges),
+            "counters": dict(self.counters),
+            "observations": {
+                name: dict(stats, avg=stats["sum"] / stats["count"])
+                for name, stats in self.observations.items()
+            },
+            "collected": {
+                name: collector() for name, collector in self.collectors.items()
+            },
+        }
+
+    def log_snapshot(self):
+        try:
+            logger.info(
+                f"Metrics snapshot | {json.dumps(self.snapshot(), default=str)}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to export metrics snapshot: {e}")
+
+
+metrics = Metrics()
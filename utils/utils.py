@@ -1,10 +1,20 @@
 from datetime import datetime
 import html
 import re
-import os
-import json
+import unicodedata
 
-from loguru import logger
+
+def normalize_search_query(query: str) -> str:
+    text = unicodedata.normalize("NFKC", query).casefold()
+    text = text.replace("ё", "е")
+    folded = []
+    for char in unicodedata.normalize("NFD", text):
+        if unicodedata.combining(char) and folded and folded[-1].isascii():
+            continue
+        folded.append(char)
+    text = unicodedata.normalize("NFC", "".join(folded))
+    text = re.sub(r"[\W_]+", " ", text).strip()
+    return text or query.casefold().strip()
 
 
 def classify_airing_schedule(schedule: list):
@@ -157,21 +167,3 @@ def get_cover_image(cover_image_data):
     else:
         cover_image = anilist_url or (None if is_shikimori_missing else shikimori_url)
     return cover_image
-
-
-def log_api_response(source: str, data: dict, file_path: str = None):
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    if file_path is None:
-        file_path = os.path.join(base_dir, "anime_info.txt")
-    try:
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = json.load(f)
-        else:
-            content = {}
-        content[source] = data
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(content, f, ensure_ascii=False, indent=2)
-        logger.info(f"API response from {source} saved to {file_path}")
-    except Exception as e:
-        logger.error(f"Failed to log API response: {e} (path: {file_path})")